@@ -42,12 +42,15 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework.authtoken',
     'core',
-    'user',
-    'property',
+    'user.apps.UserConfig',
+    'property.apps.PropertyConfig',
 
 ]
 
 MIDDLEWARE = [
+    'core.metrics.MetricsMiddleware',
+    'core.timing.ServerTimingMiddleware',
+    'core.access_log.AccessLogMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -80,16 +83,41 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
+# DB_CONN_MAX_AGE keeps connections open for that many seconds, checked
+# before each request reuses them unless DB_CONN_HEALTH_CHECKS is False
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'core.backends.postgresql',
         'HOST': os.environ.get('DB_HOST'),
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
         'PASSWORD': os.environ.get('DB_PASS'),
-
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 0)),
+        'CONN_HEALTH_CHECKS':
+            os.environ.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
     }
 }
+
+# Read replicas of the default database, DB_REPLICA_HOSTS lists their
+# hosts. Safe requests of the API read from them, except for users who
+# wrote in the last REPLICA_STICKY_SECONDS, see core.replicas. Their
+# reads in the REPLICA_MAX_LAG_SECONDS after a write are not cached
+
+DB_REPLICA_HOSTS = [
+    host.strip() for host in os.environ.get('DB_REPLICA_HOSTS', '').split(',')
+    if host.strip()
+]
+REPLICA_DATABASES = []
+for index, host in enumerate(DB_REPLICA_HOSTS, 1):
+    DATABASES[f'replica_{index}'] = dict(
+        DATABASES['default'], HOST=host, TEST={'MIRROR': 'default'})
+    REPLICA_DATABASES.append(f'replica_{index}')
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+REPLICA_STICKY_CACHE_ALIAS = 'default'
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 5))
+REPLICA_MAX_LAG_SECONDS = int(os.environ.get('REPLICA_MAX_LAG_SECONDS', 60))
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -112,6 +140,33 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# https://docs.djangoproject.com/en/3.2/topics/auth/passwords/
+# PASSWORD_HASHER picks the hasher of new hashes, the other ones still
+# verify, so existing hashes are upgraded when their users log in
+
+PASSWORD_HASHER_POLICIES = {
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'bcrypt': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'pbkdf2')
+PASSWORD_HASHERS = [PASSWORD_HASHER_POLICIES[PASSWORD_HASHER]] + [
+    hasher for name, hasher in PASSWORD_HASHER_POLICIES.items()
+    if name != PASSWORD_HASHER
+]
+
+AUTHENTICATION_BACKENDS = ['user.backends.PooledModelBackend']
+
+# Hashes run at once by each process, hashes allowed to wait for one of
+# them and seconds a request waits for a slot before failing with a 503.
+# The request waits for its hash, see user.hashing
+PASSWORD_HASHING_WORKERS = int(
+    os.environ.get('PASSWORD_HASHING_WORKERS', os.cpu_count() or 1))
+PASSWORD_HASHING_QUEUE = int(os.environ.get('PASSWORD_HASHING_QUEUE', 16))
+PASSWORD_HASHING_TIMEOUT = float(
+    os.environ.get('PASSWORD_HASHING_TIMEOUT', 2))
+
 # Internationalization
 # https://docs.djangoproject.com/en/3.2/topics/i18n/
 
@@ -139,5 +194,122 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'core.User'
 
+# Django Rest Framework
+# https://www.django-rest-framework.org/api-guide/settings/
+
+REST_FRAMEWORK = {
+    'DEFAULT_PAGINATION_CLASS': 'property.pagination.KeysetPagination',
+    'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', 50)),
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+}
+
+# Upper bound for the page_size query parameter
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', 500))
+
+# Maximum number of items accepted by the property bulk endpoint
+PROPERTY_BULK_MAX_ITEMS = int(os.environ.get('PROPERTY_BULK_MAX_ITEMS', 10000))
+
+# Rows read per round trip by the property export
+PROPERTY_EXPORT_CHUNK_SIZE = int(
+    os.environ.get('PROPERTY_EXPORT_CHUNK_SIZE', 2000))
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Token authentication cache: the shared cache alias and timeout, and
+# the size and time to live, in seconds, of the in-process LRU
+AUTH_TOKEN_CACHE_ALIAS = 'default'
+AUTH_TOKEN_CACHE_TIMEOUT = int(os.environ.get('AUTH_TOKEN_CACHE_TIMEOUT', 300))
+AUTH_TOKEN_LOCAL_CACHE_SIZE = int(
+    os.environ.get('AUTH_TOKEN_LOCAL_CACHE_SIZE', 1024))
+AUTH_TOKEN_LOCAL_CACHE_TTL = int(
+    os.environ.get('AUTH_TOKEN_LOCAL_CACHE_TTL', 5))
+
+# Cache alias and timeout, in seconds, of the property API responses
+PROPERTY_CACHE_ALIAS = 'default'
+PROPERTY_CACHE_TIMEOUT = int(os.environ.get('PROPERTY_CACHE_TIMEOUT', 300))
+
+# Serve the property list and detail routes with async views, enabled
+# by app.asgi, and the threads each ASGI worker runs them on
+PROPERTY_ASYNC_VIEWS = os.environ.get('PROPERTY_ASYNC_VIEWS') == 'True'
+PROPERTY_ASYNC_CONCURRENCY = int(
+    os.environ.get('PROPERTY_ASYNC_CONCURRENCY', 16))
+
+# Background jobs, see core.jobs: the backend running them, the threads
+# of core.jobs.ThreadBackend, the attempts of a job, the seconds
+# before its first retry, doubled before each next one, and the seconds
+# after which a running job is taken for lost
+JOBS_BACKEND = os.environ.get('JOBS_BACKEND', 'core.jobs.ThreadBackend')
+JOBS_THREADS = int(os.environ.get('JOBS_THREADS', 2))
+JOBS_MAX_ATTEMPTS = int(os.environ.get('JOBS_MAX_ATTEMPTS', 3))
+JOBS_RETRY_DELAY = float(os.environ.get('JOBS_RETRY_DELAY', 10))
+JOBS_TIMEOUT = float(os.environ.get('JOBS_TIMEOUT', 600))
+
+# Share of the requests timed by core.timing.ServerTimingMiddleware,
+# from 0 to 1
+SERVER_TIMING_SAMPLE_RATE = float(
+    os.environ.get('SERVER_TIMING_SAMPLE_RATE', 0.01))
+
+# Prometheus metrics, see core.metrics: the bearer token of /metrics,
+# which is disabled without one, the URL namespaces whose request
+# latencies are observed and the collectors added to every scrape
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+METRICS_NAMESPACES = ('property', 'user')
+METRICS_COLLECTORS = [
+    'core.metrics.DatabaseConnectionCollector',
+    'property.metrics.ResponseCacheCollector',
+]
+
+# Access log of the API requests, see core.access_log: the file it is
+# appended to, which enables it, and the paths it records
+ACCESS_LOG_FILE = os.environ.get('ACCESS_LOG_FILE', '')
+ACCESS_LOG_PREFIXES = ('/api/imovel/', '/api/user/')
+
 # Add Django-Heroku
 django_heroku.settings(locals())
+
+# django_heroku adds WhiteNoise, replaced by a subclass able to run in
+# the async middleware chain of app.asgi
+MIDDLEWARE = [
+    'core.staticfiles.WhiteNoiseMiddleware'
+    if path == 'whitenoise.middleware.WhiteNoiseMiddleware' else path
+    for path in MIDDLEWARE
+]
+
+# The logging set by django_heroku, named for the linters
+LOGGING = locals()['LOGGING']
+
+# Log the timings of the sampled requests
+LOGGING['loggers']['core.timing'] = {
+    'handlers': ['console'],
+    'level': 'INFO',
+    'propagate': False,
+}
+
+# Write the access log lines as they are to its file
+if ACCESS_LOG_FILE:
+    LOGGING['formatters']['access_log'] = {'format': '%(message)s'}
+    LOGGING['handlers']['access_log'] = {
+        'class': 'logging.handlers.WatchedFileHandler',
+        'filename': ACCESS_LOG_FILE,
+        'formatter': 'access_log',
+    }
+    LOGGING['loggers']['core.access_log'] = {
+        'handlers': ['access_log'],
+        'level': 'INFO',
+        'propagate': False,
+    }
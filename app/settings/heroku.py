@@ -19,5 +19,30 @@ SECRET_KEY = env('SECRET_KEY')
 DATABASES = {
     # read os.environ['DATABASE_URL']
     # and raises ImproperlyConfigured exception if not found
-    'default': env.db(),
+    'default': env.db(engine='core.backends.postgresql'),
 }
+DATABASES['default'].update(
+    CONN_MAX_AGE=env.int('DB_CONN_MAX_AGE', default=0),
+    CONN_HEALTH_CHECKS=env.bool('DB_CONN_HEALTH_CHECKS', default=True),
+)
+
+# Read replicas, read os.environ['DATABASE_REPLICA_URLS'] as a comma
+# separated list of database urls
+REPLICA_DATABASES = []
+for index, url in enumerate(env.list('DATABASE_REPLICA_URLS', default=[]), 1):
+    DATABASES[f'replica_{index}'] = dict(
+        env.db_url_config(url, engine='core.backends.postgresql'),
+        CONN_MAX_AGE=DATABASES['default']['CONN_MAX_AGE'],
+        CONN_HEALTH_CHECKS=DATABASES['default']['CONN_HEALTH_CHECKS'],
+        TEST={'MIRROR': 'default'},
+    )
+    REPLICA_DATABASES.append(f'replica_{index}')
+
+# Parse cache url strings like redis://127.0.0.1:6379/0
+# read os.environ['REDIS_URL'], local memory when not set
+CACHES = {
+    'default': env.cache('REDIS_URL', default='locmemcache://'),
+}
+
+# Jobs are run by the worker process of the Procfile
+JOBS_BACKEND = env('JOBS_BACKEND', default='core.jobs.DatabaseBackend')
@@ -0,0 +1,12 @@
+from app.settings import base
+from app.settings.base import *
+
+# A second database standing for a read replica, so the tests can check
+# which database serves each query. It is not in REPLICA_DATABASES, the
+# tests of the replica routing enable it.
+DATABASES = base.DATABASES
+DATABASES['replica'] = dict(
+    DATABASES['default'], TEST={'NAME': 'test_replica'})
+
+# Requests are timed by the tests of core.timing only
+SERVER_TIMING_SAMPLE_RATE = 0
@@ -16,8 +16,12 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from core.metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/user/', include('user.urls')),
     path('api/imovel/', include('property.urls')),
+    path('api/jobs/', include('core.urls')),
+    path('metrics', metrics_view, name='metrics'),
 ]
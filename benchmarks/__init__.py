@@ -0,0 +1,13 @@
+"""Benchmarks for the API hot paths
+
+Each module runs against a throwaway test database created from the
+configured DJANGO_SETTINGS_MODULE, e.g.::
+
+    python -m benchmarks.bulk_create --count 10000
+
+`benchmarks.suite` runs the main paths together and stores the results
+as JSON, to compare a run with a baseline::
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --baseline baseline.json
+"""
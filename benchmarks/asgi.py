@@ -0,0 +1,36 @@
+"""Compare the concurrent-client throughput of the property list and
+detail routes served by gunicorn sync workers (app.wsgi) and by uvicorn
+workers (app.asgi), with and without the async views"""
+import argparse
+
+from benchmarks import http, utils
+
+UVICORN = 'uvicorn.workers.UvicornWorker'
+
+# Gunicorn arguments and environment of each server
+SERVERS = {
+    'wsgi': (['app.wsgi', '--worker-class', 'sync'], {}),
+    'asgi': (['app.asgi', '--worker-class', UVICORN], {}),
+    'asgi-sync': (['app.asgi', '--worker-class', UVICORN],
+                  {'PROPERTY_ASYNC_VIEWS': 'False'}),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    utils.setup()
+    token, ids = http.prepare()
+    for name, (server_args, env) in SERVERS.items():
+        with http.serve(server_args, env, args.port, args.workers) as base:
+            urls = http.property_urls(base, ids, args.requests)
+            http.report(name, *http.load(urls, token, args.concurrency))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Compare creating properties one request at a time with the bulk endpoint"""
+import argparse
+
+from benchmarks import utils
+
+
+def run(count, batch_size):
+    from django.contrib.auth import get_user_model
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from core.models import Property, RealEstate
+
+    user = get_user_model().objects.create_user(
+        'bench@company.com', 'benchpass')
+    RealEstate.objects.bulk_create([
+        RealEstate(user=user, name=f'Imobiliaria {i}', address='Rua X')
+        for i in range(10)
+    ])
+    real_estate_ids = [real_estate.pk for real_estate in
+                       RealEstate.objects.filter(user=user)]
+    client = APIClient()
+    client.force_authenticate(user)
+
+    def payload(i):
+        return {
+            'name': f'Imovel {i}',
+            'address': 'Rua X',
+            'description': 'etc',
+            'features': 'garagem',
+            'status': bool(i % 2),
+            'type': 'Home',
+            'finality': 'residential',
+            'real_estates': real_estate_ids[i % 10:i % 10 + 2],
+        }
+
+    results = {}
+    with utils.timer(results, 'single'):
+        for i in range(count):
+            client.post(reverse('property:property-list'), payload(i),
+                        format='json')
+
+    Property.objects.all().delete()
+    with utils.timer(results, 'bulk'):
+        for start in range(0, count, batch_size):
+            client.post(
+                reverse('property:property-bulk'),
+                [payload(i) for i in
+                 range(start, min(start + batch_size, count))],
+                format='json'
+            )
+
+    assert Property.objects.count() == count
+    utils.report(results, count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    utils.setup()
+    with utils.test_database():
+        run(args.count, args.batch_size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""Compare the latency of the property list and detail routes served by
+gunicorn when every request opens a new database connection and with
+persistent, health checked connections
+
+Meant for the PostgreSQL deployment: the servers use the configured
+database, with DB_CONN_MAX_AGE set for each run.
+"""
+import argparse
+
+from benchmarks import http, utils
+
+# Environment of each server
+SERVERS = {
+    'per-request': {'DB_CONN_MAX_AGE': '0'},
+    'persistent': {'DB_CONN_MAX_AGE': '600',
+                   'DB_CONN_HEALTH_CHECKS': 'True'},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    utils.setup()
+    token, ids = http.prepare()
+    server_args = ['app.wsgi', '--worker-class', 'gthread',
+                   '--threads', str(args.threads)]
+    for name, env in SERVERS.items():
+        with http.serve(server_args, env, args.port, args.workers) as base:
+            urls = http.property_urls(base, ids, args.requests)
+            http.report(name, *http.load(urls, token, args.concurrency))
+
+
+if __name__ == '__main__':
+    main()
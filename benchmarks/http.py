@@ -0,0 +1,104 @@
+"""Helpers of the benchmarks loading a gunicorn server over HTTP"""
+import contextlib
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import utils
+
+
+def prepare():
+    """Seed the benchmark user and return its token and property ids
+
+    The servers use the configured database, so the user is created
+    there the first time.
+    """
+    from django.contrib.auth import get_user_model
+    from rest_framework.authtoken.models import Token
+
+    from core.models import Property
+
+    user = get_user_model().objects.filter(email__startswith='seed') \
+        .order_by('id').first()
+    if user is None:
+        user = get_user_model().objects.get(pk=utils.seed(1, 5, 200)[0])
+    token, _ = Token.objects.get_or_create(user=user)
+    ids = list(Property.objects.filter(user=user)
+               .values_list('id', flat=True)[:100])
+    return token.key, ids
+
+
+def get(url, token):
+    """Get a URL and return the status and the latency"""
+    request = urllib.request.Request(
+        url, headers={'Authorization': f'Token {token}'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:
+            response.read()
+            code = response.status
+    except urllib.error.HTTPError as error:
+        code = error.code
+    return code, time.perf_counter() - start
+
+
+def wait_ready(url, timeout=30):
+    """Wait until a server answers"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url)
+            return
+        except urllib.error.HTTPError:
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'{url} did not start')
+
+
+@contextlib.contextmanager
+def serve(args, env, port, workers):
+    """Run gunicorn with extra arguments and environment in the block
+
+    The response cache is disabled, so every request reaches the ORM.
+    """
+    env = dict(os.environ, PROPERTY_CACHE_TIMEOUT='0', **env)
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', *args,
+         '--workers', str(workers), '--bind', f'127.0.0.1:{port}'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(f'http://127.0.0.1:{port}/api/imovel/imoveis/')
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def property_urls(base, ids, count):
+    """Return alternating list and detail URLs of the properties"""
+    url = f'{base}/api/imovel/imoveis/'
+    return [url if i % 2 else f'{url}{ids[i % len(ids)]}/'
+            for i in range(count)]
+
+
+def load(urls, token, concurrency):
+    """Get the URLs from concurrent clients, return results and seconds"""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(lambda url: get(url, token), urls))
+    return results, time.perf_counter() - start
+
+
+def report(name, results, elapsed):
+    """Print the throughput and latencies of a load"""
+    latencies = [latency for code, latency in results if code == 200]
+    print(f'{name:<12} {len(latencies) / elapsed:10.1f} requests/s'
+          f'  p50 {utils.percentile(latencies, 50):8.1f} ms'
+          f'  p99 {utils.percentile(latencies, 99):8.1f} ms'
+          f'  errors {len(results) - len(latencies)}')
@@ -0,0 +1,84 @@
+"""Report query plans and latency of the hot filters with and without
+the composite indexes added by core.0012_indexes"""
+import argparse
+
+from benchmarks import utils
+
+
+def hot_queries(user_id, real_estate_ids):
+    """Return the querysets issued by the property endpoints"""
+    from core.models import Property, RealEstate
+
+    properties = Property.objects.filter(user_id=user_id)
+    return {
+        'list': properties.order_by('-id')[:50],
+        'type_status': properties.filter(
+            type='Casa', status=True).order_by('-id')[:50],
+        'finality': properties.filter(
+            finality='rural').order_by('-id')[:50],
+        'real_estates': properties.filter(
+            real_estates__id__in=real_estate_ids).order_by('-id')[:50],
+        'real_estates_by_name': RealEstate.objects.filter(
+            user_id=user_id).order_by('-name', '-id')[:50],
+    }
+
+
+def measure(label, user_id, real_estate_ids, repeat):
+    print(f'== {label}')
+    for name, queryset in hot_queries(user_id, real_estate_ids).items():
+        latency = utils.median_latency(lambda: list(queryset.all()), repeat)
+        print(f'-- {name}: {latency * 1000:.3f}ms')
+        print(queryset.explain())
+
+
+def set_indexes(enabled):
+    """Create or drop the indexes of core.0012_indexes only
+
+    Migrating back to 0011 would also drop the columns of the later
+    migrations, which the models query.
+    """
+    from django.db import connection
+    from django.db.migrations.loader import MigrationLoader
+
+    loader = MigrationLoader(connection)
+    migration = loader.get_migration('core', '0012_indexes')
+    with connection.schema_editor() as schema_editor:
+        if enabled:
+            migration.apply(
+                loader.project_state(('core', '0011_timestamps')),
+                schema_editor)
+        else:
+            migration.unapply(
+                loader.project_state(('core', '0012_indexes')),
+                schema_editor)
+
+
+def run(users, properties, repeat):
+    from core.models import RealEstate
+
+    user_ids = utils.seed(users, 20, properties)
+    user_id = user_ids[len(user_ids) // 2]
+    real_estate_ids = list(RealEstate.objects.filter(user_id=user_id)
+                           .values_list('id', flat=True)[:3])
+
+    set_indexes(False)
+    measure('before', user_id, real_estate_ids, repeat)
+    set_indexes(True)
+    measure('after', user_id, real_estate_ids, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--properties', type=int, default=1000,
+                        help='properties per user')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    utils.setup()
+    with utils.test_database():
+        run(args.users, args.properties, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
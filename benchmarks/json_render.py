@@ -0,0 +1,55 @@
+"""Compare the DRF and orjson renderers and parsers over a serialized
+page of properties"""
+import argparse
+
+from benchmarks import utils
+
+
+def run(properties, repeat):
+    import io
+
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from core.models import Property
+    from core.parsers import ORJSONParser
+    from core.renderers import ORJSONRenderer
+    from property.serializers import PropertySerializer
+
+    utils.seed(1, 10, properties)
+    data = {
+        'next': None,
+        'previous': None,
+        'results': PropertySerializer(
+            Property.objects.prefetch_related('real_estates'), many=True
+        ).data,
+    }
+    content = JSONRenderer().render(data)
+    assert ORJSONRenderer().render(data) == content
+    print(f'{properties} properties, {len(content) / 1024:.0f} KiB')
+
+    for name, renderer in (('drf render', JSONRenderer()),
+                           ('orjson render', ORJSONRenderer())):
+        latency = utils.median_latency(lambda: renderer.render(data), repeat)
+        print(f'{name:<16} {latency * 1000:8.2f} ms')
+
+    for name, parser in (('drf parse', JSONParser()),
+                         ('orjson parse', ORJSONParser())):
+        latency = utils.median_latency(
+            lambda: parser.parse(io.BytesIO(content), None, {}), repeat)
+        print(f'{name:<16} {latency * 1000:8.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--properties', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    utils.setup()
+    with utils.test_database():
+        run(args.properties, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Compare the rows per second of the property and real estate list pages
+built by the serializers and by the values() reader"""
+import argparse
+from unittest.mock import patch
+
+from benchmarks import utils
+
+
+def run(properties, page_size, requests):
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from core.models import User
+    from property.readers import ValuesReader
+
+    user_id, = utils.seed(1, page_size, properties)
+    client = APIClient()
+    client.force_authenticate(User.objects.get(pk=user_id))
+    urls = {
+        'imoveis': reverse('property:property-list'),
+        'imobiliarias': reverse('property:realestate-list'),
+    }
+
+    def walk(url):
+        """Request the first pages of a list"""
+        res = client.get(url, {'page_size': page_size})
+        for _ in range(requests - 1):
+            assert res.status_code == 200
+            res = client.get(res.data['next'] or url)
+
+    results = {}
+    with patch('property.cache.get_response', return_value=None):
+        for name, url in urls.items():
+            with patch.object(ValuesReader, 'for_serializer',
+                              return_value=None):
+                with utils.timer(results, f'{name} serializer'):
+                    walk(url)
+            with utils.timer(results, f'{name} values'):
+                walk(url)
+
+    utils.report(results, page_size * requests)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--properties', type=int, default=20000)
+    parser.add_argument('--page-size', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=40)
+    args = parser.parse_args()
+
+    utils.setup()
+    with utils.test_database():
+        run(args.properties, args.page_size, args.requests)
+
+
+if __name__ == '__main__':
+    main()
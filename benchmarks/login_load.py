@@ -0,0 +1,71 @@
+"""Load test /api/user/token/ of a running server and report the p50 and
+p99 latencies of the logins
+
+Run the server the way it is deployed, for instance with gunicorn, and
+point --url at it. The users are created through /api/user/create/ first.
+"""
+import argparse
+import json
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.utils import percentile
+
+
+def post(url, data):
+    """Post a JSON body and return the status and the latency"""
+    request = urllib.request.Request(
+        url, data=json.dumps(data).encode(),
+        headers={'Content-Type': 'application/json'},
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:
+            response.read()
+            code = response.status
+    except urllib.error.HTTPError as error:
+        code = error.code
+    return code, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    args = parser.parse_args()
+
+    base = args.url.rstrip('/')
+    password = 'loadtest-password'
+    emails = [f'loadtest{i}@company.com' for i in range(args.users)]
+    for email in emails:
+        # Already created by a previous run when 400
+        post(f'{base}/api/user/create/',
+             {'email': email, 'password': password, 'name': 'Load'})
+
+    def login(i):
+        return post(f'{base}/api/user/token/',
+                    {'email': emails[i % len(emails)], 'password': password})
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as executor:
+        results = list(executor.map(login, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    codes = Counter(code for code, _ in results)
+    latencies = [latency for code, latency in results if code == 200]
+    print(f'{args.requests} logins, {args.concurrency} concurrent, '
+          f'{args.requests / elapsed:.1f} logins/s')
+    print('status ' + ', '.join(f'{code}: {count}'
+                                for code, count in sorted(codes.items())))
+    if len(latencies) > 1:
+        print(f'p50 {percentile(latencies, 50):8.1f} ms')
+        print(f'p99 {percentile(latencies, 99):8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
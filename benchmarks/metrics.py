@@ -0,0 +1,83 @@
+"""Measure the overhead of the Prometheus metrics on the property list
+and the cost of a single observation"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from unittest.mock import patch
+
+from benchmarks import utils
+
+
+def run(properties, page_size, repeat, rounds):
+    from django.db import connection
+    from django.test.utils import modify_settings
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from core import metrics
+    from core.models import User
+
+    user_id, = utils.seed(1, 5, properties)
+    client = APIClient()
+    client.force_authenticate(User.objects.get(pk=user_id))
+    url = reverse('property:property-list')
+
+    def request():
+        assert client.get(url, {'page_size': page_size}).status_code == 200
+
+    def without_metrics():
+        with modify_settings(MIDDLEWARE={
+                'remove': 'core.metrics.MetricsMiddleware'}):
+            connection.execute_wrappers.remove(metrics.record_sql)
+            try:
+                return utils.median_latency(request, repeat)
+            finally:
+                connection.execute_wrappers.append(metrics.record_sql)
+
+    # Alternate the two setups, so drifts of the machine hit both
+    results = {'with metrics': [], 'without metrics': []}
+    with patch('property.cache.get_response', return_value=None):
+        request()
+        for _ in range(rounds):
+            results['with metrics'].append(
+                utils.median_latency(request, repeat))
+            results['without metrics'].append(without_metrics())
+
+    for name, timings in results.items():
+        print(f'{name:<20} {statistics.median(timings) * 1000:10.3f} ms'
+              f' per request')
+
+    histogram = metrics.REQUEST_DURATION.labels(
+        'property:property-list', 'GET', 200)
+    count = 100000
+    start = time.perf_counter()
+    for _ in range(count):
+        histogram.observe(0.01)
+    elapsed = time.perf_counter() - start
+    print(f'{"observation":<20} {elapsed / count * 1e6:10.3f} us')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--properties', type=int, default=2000)
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=7)
+    parser.add_argument(
+        '--multiprocess', action='store_true',
+        help='Write the metrics to files, as the gunicorn workers do')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        if args.multiprocess:
+            os.environ['PROMETHEUS_MULTIPROC_DIR'] = directory
+        utils.setup()
+        with utils.test_database():
+            run(args.properties, args.page_size, args.repeat,
+                args.rounds)
+
+
+if __name__ == '__main__':
+    main()
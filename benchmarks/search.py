@@ -0,0 +1,44 @@
+"""Compare the ranked full-text search with icontains lookups"""
+import argparse
+
+from benchmarks import utils
+
+TERMS = ('augusta', 'faria lima', 'garagem')
+
+
+def run(count, repeat):
+    from django.db.models import Q
+    from core.models import Property
+    from property.search import search_properties
+
+    user_id, = utils.seed(1, 0, count)
+    properties = Property.objects.filter(user_id=user_id)
+
+    for term in TERMS:
+        searched, ordering = search_properties(properties, term)
+        searched = searched.order_by(*ordering)[:50]
+        matches = Q(name__icontains=term) | Q(address__icontains=term) \
+            | Q(description__icontains=term)
+        contains = properties.filter(matches).order_by('-id')[:50]
+
+        search_latency = utils.median_latency(
+            lambda: list(searched.all()), repeat)
+        contains_latency = utils.median_latency(
+            lambda: list(contains.all()), repeat)
+        print(f'{term!r:<14} search {search_latency * 1000:9.3f}ms  '
+              f'icontains {contains_latency * 1000:9.3f}ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--count', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    utils.setup()
+    with utils.test_database():
+        run(args.count, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
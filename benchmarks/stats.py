@@ -0,0 +1,70 @@
+"""Compare the stats endpoint grouping in the database with counting every
+property row in Python, as a client walking the list would"""
+import argparse
+from collections import Counter
+from unittest.mock import patch
+
+from benchmarks import utils
+
+
+def count_rows(queryset):
+    """Count the properties by field value and real estate in Python"""
+    from property.stats import GROUPED_FIELDS
+
+    counters = {field: Counter() for field in GROUPED_FIELDS}
+    real_estates = Counter()
+    seen = set()
+    rows = queryset.order_by() \
+        .values_list('pk', *GROUPED_FIELDS, 'real_estates')
+    for pk, *values, real_estate in rows.iterator():
+        if pk not in seen:
+            seen.add(pk)
+            for field, value in zip(GROUPED_FIELDS, values):
+                counters[field][value] += 1
+        if real_estate is not None:
+            real_estates[real_estate] += 1
+    return counters, real_estates
+
+
+def run(properties, real_estates, repeat):
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from core.models import Property, User
+
+    user_id, = utils.seed(1, real_estates, properties)
+    client = APIClient()
+    client.force_authenticate(User.objects.get(pk=user_id))
+    url = reverse('property:property-stats')
+
+    def endpoint():
+        assert client.get(url).status_code == 200
+
+    queryset = Property.objects.filter(user_id=user_id)
+    with patch('property.cache.get_response', return_value=None):
+        results = {
+            'python rows': utils.median_latency(
+                lambda: count_rows(queryset), repeat),
+            'stats endpoint': utils.median_latency(endpoint, repeat),
+        }
+    endpoint()
+    results['stats cached'] = utils.median_latency(endpoint, repeat)
+
+    for name, seconds in results.items():
+        print(f'{name:<16} {seconds * 1000:10.1f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--properties', type=int, default=1000000)
+    parser.add_argument('--real-estates', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    utils.setup()
+    with utils.test_database():
+        run(args.properties, args.real_estates, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
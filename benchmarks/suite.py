@@ -0,0 +1,239 @@
+"""Run the API hot paths over seeded datasets of several sizes, store the
+results as JSON and flag the regressions against a baseline run
+
+    python -m benchmarks.suite --sizes 1000,10000 --output baseline.json
+    python -m benchmarks.suite --sizes 1000,10000 --baseline baseline.json
+
+Each case reports its throughput, p50 and p99 latencies, the queries and
+the peak Python memory of a single call. A case regresses when its p50
+or peak memory grows by more than --threshold or it runs more queries;
+the run then exits with status 1.
+"""
+import argparse
+import contextlib
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from itertools import count, cycle
+from unittest.mock import patch
+
+from benchmarks import utils
+
+# Calls of the cases hashing a password, which takes a while on purpose
+SLOW_REPEAT = 10
+
+# Measurements compared with the baseline, lower is better
+COMPARED = ('p50_ms', 'peak_kb')
+
+
+def measure(func, repeat):
+    """Return the throughput, latencies, queries and memory of a call"""
+    from django.db import connections
+
+    queries = 0
+
+    def count_query(execute, *args):
+        nonlocal queries
+        queries += 1
+        return execute(*args)
+
+    # Reads may go to the replicas
+    with contextlib.ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(count_query))
+        func()
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call_start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - call_start)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'throughput': round(repeat / elapsed, 1),
+        'p50_ms': round(statistics.median(latencies) * 1000, 4),
+        'p99_ms': round(utils.percentile(latencies, 99), 4),
+        'queries': queries,
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def cases(size, page_size):
+    """Seed a user with size properties and return the cases over them"""
+    from django.urls import reverse
+    from rest_framework.authtoken.models import Token
+    from rest_framework.request import Request
+    from rest_framework.test import APIClient, APIRequestFactory
+
+    from core.models import Property, RealEstate
+    from property.querysets import optimize_queryset
+    from property.serializers import PropertyDetailSerializer, \
+        PropertySerializer
+    from user.authentication import CachedTokenAuthentication
+
+    user_id, = utils.seed(1, max(5, size // 100), size)
+    token = Token.objects.create(user_id=user_id)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    properties = Property.objects.filter(user_id=user_id)
+    property_ids = cycle(properties.values_list('id', flat=True)[:100])
+    real_estate_ids = cycle(RealEstate.objects.filter(user_id=user_id)
+                            .values_list('id', flat=True)[:100])
+    page = list(optimize_queryset(properties, PropertySerializer())
+                [:page_size])
+    detail = optimize_queryset(properties, PropertyDetailSerializer()) \
+        .first()
+    auth_request = APIRequestFactory().get(
+        '/', HTTP_AUTHORIZATION=f'Token {token.key}')
+    emails = (f'suite{size}-{n}@company.com' for n in count())
+
+    def get(name, *args, **params):
+        def call():
+            res = client.get(reverse(name, args=args), params)
+            assert res.status_code == 200, res.status_code
+        return call
+
+    def retrieve(name, ids):
+        def call():
+            get(name, next(ids))()
+        return call
+
+    def create_user():
+        res = APIClient().post(reverse('user:create'), {
+            'email': next(emails), 'password': 'testpass', 'name': 'Suite'})
+        assert res.status_code == 201, res.status_code
+
+    return {
+        'property list': get('property:property-list', page_size=page_size),
+        'property retrieve': retrieve('property:property-detail',
+                                      property_ids),
+        'real estate list': get('property:realestate-list',
+                                page_size=page_size),
+        'real estate retrieve': retrieve('property:realestate-detail',
+                                         real_estate_ids),
+        'property serializer':
+            lambda: PropertySerializer(page, many=True).data,
+        'property detail serializer':
+            lambda: PropertyDetailSerializer(detail).data,
+        'token auth': lambda: CachedTokenAuthentication().authenticate(
+            Request(auth_request)),
+        'user create': create_user,
+    }
+
+
+def run(sizes, page_size, repeat, only=None):
+    """Measure every case over each size, return the results by case"""
+    results = {}
+    # Every request reaches the views instead of the response cache
+    with patch('property.cache.get_response', return_value=None):
+        for size in sizes:
+            for name, func in cases(size, page_size).items():
+                if only and name not in only:
+                    continue
+                calls = SLOW_REPEAT if name == 'user create' else repeat
+                results.setdefault(name, {})[str(size)] = \
+                    measure(func, calls)
+    return results
+
+
+def metadata(page_size, repeat):
+    """Describe the environment of a run"""
+    import django
+    from django.db import connection
+
+    return {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'page_size': page_size,
+        'repeat': repeat,
+    }
+
+
+def compare(baseline, results, threshold):
+    """Return a line per measurement regressing from the baseline"""
+    regressions = []
+    for name, by_size in results.items():
+        for size, current in by_size.items():
+            base = baseline.get(name, {}).get(size)
+            if base is None:
+                continue
+            for key in COMPARED:
+                if current[key] > base[key] * (1 + threshold):
+                    regressions.append(
+                        f'{name} @{size} {key}: {base[key]} -> '
+                        f'{current[key]}')
+            if current['queries'] > base['queries']:
+                regressions.append(
+                    f'{name} @{size} queries: {base["queries"]} -> '
+                    f'{current["queries"]}')
+    return regressions
+
+
+def report(results):
+    """Print a line per case and size"""
+    print(f'{"case":<28} {"size":>8} {"calls/s":>10} {"p50 ms":>9}'
+          f' {"p99 ms":>9} {"queries":>7} {"peak KiB":>9}')
+    for name, by_size in results.items():
+        for size, result in by_size.items():
+            print(f'{name:<28} {size:>8} {result["throughput"]:10.1f}'
+                  f' {result["p50_ms"]:9.3f} {result["p99_ms"]:9.3f}'
+                  f' {result["queries"]:7} {result["peak_kb"]:9.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--sizes', default='1000,10000',
+                        help='Comma separated property counts')
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--case', action='append', dest='cases',
+                        help='Only run this case, may be repeated')
+    parser.add_argument('--output', help='Write the results to this file')
+    parser.add_argument('--baseline',
+                        help='Flag regressions from these results')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Relative growth counted as a regression')
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    utils.setup()
+    with utils.test_database():
+        data = {
+            'meta': metadata(args.page_size, args.repeat),
+            'results': run(sizes, args.page_size, args.repeat, args.cases),
+        }
+    report(data['results'])
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(data, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = compare(json.load(baseline)['results'],
+                                  data['results'], args.threshold)
+        for line in regressions:
+            print(f'REGRESSION {line}')
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
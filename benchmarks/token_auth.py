@@ -0,0 +1,52 @@
+"""Compare authenticated list requests per second with the cached token
+authentication and with the plain DRF token authentication"""
+import argparse
+from unittest.mock import patch
+
+from benchmarks import utils
+
+
+def run(requests):
+    from django.urls import reverse
+    from rest_framework.authentication import TokenAuthentication
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIClient
+
+    from core.models import Property
+    from property.views import PropertyViewSet
+
+    user_id, = utils.seed(1, 5, 20)
+    token = Token.objects.create(user_id=user_id)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    url = reverse('property:property-list')
+    assert Property.objects.filter(user_id=user_id).exists()
+
+    def list_requests():
+        for _ in range(requests):
+            assert client.get(url).status_code == 200
+
+    results = {}
+    with utils.timer(results, 'cached'):
+        list_requests()
+    with patch.object(PropertyViewSet, 'authentication_classes',
+                      (TokenAuthentication,)):
+        with utils.timer(results, 'database'):
+            list_requests()
+
+    for name, elapsed in results.items():
+        print(f'{name:<10} {requests / elapsed:10.1f} requests/s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+
+    utils.setup()
+    with utils.test_database():
+        run(args.requests)
+
+
+if __name__ == '__main__':
+    main()
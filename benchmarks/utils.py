@@ -0,0 +1,75 @@
+import contextlib
+import os
+import time
+
+import django
+
+
+def setup():
+    """Configure Django for a standalone benchmark"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings.base')
+    django.setup()
+
+
+@contextlib.contextmanager
+def test_database(verbosity=0):
+    """Create a throwaway test database for the duration of a benchmark"""
+    from django.test.utils import setup_databases, teardown_databases, \
+        setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_config = setup_databases(verbosity, interactive=False)
+    try:
+        yield
+    finally:
+        teardown_databases(old_config, verbosity)
+        teardown_test_environment()
+
+
+@contextlib.contextmanager
+def timer(results, name):
+    """Store the seconds spent in the block under a name"""
+    start = time.perf_counter()
+    yield
+    results[name] = time.perf_counter() - start
+
+
+def percentile(latencies, percent):
+    """Return a percentile of latencies in seconds, in milliseconds"""
+    import statistics
+
+    cuts = statistics.quantiles(latencies, n=100, method='inclusive')
+    return cuts[percent - 1] * 1000
+
+
+def report(results, count):
+    """Print the elapsed time and throughput of each measurement"""
+    for name, elapsed in results.items():
+        print(f'{name:<24} {elapsed:10.3f}s {count / elapsed:12.1f} rows/s')
+
+
+def seed(users, real_estates, properties, links=2, random_seed=0,
+         batch_size=5000):
+    """Bulk create users with real estates and linked properties
+
+    Each user gets `real_estates` real estates and `properties`
+    properties, each property linked to up to `links` of them.
+    """
+    from core.seeding import seed
+
+    return seed(users, users * real_estates, users * properties,
+                links=links, skew=0, random_seed=random_seed,
+                batch_size=batch_size)
+
+
+def median_latency(func, repeat):
+    """Return the median seconds taken by a function"""
+    import statistics
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings)
@@ -0,0 +1,66 @@
+"""Access log of the API requests, to be replayed by `replay_log`
+
+`AccessLogMiddleware` writes a JSON line per request to a path of
+ACCESS_LOG_PREFIXES in the `core.access_log` logger, which the settings
+send to ACCESS_LOG_FILE. It is left out of the middleware while no file
+is set. A line holds the start time in seconds since the epoch, the
+method, path and query string, the id of the authenticated user, the
+status and the milliseconds taken; request bodies are not recorded.
+"""
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from core.middleware import HybridMiddleware
+
+logger = logging.getLogger(__name__)
+
+
+class AccessLogMiddleware(HybridMiddleware):
+    """Log the requests to ACCESS_LOG_PREFIXES, see the module docstring"""
+
+    def __init__(self, get_response):
+        if not settings.ACCESS_LOG_FILE:
+            raise MiddlewareNotUsed()
+        super().__init__(get_response)
+
+    def call(self, request):
+        if not request.path.startswith(settings.ACCESS_LOG_PREFIXES):
+            return self.get_response(request)
+
+        started, start = time.time(), time.perf_counter()
+        response = self.get_response(request)
+        self._log(request, response, started, start)
+        return response
+
+    async def acall(self, request):
+        if not request.path.startswith(settings.ACCESS_LOG_PREFIXES):
+            return await self.get_response(request)
+
+        started, start = time.time(), time.perf_counter()
+        response = await self.get_response(request)
+        self._log(request, response, started, start)
+        return response
+
+    def _log(self, request, response, started, start):
+        # The views authenticate the user of the underlying request
+        user = getattr(request, 'user', None)
+        logger.info(json.dumps({
+            'time': round(started, 3),
+            'method': request.method,
+            'path': request.path,
+            'query': request.META.get('QUERY_STRING', ''),
+            'user': user.pk if user is not None else None,
+            'status': response.status_code,
+            'ms': round((time.perf_counter() - start) * 1000, 1),
+        }))
+
+
+def read(lines):
+    """Return the entries of access log lines, oldest first"""
+    entries = [json.loads(line) for line in lines if line.strip()]
+    entries.sort(key=lambda entry: entry['time'])
+    return entries
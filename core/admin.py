@@ -33,3 +33,4 @@ class UserAdmin(BaseUserAdmin):
 admin.site.register(models.User, UserAdmin)
 admin.site.register(models.RealEstate)
 admin.site.register(models.Property)
+admin.site.register(models.Job)
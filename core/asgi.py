@@ -0,0 +1,56 @@
+"""ASGI handler able to stream responses reading the database
+
+Django 3.2 iterates the body of a StreamingHttpResponse on the event
+loop, so a body running queries, like the property export, raises
+SynchronousOnlyOperation. `StreamingASGIHandler` reads the parts in
+batches on the thread the sync views run on, where the connection of the
+queries lives, and sends them from the event loop.
+"""
+from itertools import islice
+
+import django
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+
+# Parts read from the body of a streaming response per trip to the thread
+STREAM_BATCH = 100
+
+
+def get_asgi_application():
+    """Return the ASGI application of the project"""
+    django.setup(set_prefix=False)
+    return StreamingASGIHandler()
+
+
+class StreamingASGIHandler(ASGIHandler):
+    """ASGI handler reading the streaming bodies on a thread"""
+
+    async def send_response(self, response, send):
+        if not response.streaming:
+            return await super().send_response(response, send)
+
+        # Django sends the status and headers, then the parts are sent
+        # ahead of the closing message
+        parts = iter(response)
+        response.streaming_content = ()
+
+        async def send_parts(message):
+            if message['type'] == 'http.response.body':
+                await self._send_parts(parts, send)
+            await send(message)
+
+        await super().send_response(response, send_parts)
+
+    async def _send_parts(self, parts, send):
+        read = sync_to_async(
+            lambda: list(islice(parts, STREAM_BATCH)), thread_sensitive=True)
+        batch = await read()
+        while batch:
+            for part in batch:
+                for chunk, _ in self.chunk_bytes(part):
+                    await send({
+                        'type': 'http.response.body',
+                        'body': chunk,
+                        'more_body': True,
+                    })
+            batch = await read()
@@ -0,0 +1,76 @@
+import threading
+import time
+
+from django.db.backends.postgresql import base
+
+# Connections opened, reused, closed and failing their health check by
+# this process, and the checkouts with the seconds they took
+stats = {
+    'connections_opened': 0,
+    'connections_reused': 0,
+    'connections_closed': 0,
+    'health_check_failures': 0,
+    'checkouts': 0,
+    'checkout_seconds': 0.0,
+}
+_lock = threading.Lock()
+
+
+def _count(name, value=1):
+    """Add to a connection stat"""
+    with _lock:
+        stats[name] += value
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend checking persistent connections before reuse
+
+    Backports the CONN_HEALTH_CHECKS database setting of Django 4.1: a
+    connection kept open by CONN_MAX_AGE is checked with a cheap query
+    the first time each request uses it, and replaced when the server
+    dropped it, instead of failing the request.
+    """
+    checked_out = False
+
+    def connect(self):
+        super().connect()
+        _count('connections_opened')
+
+    def _close(self):
+        try:
+            super()._close()
+        finally:
+            _count('connections_closed')
+
+    def ensure_connection(self):
+        """Check out the connection on the first use of each request"""
+        if self.checked_out:
+            return super().ensure_connection()
+
+        # Set first, connecting uses the connection too
+        self.checked_out = True
+        start = time.perf_counter()
+        if self.connection is not None and self._health_check():
+            _count('connections_reused')
+        super().ensure_connection()
+        _count('checkouts')
+        _count('checkout_seconds', time.perf_counter() - start)
+
+    def close_if_unusable_or_obsolete(self):
+        # Called when requests start and finish, so the next use of the
+        # connection checks it out again
+        self.checked_out = True
+        try:
+            super().close_if_unusable_or_obsolete()
+        finally:
+            self.checked_out = False
+
+    def _health_check(self):
+        """Close the connection if it is broken and return if it is kept"""
+        if not self.settings_dict.get('CONN_HEALTH_CHECKS') \
+                or self.in_atomic_block or self.is_usable():
+            return True
+
+        _count('health_check_failures')
+        self.close()
+        return False
@@ -0,0 +1,229 @@
+"""Background jobs
+
+Functions decorated with `task` are enqueued with `enqueue`, which
+stores a `Job` row and hands it to the JOBS_BACKEND once the current
+transaction commits:
+
+- SyncBackend runs it right away in the same thread, for tests
+- ThreadBackend runs it on a pool of threads of the process
+- DatabaseBackend leaves it to the workers of `manage.py run_jobs`
+
+A job raising an exception is retried until it ran `max_attempts`
+times, waiting JOBS_RETRY_DELAY seconds before the first retry and
+twice as long before each next one. Raising `JobFailed` fails the job
+without retrying it.
+
+A job still running JOBS_TIMEOUT seconds after it started is taken for
+lost with its runner: `claim` queues it again, or fails it once out of
+attempts, and the retry endpoint accepts it like a failed job.
+"""
+import functools
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.models import Job
+
+_tasks = {}
+_executor = ThreadPoolExecutor(
+    max_workers=settings.JOBS_THREADS,
+    thread_name_prefix='jobs',
+)
+
+
+class JobFailed(Exception):
+    """Raised by a task that must fail without being retried
+
+    The detail, which must be JSON serializable, is stored as the result
+    of the job.
+    """
+
+    def __init__(self, detail):
+        super().__init__(detail)
+        self.detail = detail
+
+
+def task(func=None, *, max_attempts=None):
+    """Register a function that can be enqueued as a job"""
+    if func is None:
+        return functools.partial(task, max_attempts=max_attempts)
+
+    func.job_name = f'{func.__module__}.{func.__qualname__}'
+    func.max_attempts = max_attempts
+    _tasks[func.job_name] = func
+    return func
+
+
+def get_task(name):
+    """Return the task of a job, importing the module registering it"""
+    if name not in _tasks:
+        try:
+            import_module(name.rsplit('.', 1)[0])
+        except ImportError:
+            pass
+    try:
+        return _tasks[name]
+    except KeyError:
+        raise JobFailed({'detail': f'Unknown task {name}.'})
+
+
+def get_backend():
+    """Return an instance of the configured jobs backend"""
+    return import_string(settings.JOBS_BACKEND)()
+
+
+def enqueue(func, *args, user=None):
+    """Store a job calling a task with JSON serializable arguments"""
+    job = Job.objects.create(
+        name=func.job_name,
+        args=list(args),
+        user=user,
+        max_attempts=func.max_attempts or settings.JOBS_MAX_ATTEMPTS,
+    )
+    schedule(job)
+    return job
+
+
+def schedule(job):
+    """Hand a queued job to the backend once the transaction commits"""
+    backend = get_backend()
+    transaction.on_commit(lambda: backend.schedule(job))
+
+
+def retry(job):
+    """Queue a failed job again for another round of attempts"""
+    job.status = Job.QUEUED
+    job.attempts = 0
+    job.result = None
+    job.error = ''
+    job.run_after = timezone.now()
+    job.save()
+    schedule(job)
+
+
+def start(job):
+    """Mark a queued job as running, False if another runner took it"""
+    started = Job.objects.filter(pk=job.pk, status=Job.QUEUED).update(
+        status=Job.RUNNING,
+        attempts=F('attempts') + 1,
+        updated_at=timezone.now(),
+    )
+    if started:
+        job.refresh_from_db()
+    return bool(started)
+
+
+def is_stale(job):
+    """Return whether a job has been running longer than JOBS_TIMEOUT"""
+    return job.status == Job.RUNNING and job.updated_at < _stale_before()
+
+
+def requeue_stale():
+    """Queue again the stale jobs, failing those out of attempts"""
+    now = timezone.now()
+    stale = Job.objects.filter(status=Job.RUNNING,
+                               updated_at__lt=_stale_before())
+    error = f'Still running after {settings.JOBS_TIMEOUT} seconds.'
+    stale.filter(attempts__lt=F('max_attempts')).update(
+        status=Job.QUEUED, error=error, run_after=now, updated_at=now)
+    stale.update(status=Job.FAILED, error=error, updated_at=now)
+
+
+def _stale_before():
+    return timezone.now() - timedelta(seconds=settings.JOBS_TIMEOUT)
+
+
+def claim():
+    """Start the next due job and return it, None when none is due
+
+    Stale jobs are queued again first. Rows locked by other workers are
+    skipped, so several workers share the queue without running a job
+    twice.
+    """
+    requeue_stale()
+    with transaction.atomic():
+        job = Job.objects.select_for_update(skip_locked=True) \
+            .filter(status=Job.QUEUED, run_after__lte=timezone.now()) \
+            .order_by('run_after', 'id') \
+            .first()
+        if job is not None and start(job):
+            return job
+    return None
+
+
+def run(job):
+    """Run one attempt of a started job and store its outcome"""
+    try:
+        result = get_task(job.name)(*job.args)
+    except JobFailed as error:
+        job.status = Job.FAILED
+        job.result = error.detail
+    except Exception:
+        job.error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = Job.QUEUED
+            job.run_after = timezone.now() + timedelta(
+                seconds=settings.JOBS_RETRY_DELAY * 2 ** (job.attempts - 1))
+        else:
+            job.status = Job.FAILED
+    else:
+        job.status = Job.SUCCEEDED
+        job.result = result
+        job.error = ''
+
+    job.save(update_fields=[
+        'status', 'result', 'error', 'run_after', 'updated_at'])
+    return job
+
+
+class SyncBackend:
+    """Run jobs in the enqueuing thread, retrying them without waiting"""
+
+    def schedule(self, job):
+        while start(job):
+            run(job)
+
+
+class ThreadBackend:
+    """Run jobs on a pool of JOBS_THREADS threads of the process
+
+    A job due later waits on a timer thread, not on a thread of the
+    pool, so its retry delay does not hold up the other jobs.
+    """
+
+    def schedule(self, job):
+        delay = (job.run_after - timezone.now()).total_seconds()
+        if delay <= 0:
+            _executor.submit(self.work, job.pk)
+            return
+
+        timer = threading.Timer(
+            delay, _executor.submit, (self.work, job.pk))
+        timer.daemon = True
+        timer.start()
+
+    def work(self, pk):
+        """Run an attempt of a job, then close the thread connection"""
+        try:
+            job = Job.objects.get(pk=pk)
+            if start(job):
+                run(job)
+                if job.status == Job.QUEUED:
+                    self.schedule(job)
+        finally:
+            connection.close()
+
+
+class DatabaseBackend:
+    """Leave the jobs to the workers of the `run_jobs` command"""
+
+    def schedule(self, job):
+        pass
@@ -0,0 +1,109 @@
+import asyncio
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import Resolver404, resolve
+from rest_framework.authtoken.models import Token
+
+from core import access_log, replay
+
+# Methods replayed, the log has no request bodies
+REPLAYED_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class Command(BaseCommand):
+    """Django command replaying an access log against a local instance"""
+    help = ('Replay the GET requests of an access log, see core.replay. '
+            'The users of the log, or --as-user, must exist in the '
+            'configured database, their tokens are created if needed.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('log', help='File written by ACCESS_LOG_FILE')
+        parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument(
+            '--speed', type=float, default=1.0,
+            help='Times faster than recorded, 0 as fast as possible')
+        parser.add_argument('--limit', type=int,
+                            help='Replay the first requests only')
+        parser.add_argument(
+            '--as-user', help='Email of the user sending every request '
+                              'recorded for an authenticated user')
+
+    def handle(self, *args, **options):
+        try:
+            replay.parse_base_url(options['base_url'])
+        except ValueError as error:
+            raise CommandError(error)
+
+        with open(options['log']) as log:
+            entries = access_log.read(log)
+        entries = [entry for entry in entries
+                   if entry['method'] in REPLAYED_METHODS]
+        if options['limit'] is not None:
+            entries = entries[:options['limit']]
+
+        tokens = self._tokens(entries, options['as_user'])
+        requests, skipped = [], 0
+        for entry in entries:
+            headers = {}
+            if entry['user'] is not None:
+                if entry['user'] not in tokens:
+                    skipped += 1
+                    continue
+                headers['Authorization'] = f'Token {tokens[entry["user"]]}'
+            target = entry['path']
+            if entry['query']:
+                target += f'?{entry["query"]}'
+            requests.append(replay.Request(
+                entry['time'], self._route(entry['path']), entry['method'],
+                target, headers))
+        if skipped:
+            self.stdout.write(self.style.WARNING(
+                f'Skipped {skipped} requests of users missing here'))
+        if not requests:
+            raise CommandError('No request to replay')
+
+        self.stdout.write(f'Replaying {len(requests)} requests ...')
+        results, elapsed = asyncio.run(replay.replay(
+            requests, options['base_url'], options['concurrency'],
+            options['speed']))
+        self._report(replay.summarize(results, elapsed), elapsed)
+
+    def _tokens(self, entries, as_user):
+        """Return the token keys by recorded user id"""
+        user_ids = {entry['user'] for entry in entries} - {None}
+        if as_user is not None:
+            try:
+                user = get_user_model().objects.get(email=as_user)
+            except get_user_model().DoesNotExist:
+                raise CommandError(f'No user {as_user}')
+            key = Token.objects.get_or_create(user=user)[0].key
+            return {user_id: key for user_id in user_ids}
+
+        users = get_user_model().objects.filter(pk__in=user_ids)
+        return {user.pk: Token.objects.get_or_create(user=user)[0].key
+                for user in users}
+
+    def _route(self, path):
+        """Return the view name of a path, or the path when unresolved"""
+        try:
+            return resolve(path).view_name
+        except Resolver404:
+            return path
+
+    def _report(self, summary, elapsed):
+        self.stdout.write(
+            f'{"route":<36} {"requests":>8} {"req/s":>8} {"p50 ms":>8}'
+            f' {"p90 ms":>8} {"p99 ms":>8} {"4xx":>5} {"5xx":>5}'
+            f' {"conn":>5} {"errors":>7}')
+        for route, result in summary.items():
+            self.stdout.write(
+                f'{route or "all":<36} {result["requests"]:8}'
+                f' {result["throughput"]:8.1f} {result["p50_ms"]:8.1f}'
+                f' {result["p90_ms"]:8.1f} {result["p99_ms"]:8.1f}'
+                f' {result["client_errors"]:5} {result["server_errors"]:5}'
+                f' {result["connection_errors"]:5}'
+                f' {result["error_rate"]:7.1%}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Replayed in {elapsed:.1f}s'))
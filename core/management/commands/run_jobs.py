@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from core import jobs
+
+
+class Command(BaseCommand):
+    """Django command running the queued background jobs"""
+    help = 'Run the background jobs queued by core.jobs.DatabaseBackend'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--burst', action='store_true',
+            help='Exit once no job is due instead of waiting for more')
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help='Seconds to wait between polls of an empty queue')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.WARNING('Waiting for jobs ...'))
+        while True:
+            # Outside of the transaction of a test
+            if not connection.in_atomic_block:
+                close_old_connections()
+            job = jobs.claim()
+            if job is None:
+                if options['burst']:
+                    break
+                time.sleep(options['interval'])
+                continue
+
+            jobs.run(job)
+            style = self.style.SUCCESS if job.status == job.SUCCEEDED \
+                else self.style.ERROR
+            self.stdout.write(style(f'{job} attempt {job.attempts}'))
+
+        self.stdout.write(self.style.SUCCESS('No jobs left!'))
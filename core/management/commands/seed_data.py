@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from core import seeding
+
+
+class Command(BaseCommand):
+    """Django command creating synthetic data for local benchmarks"""
+    help = 'Bulk create users, real estates and properties, see core.seeding'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--real-estates', type=int, default=1000,
+                            help='Real estates shared by the users')
+        parser.add_argument('--properties', type=int, default=100000,
+                            help='Properties shared by the users')
+        parser.add_argument(
+            '--links', type=int, default=3,
+            help='Most real estates listing a property')
+        parser.add_argument(
+            '--skew', type=float, default=1.0,
+            help='How much the first users own more, 0 splits evenly')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed of the random values')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.WARNING('Seeding data ...'))
+        seeding.seed(
+            options['users'],
+            options['real_estates'],
+            options['properties'],
+            links=options['links'],
+            skew=options['skew'],
+            random_seed=options['seed'],
+            batch_size=options['batch_size'],
+            log=self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS('Data seeded!'))
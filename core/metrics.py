@@ -0,0 +1,174 @@
+"""Prometheus metrics
+
+The metrics live in the default prometheus_client registry of each
+process. Under gunicorn, gunicorn.conf.py sets PROMETHEUS_MULTIPROC_DIR
+before the application is loaded, so every worker writes its values to
+files of that directory and `/metrics` adds up the files of all the
+workers, whichever worker serves the scrape.
+
+`/metrics` answers requests bearing the METRICS_TOKEN in their
+`Authorization: Bearer` header, and 404 while no token is set.
+"""
+import os
+import resource
+import time
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.utils.module_loading import import_string
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, \
+    CollectorRegistry, Counter, Gauge, Histogram, generate_latest, \
+    multiprocess
+from prometheus_client.core import CounterMetricFamily, SummaryMetricFamily
+
+from core.middleware import HybridMiddleware
+
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds',
+    'Latency of the API requests by view, method and status',
+    ['view', 'method', 'status'],
+)
+DB_QUERY_DURATION = Histogram(
+    'db_query_duration_seconds',
+    'Latency of the SQL queries by database alias',
+    ['database'],
+)
+AUTH_TOKEN_LOOKUPS = Counter(
+    'auth_token_lookups',
+    'Token authentications by the layer that found the token',
+    ['source'],
+)
+RESIDENT_MEMORY = Gauge(
+    'worker_resident_memory_bytes',
+    'Resident memory of each worker process',
+    multiprocess_mode='liveall',
+)
+
+# Seconds between two readings of the memory of the worker
+MEMORY_INTERVAL = 10
+
+_memory_read_at = 0.0
+
+
+def resident_memory():
+    """Return the resident memory of the process in bytes
+
+    Where /proc is missing, the peak resident memory is returned.
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def update_memory():
+    """Read the memory of the worker, at most every MEMORY_INTERVAL"""
+    global _memory_read_at
+
+    now = time.monotonic()
+    if now - _memory_read_at >= MEMORY_INTERVAL:
+        _memory_read_at = now
+        RESIDENT_MEMORY.set(resident_memory())
+
+
+def record_sql(execute, sql, params, many, context):
+    """Execute wrapper observing the latency of every query"""
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        DB_QUERY_DURATION.labels(context['connection'].alias) \
+            .observe(time.perf_counter() - start)
+
+
+@receiver(connection_created)
+def install_sql_wrapper(sender, connection, **kwargs):
+    """Observe the queries of every new database connection"""
+    if record_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_sql)
+
+
+class MetricsMiddleware(HybridMiddleware):
+    """Observe the latency of the requests to METRICS_NAMESPACES"""
+
+    def call(self, request):
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self._observe(request, response, start)
+        return response
+
+    async def acall(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self._observe(request, response, start)
+        return response
+
+    def _observe(self, request, response, start):
+        match = request.resolver_match
+        if match is not None \
+                and match.namespace in settings.METRICS_NAMESPACES:
+            REQUEST_DURATION.labels(
+                match.view_name, request.method, response.status_code
+            ).observe(time.perf_counter() - start)
+        update_memory()
+
+
+class DatabaseConnectionCollector:
+    """Connections and checkouts of the PostgreSQL backend
+
+    See `core.backends.postgresql`. The stats are counted in memory by
+    each process, so they are those of the worker serving the scrape.
+    """
+
+    def collect(self):
+        from core.backends.postgresql.base import stats
+
+        connections = CounterMetricFamily(
+            'db_connections',
+            'Database connections opened, reused and closed',
+            labels=['event'],
+        )
+        for event in ('opened', 'reused', 'closed'):
+            connections.add_metric([event], stats[f'connections_{event}'])
+        yield connections
+        yield CounterMetricFamily(
+            'db_connection_health_check_failures',
+            'Kept connections replaced after failing their health check',
+            value=stats['health_check_failures'],
+        )
+        yield SummaryMetricFamily(
+            'db_connection_checkout_seconds',
+            'Time taken to check out a connection for a request',
+            count_value=stats['checkouts'],
+            sum_value=stats['checkout_seconds'],
+        )
+
+
+def collect():
+    """Return the metrics of every worker in the Prometheus text format"""
+    registry = CollectorRegistry()
+    for path in settings.METRICS_COLLECTORS:
+        registry.register(import_string(path)())
+
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return generate_latest(REGISTRY) + generate_latest(registry)
+
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+def metrics_view(request):
+    """Expose the metrics in the Prometheus text format"""
+    token = settings.METRICS_TOKEN
+    if not token:
+        raise Http404()
+    if not constant_time_compare(
+            request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse(status=403)
+
+    return HttpResponse(collect(), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,32 @@
+import asyncio
+
+
+class HybridMiddleware:
+    """Base of the middleware running in both sync and async chains
+
+    Under ASGI, Django hands the middleware an async get_response and
+    `__call__` returns the coroutine of `acall`, so the requests stay
+    on the event loop. A middleware only able to run sync would make
+    Django run the whole chain below it on a single thread per worker.
+    Subclasses implement `call` and `acall`.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Let Django tell the instance is a coroutine function
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.acall(request)
+        return self.call(request)
+
+    def call(self, request):
+        raise NotImplementedError
+
+    async def acall(self, request):
+        raise NotImplementedError
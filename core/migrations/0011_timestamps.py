@@ -0,0 +1,23 @@
+# Generated by Django 3.2.25 on 2026-10-18 08:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_auto_20210503_1504'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='realestate',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.25 on 2026-10-18 08:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_timestamps'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['user', 'id'], name='property_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['user', 'type', 'status'], name='property_user_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['user', 'status'], name='property_user_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(fields=['user', 'finality'], name='property_user_finality_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='realestate',
+            index=models.Index(fields=['user', 'name', 'id'], name='realestate_user_name_idx'),
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX property_real_estates_rev_idx '
+            'ON core_property_real_estates (realestate_id, property_id)',
+            'DROP INDEX property_real_estates_rev_idx',
+        ),
+    ]
@@ -0,0 +1,113 @@
+# Generated by Django 3.2.25 on 2026-10-18 08:36
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+POSTGRESQL_FORWARD = [
+    """
+    CREATE FUNCTION core_property_search_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('portuguese', coalesce(NEW.name, '')), 'A')
+            || setweight(to_tsvector('portuguese',
+                                     coalesce(NEW.address, '')), 'B')
+            || setweight(to_tsvector('portuguese',
+                                     coalesce(NEW.description, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER core_property_search_trigger
+    BEFORE INSERT OR UPDATE OF name, address, description ON core_property
+    FOR EACH ROW EXECUTE PROCEDURE core_property_search_update()
+    """,
+    'UPDATE core_property SET name = name',
+    'CREATE INDEX property_search_idx ON core_property '
+    'USING GIN (search_vector)',
+]
+
+POSTGRESQL_BACKWARD = [
+    'DROP INDEX IF EXISTS property_search_idx',
+    'DROP TRIGGER IF EXISTS core_property_search_trigger ON core_property',
+    'DROP FUNCTION IF EXISTS core_property_search_update()',
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE core_property_fts USING fts5(
+        name, address, description,
+        content='core_property', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER core_property_fts_insert AFTER INSERT ON core_property
+    BEGIN
+        INSERT INTO core_property_fts(rowid, name, address, description)
+        VALUES (new.id, new.name, new.address, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER core_property_fts_delete AFTER DELETE ON core_property
+    BEGIN
+        INSERT INTO core_property_fts(
+            core_property_fts, rowid, name, address, description)
+        VALUES ('delete', old.id, old.name, old.address, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER core_property_fts_update AFTER UPDATE ON core_property
+    BEGIN
+        INSERT INTO core_property_fts(
+            core_property_fts, rowid, name, address, description)
+        VALUES ('delete', old.id, old.name, old.address, old.description);
+        INSERT INTO core_property_fts(rowid, name, address, description)
+        VALUES (new.id, new.name, new.address, new.description);
+    END
+    """,
+    "INSERT INTO core_property_fts(core_property_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS core_property_fts_insert',
+    'DROP TRIGGER IF EXISTS core_property_fts_delete',
+    'DROP TRIGGER IF EXISTS core_property_fts_update',
+    'DROP TABLE IF EXISTS core_property_fts',
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    """Create the full-text index of the properties"""
+    _run(schema_editor, {
+        'postgresql': POSTGRESQL_FORWARD,
+        'sqlite': SQLITE_FORWARD,
+    })
+
+
+def drop_search_index(apps, schema_editor):
+    """Drop the full-text index of the properties"""
+    _run(schema_editor, {
+        'postgresql': POSTGRESQL_BACKWARD,
+        'sqlite': SQLITE_BACKWARD,
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='property',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,4 +1,7 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
+from django.utils import timezone
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth.models import BaseUserManager, \
     AbstractBaseUser, PermissionsMixin
 
@@ -44,6 +47,13 @@ class RealEstate(models.Model):
     address = models.CharField(max_length=255)
     user = models.ForeignKey(settings.AUTH_USER_MODEL,
                              on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'name', 'id'],
+                         name='realestate_user_name_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -61,6 +71,59 @@ class Property(models.Model):
     real_estates = models.ManyToManyField('RealEstate')
     user = models.ForeignKey(settings.AUTH_USER_MODEL,
                              on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Kept up to date by a database trigger, see core.0013_search
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'id'],
+                         name='property_user_id_idx'),
+            models.Index(fields=['user', 'type', 'status'],
+                         name='property_user_type_idx'),
+            models.Index(fields=['user', 'status'],
+                         name='property_user_status_idx'),
+            models.Index(fields=['user', 'finality'],
+                         name='property_user_finality_idx'),
+        ]
 
     def __str__(self):
         return self.name
+
+
+class Job(models.Model):
+    """Background job, see core.jobs"""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    )
+
+    name = models.CharField(max_length=255)
+    args = models.JSONField(default=list)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES,
+                              default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=1)
+    result = models.JSONField(null=True, blank=True,
+                              encoder=DjangoJSONEncoder)
+    error = models.TextField(blank=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True,
+                             blank=True, on_delete=models.CASCADE)
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'],
+                         name='job_status_run_after_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.status})'
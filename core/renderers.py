@@ -0,0 +1,48 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+from core import timing
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON renderer encoding with orjson when it is installed
+
+    The output is the same bytes as the DRF renderer with its default
+    compact, unicode and strict settings. Dates, times, decimals and the
+    other types orjson does not encode like DRF go through the DRF
+    encoder. Floats are the exception: orjson writes NaN and infinities
+    as null and large exponents as 1e16 instead of 1e+16.
+
+    Indented output, other settings, a missing orjson and data orjson
+    rejects, like integers over 64 bits, use the DRF renderer.
+    """
+    default = staticmethod(encoders.JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timing.measure('render'):
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type, renderer_context):
+        """Return the data encoded as JSON"""
+        if orjson is None or data is None or self.ensure_ascii \
+                or not self.compact or not self.strict:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        try:
+            ret = orjson.dumps(data, default=self.default, option=option)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escaped by DRF, so the output is a strict javascript subset
+        return ret.replace('\u2028'.encode(), b'\\u2028') \
+            .replace('\u2029'.encode(), b'\\u2029')
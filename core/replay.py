@@ -0,0 +1,195 @@
+"""Replay of access log entries against a running instance
+
+`replay` sends the requests from `concurrency` asyncio clients, each on
+its own keep-alive HTTP/1.1 connection, at the pace they were recorded
+divided by `speed`, or as fast as possible with a speed of 0. While
+pacing, latencies count from the time a request was due, so requests
+waiting for a free client show up in the latency of an overloaded
+server. `summarize` reports the throughput, latencies and errors of
+each route, failed connections apart from the server errors.
+"""
+import asyncio
+import math
+import time
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+Request = namedtuple('Request', 'at route method target headers')
+Result = namedtuple('Result', 'route status seconds')
+
+# Statuses counted as errors, a failed connection has a None status
+SERVER_ERROR = 500
+CLIENT_ERROR = 400
+
+
+class Connection:
+    """HTTP/1.1 client connection, opened again once the server closes it"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, target, headers):
+        """Send a request and return the status once its body is read"""
+        reused = self.writer is not None
+        try:
+            return await self._request(method, target, headers)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            await self.close()
+            if not reused:
+                raise
+        # The server closed the kept connection meanwhile
+        return await self._request(method, target, headers)
+
+    async def _request(self, method, target, headers):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port)
+
+        lines = [f'{method} {target} HTTP/1.1', f'Host: {self.host}']
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode())
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection closed by the server')
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        await self._read_body(method, status, response_headers)
+        if response_headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status
+
+    async def _read_body(self, method, status, headers):
+        if method == 'HEAD' or status in (204, 304) or status < 200:
+            return
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                if not size:
+                    break
+                await self.reader.readexactly(size + 2)
+            while (await self.reader.readline()) not in (b'\r\n', b''):
+                pass
+        elif 'content-length' in headers:
+            await self.reader.readexactly(int(headers['content-length']))
+        else:
+            await self.reader.read()
+            await self.close()
+
+    async def close(self):
+        """Close the connection, if open"""
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+            self.reader = self.writer = None
+
+
+def parse_base_url(base_url):
+    """Return the host and port of an http:// URL without a path
+
+    The targets of the log are sent as they are, a path or an https://
+    URL would not be honoured.
+    """
+    url = urlsplit(base_url)
+    if url.scheme != 'http' or not url.hostname \
+            or url.path not in ('', '/') or url.query or url.fragment:
+        raise ValueError(f'Expected http://host:port, not {base_url}')
+    return url.hostname, url.port or 80
+
+
+async def replay(requests, base_url, concurrency=10, speed=1.0):
+    """Send requests from concurrent clients, return results and seconds"""
+    host, port = parse_base_url(base_url)
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    results = []
+
+    async def client():
+        connection = Connection(host, port)
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                request, due = item
+                start = due or loop.time()
+                try:
+                    status = await connection.request(
+                        request.method, request.target, request.headers)
+                except (OSError, asyncio.IncompleteReadError, ValueError):
+                    await connection.close()
+                    status = None
+                results.append(
+                    Result(request.route, status, loop.time() - start))
+        finally:
+            await connection.close()
+
+    started = time.perf_counter()
+    clients = [asyncio.ensure_future(client()) for _ in range(concurrency)]
+    start = loop.time()
+    for request in requests:
+        due = None
+        if speed:
+            due = start + (request.at - requests[0].at) / speed
+            await asyncio.sleep(max(0, due - loop.time()))
+        queue.put_nowait((request, due))
+    for _ in clients:
+        queue.put_nowait(None)
+    await asyncio.gather(*clients)
+
+    return results, time.perf_counter() - started
+
+
+def percentile(seconds, percent):
+    """Return the nearest rank percentile of sorted seconds, in ms"""
+    rank = max(1, math.ceil(len(seconds) * percent / 100))
+    return seconds[rank - 1] * 1000
+
+
+def summarize(results, elapsed):
+    """Return the throughput, latencies and errors of each route
+
+    The routes are sorted by request count, followed by all the routes
+    together under None.
+    """
+    routes = {}
+    for result in results:
+        routes.setdefault(result.route, []).append(result)
+    routes = dict(sorted(routes.items(), key=lambda item: -len(item[1])))
+    routes[None] = results
+
+    summary = {}
+    for route, route_results in routes.items():
+        seconds = sorted(result.seconds for result in route_results)
+        statuses = [result.status for result in route_results
+                    if result.status is not None]
+        connection_errors = len(route_results) - len(statuses)
+        client_errors = sum(
+            CLIENT_ERROR <= status < SERVER_ERROR for status in statuses)
+        server_errors = sum(status >= SERVER_ERROR for status in statuses)
+        errors = connection_errors + client_errors + server_errors
+        summary[route] = {
+            'requests': len(route_results),
+            'throughput': len(route_results) / elapsed if elapsed else 0,
+            'p50_ms': percentile(seconds, 50),
+            'p90_ms': percentile(seconds, 90),
+            'p99_ms': percentile(seconds, 99),
+            'client_errors': client_errors,
+            'server_errors': server_errors,
+            'connection_errors': connection_errors,
+            'error_rate': errors / len(seconds),
+        }
+    return summary
@@ -0,0 +1,71 @@
+import contextlib
+import contextvars
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+
+STICKY_KEY = 'replica:sticky:{user_id}'
+
+_use_replicas = contextvars.ContextVar('use_replicas', default=False)
+
+
+def replicas_enabled():
+    """Return if the reads of the current context may use a replica"""
+    return _use_replicas.get() and bool(settings.REPLICA_DATABASES)
+
+
+@contextlib.contextmanager
+def use_replicas(enabled=True):
+    """Send the reads of the block to the replicas"""
+    token = _use_replicas.set(enabled)
+    try:
+        yield
+    finally:
+        _use_replicas.reset(token)
+
+
+def get_cache():
+    """Return the cache holding the users that read their writes"""
+    return caches[settings.REPLICA_STICKY_CACHE_ALIAS]
+
+
+def stick(user_id):
+    """Read from the primary for a user that just wrote"""
+    get_cache().set(STICKY_KEY.format(user_id=user_id), True,
+                    settings.REPLICA_STICKY_SECONDS)
+
+
+def is_sticky(user_id):
+    """Return if a user wrote recently and must read from the primary"""
+    return bool(get_cache().get(STICKY_KEY.format(user_id=user_id)))
+
+
+class ReplicaReadsMixin:
+    """Serve the safe requests of a view from the read replicas
+
+    Users who wrote in the last REPLICA_STICKY_SECONDS keep reading from
+    the primary database, so they see their own writes even when the
+    replicas lag behind.
+    """
+    _replica_token = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        if request.method in SAFE_METHODS and settings.REPLICA_DATABASES \
+                and not is_sticky(request.user.pk):
+            self._replica_token = _use_replicas.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        try:
+            return super().finalize_response(
+                request, response, *args, **kwargs)
+        finally:
+            if self._replica_token is not None:
+                _use_replicas.reset(self._replica_token)
+                self._replica_token = None
+            elif request.method not in SAFE_METHODS \
+                    and response.status_code < 400 \
+                    and request.user.is_authenticated:
+                stick(request.user.pk)
@@ -0,0 +1,31 @@
+import random
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from core import replicas
+
+
+class ReplicaRouter:
+    """Send reads to a random replica inside `replicas.use_replicas`
+
+    Objects read from a replica are written to the primary database.
+    """
+
+    def db_for_read(self, model, **hints):
+        if replicas.replicas_enabled():
+            return random.choice(settings.REPLICA_DATABASES)
+        return None
+
+    def db_for_write(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None \
+                and instance._state.db in settings.REPLICA_DATABASES:
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.REPLICA_DATABASES}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,231 @@
+"""Synthetic users, real estates and properties for local benchmarks
+
+Rows are generated and inserted in batches with explicit primary keys,
+starting after the highest existing ones, so nothing is read back to
+link them and memory stays flat however many rows are created. The
+real estates, properties and links are inserted as plain values,
+without the ORM. The same arguments and random seed create the same
+data.
+"""
+import random
+import time
+from itertools import accumulate, islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from core.models import Property, RealEstate
+
+# Field values and their weights
+PROPERTY_TYPES = (('Apartamento', 45), ('Casa', 35), ('Terreno', 10),
+                  ('Sala comercial', 10))
+FINALITIES = (('residencial', 70), ('comercial', 25), ('rural', 5))
+FEATURES = (('', 40), ('garagem', 25), ('garagem, churrasqueira', 10),
+            ('garagem, piscina', 10), ('churrasqueira', 10),
+            ('piscina', 5))
+STREETS = ('Augusta', 'Paulista', 'Brasil', 'Bahia', 'Consolação',
+           'Ipiranga', 'Rebouças', 'Faria Lima', 'Santo Amaro', 'Liberdade')
+NEIGHBORHOODS = ('Centro', 'Jardins', 'Moema', 'Pinheiros', 'Lapa',
+                 'Vila Mariana', 'Santana', 'Tatuapé')
+# Share of the properties listed by no real estate
+UNLISTED_WEIGHT = 20
+# Columns of the generated property rows
+PROPERTY_FIELDS = ('id', 'user', 'name', 'address', 'description',
+                   'features', 'status', 'type', 'finality', 'updated_at')
+
+
+def allocate(total, owners, skew):
+    """Split a total between owners, by a Zipf law of exponent skew
+
+    A skew of 0 splits it evenly; the higher the skew, the more the
+    first owners get. Remainders go to the first owners.
+    """
+    if not owners:
+        return []
+
+    weights = [1 / (rank + 1) ** skew for rank in range(owners)]
+    scale = total / sum(weights)
+    shares = [int(weight * scale) for weight in weights]
+    for index in range(total - sum(shares)):
+        shares[index % owners] += 1
+    return shares
+
+
+def link_weights(links):
+    """Return the weights of listing a property by 0 to links real estates
+
+    Most properties are listed by one real estate, each extra one being
+    half as likely as the previous count.
+    """
+    return [UNLISTED_WEIGHT] + [50 / 2 ** count for count in range(links)]
+
+
+class _Picker:
+    """Weighted random choice among fixed values"""
+
+    def __init__(self, rand, choices):
+        self.rand = rand
+        self.values = [value for value, _ in choices]
+        self.cum_weights = list(accumulate(weight for _, weight in choices))
+
+    def __call__(self):
+        return self.rand.choices(
+            self.values, cum_weights=self.cum_weights)[0]
+
+
+def seed(users, real_estates, properties, links=3, skew=1.0,
+         random_seed=0, batch_size=5000, log=None):
+    """Bulk create users with their real estates and linked properties
+
+    The real estates and the properties are split between the users by
+    `allocate`, each property listed by up to `links` real estates of
+    its user. `log` is called with a line per created model. Return the
+    ids of the users.
+    """
+    rand = random.Random(random_seed)
+    user_model = get_user_model()
+    through = Property.real_estates.through
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+
+    def report(name, count, start):
+        if log is not None:
+            log(f'{count} {name} in {time.perf_counter() - start:.1f}s')
+
+    start = time.perf_counter()
+    first_user = _next_id(user_model)
+    user_ids = list(range(first_user, first_user + users))
+    for batch in _batches(batch_size, (
+        user_model(id=pk, email=f'seed{pk}@company.com', name=f'Seed {pk}')
+        for pk in user_ids
+    )):
+        user_model.objects.bulk_create(batch)
+    report('users', users, start)
+
+    # The real estates of each user have consecutive ids
+    start = time.perf_counter()
+    real_estate_counts = allocate(real_estates, users, skew)
+    first_real_estate = _next_id(RealEstate)
+    real_estate_starts = [
+        first_real_estate + offset
+        for offset in accumulate([0] + real_estate_counts[:-1])
+    ]
+    street = _Picker(rand, [(name, 1) for name in STREETS])
+    _insert(RealEstate, ('id', 'user', 'name', 'address', 'updated_at'), (
+        (pk, user_id, f'Imobiliaria {pk}',
+         f'Rua {street()} {rand.randrange(1, 5000)}', now)
+        for user_id, first, count in zip(
+            user_ids, real_estate_starts, real_estate_counts)
+        for pk in range(first, first + count)
+    ), batch_size)
+    report('real estates', real_estates, start)
+
+    # Each batch of properties is inserted with its links
+    start = time.perf_counter()
+    link_total = 0
+    rows = _properties(
+        rand, user_ids, allocate(properties, users, skew),
+        real_estate_starts, real_estate_counts, link_weights(links), street,
+        now)
+    for batch in _batches(batch_size, rows):
+        links_made = [
+            (row[0], real_estate_id)
+            for row, real_estate_ids in batch
+            for real_estate_id in real_estate_ids
+        ]
+        with transaction.atomic():
+            _insert(Property, PROPERTY_FIELDS, (row for row, _ in batch),
+                    batch_size)
+            _insert(through, ('property', 'realestate'), links_made,
+                    batch_size)
+        link_total += len(links_made)
+    report(f'properties and {link_total} real estate links', properties,
+           start)
+
+    statements = connection.ops.sequence_reset_sql(
+        no_style(), [user_model, RealEstate, Property])
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+    return user_ids
+
+
+def _properties(rand, user_ids, counts, real_estate_starts,
+                real_estate_counts, weights, street, now):
+    """Yield the values of the properties and the ids of their real estates
+
+    The values are in the order of PROPERTY_FIELDS.
+    """
+    property_type = _Picker(rand, PROPERTY_TYPES)
+    finality = _Picker(rand, FINALITIES)
+    features = _Picker(rand, FEATURES)
+    neighborhood = _Picker(rand, [(name, 1) for name in NEIGHBORHOODS])
+    link_count = _Picker(rand, list(enumerate(weights)))
+
+    pk = _next_id(Property)
+    for user_id, count, first, available in zip(
+            user_ids, counts, real_estate_starts, real_estate_counts):
+        real_estate_ids = range(first, first + available)
+        for _ in range(count):
+            kind = property_type()
+            place = neighborhood()
+            row = (
+                pk,
+                user_id,
+                f'{kind} {place} {pk}',
+                f'Rua {street()} {rand.randrange(1, 5000)}',
+                f'{kind} com {rand.randint(1, 5)} quartos em {place}',
+                features(),
+                rand.random() < 0.3,
+                kind,
+                finality(),
+                now,
+            )
+            yield row, rand.sample(
+                real_estate_ids, min(link_count(), available))
+            pk += 1
+
+
+def _insert(model, names, rows, batch_size):
+    """Insert rows of database values in multi-row INSERT statements
+
+    A bulk_create spends most of its time preparing each value of each
+    object, so the rows skip the model instances and the fields.
+    """
+    ops = connection.ops
+    fields = [model._meta.get_field(name) for name in names]
+    size = min(batch_size, ops.bulk_batch_size(fields, range(batch_size)))
+    prefix = 'INSERT INTO %s (%s) ' % (
+        ops.quote_name(model._meta.db_table),
+        ', '.join(ops.quote_name(field.column) for field in fields),
+    )
+    placeholders = ['%s'] * len(fields)
+
+    def statement(count):
+        return prefix + ops.bulk_insert_sql(fields, [placeholders] * count)
+
+    full = statement(size)
+    with connection.cursor() as cursor:
+        for batch in _batches(size, rows):
+            params = [value for row in batch for value in row]
+            cursor.execute(
+                full if len(batch) == size else statement(len(batch)),
+                params)
+
+
+def _batches(size, rows):
+    """Yield lists of up to size rows"""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _next_id(model):
+    """Return the primary key following the highest one of a model"""
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
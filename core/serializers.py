@@ -0,0 +1,14 @@
+from rest_framework import serializers
+
+from core.models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    """Serializer for the status of a background job"""
+    url = serializers.HyperlinkedIdentityField(view_name='jobs:job-detail')
+
+    class Meta:
+        model = Job
+        fields = ('id', 'url', 'name', 'status', 'attempts', 'max_attempts',
+                  'result', 'run_after', 'created_at', 'updated_at')
+        read_only_fields = fields
@@ -0,0 +1,42 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from whitenoise import middleware
+
+
+class WhiteNoiseMiddleware(middleware.WhiteNoiseMiddleware):
+    """WhiteNoise able to run in the async middleware chain
+
+    django_heroku puts WhiteNoise, which is sync only, at the top of
+    MIDDLEWARE, which would run the whole ASGI chain on one thread per
+    worker. Under ASGI, the requests for other paths go on to the next
+    middleware on the event loop; static files are found and served on
+    a thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Let Django tell the instance is a coroutine function
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.acall(request)
+        return super().__call__(request)
+
+    async def acall(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(
+                self.find_file, thread_sensitive=False)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is None:
+            return await self.get_response(request)
+
+        return await sync_to_async(self.serve, thread_sensitive=False)(
+            static_file, request)
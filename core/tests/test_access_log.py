@@ -0,0 +1,94 @@
+import asyncio
+import json
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core import access_log
+
+PROPERTY_URL = reverse('property:property-list')
+ME_URL = reverse('user:me')
+
+
+@override_settings(ACCESS_LOG_FILE='access.log')
+class AccessLogTest(TestCase):
+    """Test the access log of the API requests"""
+
+    def setUp(self):
+        """Create a set up that run before the tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'accesslogdev@company.com',
+            'testpass'
+        )
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token}')
+
+    def test_request_logged(self):
+        """Test a line holds the request, its user and its status"""
+        with self.assertLogs('core.access_log', 'INFO') as logs:
+            self.client.get(PROPERTY_URL, {'type': 'Casa', 'page_size': 5})
+
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertEqual(entry['method'], 'GET')
+        self.assertEqual(entry['path'], PROPERTY_URL)
+        self.assertEqual(entry['query'], 'type=Casa&page_size=5')
+        self.assertEqual(entry['user'], self.user.pk)
+        self.assertEqual(entry['status'], 200)
+        self.assertGreaterEqual(entry['ms'], 0)
+
+    def test_anonymous_request(self):
+        """Test requests without a user are logged with a null user"""
+        with self.assertLogs('core.access_log', 'INFO') as logs:
+            APIClient().get(ME_URL)
+
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertIsNone(entry['user'])
+        self.assertEqual(entry['status'], 401)
+
+    def test_async_chain(self):
+        """Test the middleware logs requests of the async chain"""
+        async def get_response(request):
+            return HttpResponse(status=204)
+
+        middleware = access_log.AccessLogMiddleware(get_response)
+        with self.assertLogs('core.access_log', 'INFO') as logs:
+            async_to_sync(middleware)(RequestFactory().get(ME_URL))
+
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertEqual((entry['path'], entry['status']), (ME_URL, 204))
+
+    def test_other_paths_not_logged(self):
+        """Test requests out of ACCESS_LOG_PREFIXES are not logged"""
+        with patch.object(access_log.logger, 'info') as info:
+            self.client.get(reverse('metrics'))
+
+        info.assert_not_called()
+
+    @override_settings(ACCESS_LOG_FILE='')
+    def test_disabled_without_file(self):
+        """Test nothing is logged while no file is set"""
+        with patch.object(access_log.logger, 'info') as info:
+            self.client.get(PROPERTY_URL)
+
+        info.assert_not_called()
+
+    def test_read(self):
+        """Test the lines are read back oldest first"""
+        lines = [
+            '{"time": 2.0, "method": "GET", "path": "/b"}\n',
+            '\n',
+            '{"time": 1.0, "method": "GET", "path": "/a"}\n',
+        ]
+
+        entries = access_log.read(lines)
+
+        self.assertEqual([entry['path'] for entry in entries], ['/a', '/b'])
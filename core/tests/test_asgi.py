@@ -0,0 +1,70 @@
+import json
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.authtoken.models import Token
+
+from core.asgi import StreamingASGIHandler
+from property.tests.test_property import sample_property
+
+EXPORT_URL = reverse('property:property-export')
+
+
+class StreamingASGIHandlerTest(TransactionTestCase):
+    """Test serving requests through the ASGI handler"""
+
+    def setUp(self):
+        """Create a set up that run before the tests"""
+        self.user = get_user_model().objects.create_user(
+            'asgidev@company.com',
+            'testpass'
+        )
+        self.token = Token.objects.create(user=self.user)
+
+    def _get(self, path):
+        """Return the messages sent by the handler for a GET request"""
+        scope = {
+            'type': 'http',
+            'method': 'GET',
+            'path': path,
+            'query_string': b'',
+            'headers': [
+                (b'authorization', f'Token {self.token.key}'.encode()),
+            ],
+        }
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b''}
+
+        async def send(message):
+            messages.append(message)
+
+        async_to_sync(StreamingASGIHandler())(scope, receive, send)
+        return messages
+
+    @override_settings(PROPERTY_EXPORT_CHUNK_SIZE=2)
+    def test_stream_export(self):
+        """Test the export queries run while its body is streamed"""
+        for index in range(5):
+            sample_property(user=self.user, name=f'Imovel {index}')
+
+        messages = self._get(EXPORT_URL)
+
+        self.assertEqual(messages[0]['status'], 200)
+        self.assertEqual(messages[-1], {'type': 'http.response.body'})
+        body = b''.join(message.get('body', b'') for message in messages[1:])
+        self.assertEqual(
+            [json.loads(line)['name'] for line in body.splitlines()],
+            [f'Imovel {index}' for index in range(5)])
+
+    def test_regular_response(self):
+        """Test the other responses are sent as they are"""
+        messages = self._get(reverse('user:me'))
+
+        self.assertEqual(messages[0]['status'], 200)
+        self.assertEqual(json.loads(messages[1]['body'])['email'],
+                         'asgidev@company.com')
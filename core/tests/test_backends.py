@@ -0,0 +1,100 @@
+import copy
+from unittest.mock import MagicMock, patch
+
+from django.db import connection
+from django.test import SimpleTestCase
+
+from core.backends.postgresql import base
+
+
+def sample_wrapper(**settings):
+    """Create a PostgreSQL wrapper that connects to a mock"""
+    settings_dict = copy.deepcopy(connection.settings_dict)
+    settings_dict.update(ENGINE='core.backends.postgresql', TIME_ZONE=None,
+                         CONN_MAX_AGE=600, CONN_HEALTH_CHECKS=True)
+    settings_dict.update(settings)
+    wrapper = base.DatabaseWrapper(settings_dict, alias='mock')
+
+    for name in ('get_connection_params', 'init_connection_state',
+                 '_set_autocommit'):
+        patcher = patch.object(wrapper, name)
+        patcher.start()
+    wrapper.get_new_connection = MagicMock(
+        side_effect=lambda params: MagicMock(autocommit=True))
+    wrapper.is_usable = MagicMock(return_value=True)
+    return wrapper
+
+
+class PostgreSQLBackendTest(SimpleTestCase):
+    """Test the persistent connections of the PostgreSQL backend"""
+
+    def setUp(self):
+        """Snapshot the stats before each test"""
+        self.stats = dict(base.stats)
+        self.addCleanup(patch.stopall)
+
+    def delta(self, name):
+        """Return how much a stat grew during the test"""
+        return base.stats[name] - self.stats[name]
+
+    def request(self, wrapper, queries=2):
+        """Simulate a request using the connection"""
+        wrapper.close_if_unusable_or_obsolete()
+        for _ in range(queries):
+            wrapper.ensure_connection()
+        wrapper.close_if_unusable_or_obsolete()
+
+    def test_connection_reused(self):
+        """Test a persistent connection serves the next requests"""
+        wrapper = sample_wrapper()
+
+        for _ in range(3):
+            self.request(wrapper)
+
+        self.assertEqual(wrapper.get_new_connection.call_count, 1)
+        self.assertEqual(self.delta('connections_opened'), 1)
+        self.assertEqual(self.delta('connections_reused'), 2)
+        self.assertEqual(self.delta('checkouts'), 3)
+
+    def test_health_checked_once_per_request(self):
+        """Test a reused connection is checked on its first use only"""
+        wrapper = sample_wrapper()
+        self.request(wrapper)
+
+        self.request(wrapper, queries=5)
+
+        self.assertEqual(wrapper.is_usable.call_count, 1)
+
+    def test_broken_connection_replaced(self):
+        """Test a connection failing the health check is replaced"""
+        wrapper = sample_wrapper()
+        self.request(wrapper)
+        broken = wrapper.connection
+        wrapper.is_usable.return_value = False
+
+        self.request(wrapper)
+
+        broken.close.assert_called_once_with()
+        self.assertEqual(wrapper.get_new_connection.call_count, 2)
+        self.assertEqual(self.delta('health_check_failures'), 1)
+        self.assertEqual(self.delta('connections_closed'), 1)
+
+    def test_health_checks_disabled(self):
+        """Test connections are reused unchecked when disabled"""
+        wrapper = sample_wrapper(CONN_HEALTH_CHECKS=False)
+
+        self.request(wrapper)
+        self.request(wrapper)
+
+        wrapper.is_usable.assert_not_called()
+        self.assertEqual(wrapper.get_new_connection.call_count, 1)
+
+    def test_not_persistent(self):
+        """Test connections are closed after each request by default"""
+        wrapper = sample_wrapper(CONN_MAX_AGE=0)
+
+        self.request(wrapper)
+        self.request(wrapper)
+
+        self.assertEqual(wrapper.get_new_connection.call_count, 2)
+        self.assertEqual(self.delta('connections_closed'), 2)
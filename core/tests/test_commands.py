@@ -1,8 +1,14 @@
+from io import StringIO
 from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.db import models
 from django.core.management import call_command
 from django.db.utils import OperationalError
 from django.test import TestCase
 
+from core.models import Property, RealEstate
+from core.seeding import allocate
+
 
 class CommandTests(TestCase):
 
@@ -20,3 +26,84 @@ class CommandTests(TestCase):
             gi.side_effect = [OperationalError] * 5 + [True]
             call_command('wait_for_db')
             self.assertEqual(gi.call_count, 6)
+
+
+class SeedDataCommandTests(TestCase):
+    """Test the synthetic data seeding command"""
+
+    def _seed(self, *args):
+        """Run the command and return the ids of the seeded users"""
+        before = set(get_user_model().objects.values_list('id', flat=True))
+        call_command('seed_data', *args, stdout=StringIO())
+        after = set(get_user_model().objects.values_list('id', flat=True))
+        return sorted(after - before)
+
+    def _rows(self, user_ids):
+        """Return the seeded properties and real estate links, in order"""
+        properties = Property.objects.filter(user_id__in=user_ids) \
+            .order_by('id')
+        return (
+            list(properties.values_list(
+                'type', 'finality', 'status', 'features', 'address')),
+            [len(propert.real_estates.all())
+             for propert in properties.prefetch_related('real_estates')],
+        )
+
+    def test_seed_data(self):
+        """Test the command creates the requested rows"""
+        user_ids = self._seed('--users', '3', '--real-estates', '12',
+                              '--properties', '300', '--links', '2')
+
+        self.assertEqual(len(user_ids), 3)
+        self.assertEqual(
+            RealEstate.objects.filter(user_id__in=user_ids).count(), 12)
+        self.assertEqual(
+            Property.objects.filter(user_id__in=user_ids).count(), 300)
+        through = Property.real_estates.through
+        links = through.objects.filter(property__user_id__in=user_ids)
+        self.assertTrue(links.exists())
+        self.assertFalse(
+            links.exclude(realestate__user=models.F('property__user'))
+            .exists())
+        counts = self._rows(user_ids)[1]
+        self.assertLessEqual(max(counts), 2)
+        self.assertIn(0, counts)
+
+    def test_deterministic(self):
+        """Test the same seed creates the same data"""
+        args = ('--users', '2', '--real-estates', '4',
+                '--properties', '50', '--seed', '7')
+        first = self._rows(self._seed(*args))
+        second = self._rows(self._seed(*args))
+        other = self._rows(self._seed(*args[:-1], '8'))
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    def test_skew(self):
+        """Test the first users own more properties"""
+        user_ids = self._seed('--users', '4', '--real-estates', '0',
+                              '--properties', '100')
+
+        counts = [Property.objects.filter(user_id=user_id).count()
+                  for user_id in user_ids]
+        self.assertEqual(counts, allocate(100, 4, 1.0))
+        self.assertEqual(counts, sorted(counts, reverse=True))
+
+    def test_new_rows_after_seeding(self):
+        """Test rows created after seeding get the next ids"""
+        user_id, = self._seed('--users', '1', '--real-estates', '1',
+                              '--properties', '5')
+
+        propert = Property.objects.create(user_id=user_id, name='Novo')
+
+        self.assertEqual(
+            propert.id,
+            Property.objects.exclude(pk=propert.pk)
+            .order_by('-id').first().id + 1)
+
+    def test_allocate(self):
+        """Test totals are split by the skew and fully allocated"""
+        self.assertEqual(allocate(10, 3, 0), [4, 3, 3])
+        self.assertEqual(allocate(100, 4, 1.0), [48, 24, 16, 12])
+        self.assertEqual(allocate(5, 0, 1.0), [])
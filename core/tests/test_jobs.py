@@ -0,0 +1,355 @@
+import time
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import jobs
+from core.models import Job
+
+JOBS_URL = reverse('jobs:job-list')
+
+# Failures left to the flaky task, by key
+failures = {}
+
+
+@jobs.task
+def add(a, b):
+    """Return the sum of two numbers"""
+    return a + b
+
+
+@jobs.task(max_attempts=3)
+def flaky(key):
+    """Fail until the failures of a key run out"""
+    if failures.get(key):
+        failures[key] -= 1
+        raise RuntimeError('flaky')
+    return key
+
+
+@jobs.task
+def reject(detail):
+    """Fail without retrying"""
+    raise jobs.JobFailed(detail)
+
+
+def job_url(job_id):
+    """Return the job detail URL"""
+    return reverse('jobs:job-detail', args=[job_id])
+
+
+@override_settings(JOBS_BACKEND='core.jobs.SyncBackend')
+class SyncBackendTest(TestCase):
+    """Test running jobs in the enqueuing thread"""
+
+    def _enqueue(self, func, *args):
+        """Enqueue a job, run it and return it from the database"""
+        with self.captureOnCommitCallbacks(execute=True):
+            job = jobs.enqueue(func, *args)
+        job.refresh_from_db()
+        return job
+
+    def test_run(self):
+        """Test a job stores the result of its task"""
+        job = self._enqueue(add, 1, 2)
+
+        self.assertEqual(job.name, 'core.tests.test_jobs.add')
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(job.result, 3)
+        self.assertEqual(job.attempts, 1)
+
+    def test_retried(self):
+        """Test a failing job is retried until it succeeds"""
+        failures['retried'] = 2
+
+        job = self._enqueue(flaky, 'retried')
+
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(job.attempts, 3)
+        self.assertEqual(job.error, '')
+
+    def test_attempts_exhausted(self):
+        """Test a job failing on every attempt is failed"""
+        failures['exhausted'] = 5
+
+        job = self._enqueue(flaky, 'exhausted')
+
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 3)
+        self.assertIn('RuntimeError: flaky', job.error)
+
+    @override_settings(JOBS_MAX_ATTEMPTS=2)
+    def test_default_max_attempts(self):
+        """Test tasks without max_attempts use JOBS_MAX_ATTEMPTS"""
+        job = self._enqueue(add, 1, None)
+
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_job_failed(self):
+        """Test raising JobFailed fails the job without retrying it"""
+        job = self._enqueue(reject, {'detail': 'invalid'})
+
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.result, {'detail': 'invalid'})
+
+    def test_unknown_task(self):
+        """Test a job of an unknown task fails"""
+        job = Job.objects.create(name='core.tests.test_jobs.missing')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            jobs.schedule(job)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.result, {
+            'detail': 'Unknown task core.tests.test_jobs.missing.'})
+
+    def test_runs_after_commit(self):
+        """Test a job is not run before the transaction commits"""
+        with self.captureOnCommitCallbacks() as callbacks:
+            job = jobs.enqueue(add, 1, 2)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(len(callbacks), 1)
+
+
+@override_settings(JOBS_BACKEND='core.jobs.DatabaseBackend',
+                   JOBS_RETRY_DELAY=60)
+class DatabaseBackendTest(TestCase):
+    """Test running jobs from the queue stored in the database"""
+
+    def test_left_queued(self):
+        """Test enqueued jobs wait for a worker"""
+        with self.captureOnCommitCallbacks(execute=True):
+            job = jobs.enqueue(add, 1, 2)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+
+    def test_claim_due_jobs_in_order(self):
+        """Test workers claim the due jobs, the oldest first"""
+        now = timezone.now()
+        later = Job.objects.create(
+            name=add.job_name, run_after=now + timedelta(minutes=1))
+        second = Job.objects.create(name=add.job_name, run_after=now)
+        first = Job.objects.create(
+            name=add.job_name, run_after=now - timedelta(minutes=1))
+
+        self.assertEqual(jobs.claim(), first)
+        self.assertEqual(jobs.claim(), second)
+        self.assertIsNone(jobs.claim())
+        later.refresh_from_db()
+        self.assertEqual(later.status, Job.QUEUED)
+        first.refresh_from_db()
+        self.assertEqual(first.status, Job.RUNNING)
+        self.assertEqual(first.attempts, 1)
+
+    def test_retry_backoff(self):
+        """Test a failed attempt is retried once the delay doubles"""
+        failures['backoff'] = 5
+        job = jobs.enqueue(flaky, 'backoff')
+
+        jobs.run(jobs.claim())
+        job.refresh_from_db()
+        first_delay = job.run_after - job.updated_at
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        jobs.run(jobs.claim())
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(job.attempts, 2)
+        self.assertAlmostEqual(first_delay.total_seconds(), 60, delta=1)
+        self.assertAlmostEqual(
+            (job.run_after - job.updated_at).total_seconds(), 120, delta=1)
+        self.assertIsNone(jobs.claim())
+
+    def _running(self, minutes_ago, attempts=1):
+        """Create a job started some minutes ago"""
+        job = Job.objects.create(
+            name=add.job_name, args=[1, 2], status=Job.RUNNING,
+            attempts=attempts, max_attempts=3)
+        Job.objects.filter(pk=job.pk).update(
+            updated_at=timezone.now() - timedelta(minutes=minutes_ago))
+        return job
+
+    @override_settings(JOBS_TIMEOUT=600)
+    def test_stale_job_requeued(self):
+        """Test a job running past JOBS_TIMEOUT is claimed again"""
+        job = self._running(11)
+        self._running(5)
+
+        self.assertEqual(jobs.claim(), job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.RUNNING)
+        self.assertEqual(job.attempts, 2)
+        self.assertIn('Still running after', job.error)
+        self.assertIsNone(jobs.claim())
+
+    @override_settings(JOBS_TIMEOUT=600)
+    def test_stale_job_out_of_attempts(self):
+        """Test a stale job on its last attempt is failed"""
+        job = self._running(11, attempts=3)
+
+        self.assertIsNone(jobs.claim())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+
+    def test_run_jobs_command(self):
+        """Test the worker command runs every due job"""
+        first = jobs.enqueue(add, 1, 2)
+        second = jobs.enqueue(add, 3, 4)
+        out = StringIO()
+
+        call_command('run_jobs', '--burst', stdout=out)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.status, first.result), (Job.SUCCEEDED, 3))
+        self.assertEqual((second.status, second.result), (Job.SUCCEEDED, 7))
+        self.assertIn('No jobs left!', out.getvalue())
+
+
+@override_settings(JOBS_BACKEND='core.jobs.ThreadBackend')
+class ThreadBackendTest(TransactionTestCase):
+    """Test running jobs on the thread pool"""
+
+    def test_run(self):
+        """Test a job runs on a pool thread"""
+        job = jobs.enqueue(add, 1, 2)
+
+        deadline = time.monotonic() + 5
+        while job.status != Job.SUCCEEDED and time.monotonic() < deadline:
+            time.sleep(0.05)
+            job.refresh_from_db()
+
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(job.result, 3)
+
+    @override_settings(JOBS_RETRY_DELAY=2)
+    def test_retry_delay_frees_threads(self):
+        """Test jobs waiting for a retry leave the pool to other jobs"""
+        flaky_jobs = []
+        # One after the other, as SQLite locks concurrent writes
+        for key in ('pool-a', 'pool-b'):
+            failures[key] = 1
+            flaky_jobs.append(jobs.enqueue(flaky, key))
+            self._wait(lambda: all(
+                job.attempts == 1 and job.status == Job.QUEUED
+                for job in self._reload(flaky_jobs)))
+
+        job = jobs.enqueue(add, 1, 2)
+        self._wait(lambda: self._reload([job])[0].status == Job.SUCCEEDED)
+
+        self.assertEqual(
+            [job.status for job in self._reload(flaky_jobs)],
+            [Job.QUEUED, Job.QUEUED])
+        self._wait(lambda: all(
+            job.status == Job.SUCCEEDED
+            for job in self._reload(flaky_jobs)))
+
+    def _reload(self, jobs_list):
+        """Return the jobs as stored in the database"""
+        return [Job.objects.get(pk=job.pk) for job in jobs_list]
+
+    def _wait(self, condition, timeout=5):
+        """Wait until a condition holds, failing after the timeout"""
+        deadline = time.monotonic() + timeout
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.05)
+
+
+@override_settings(JOBS_BACKEND='core.jobs.SyncBackend')
+class JobApiTest(TestCase):
+    """Test the job status endpoints"""
+
+    def setUp(self):
+        """Create a set up that run before the tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'jobsdev@company.com',
+            'testpass'
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_requires_auth(self):
+        """Test the jobs require authentication"""
+        res = APIClient().get(JOBS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_list_own_jobs(self):
+        """Test only the jobs of the user are listed"""
+        other = get_user_model().objects.create_user(
+            'otherjobs@company.com', 'testpass')
+        job = Job.objects.create(name=add.job_name, user=self.user)
+        Job.objects.create(name=add.job_name, user=other)
+
+        res = self.client.get(JOBS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in res.data['results']],
+                         [job.id])
+
+    def test_detail(self):
+        """Test the status and result of a job"""
+        with self.captureOnCommitCallbacks(execute=True):
+            job = jobs.enqueue(add, 1, 2, user=self.user)
+
+        res = self.client.get(job_url(job.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['status'], Job.SUCCEEDED)
+        self.assertEqual(res.data['result'], 3)
+        self.assertTrue(res.data['url'].endswith(job_url(job.id)))
+        self.assertNotIn('error', res.data)
+
+    def test_retry(self):
+        """Test retrying a failed job runs it again"""
+        failures['api'] = 3
+        with self.captureOnCommitCallbacks(execute=True):
+            job = jobs.enqueue(flaky, 'api', user=self.user)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(job_url(job.id) + 'retry/')
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(job.attempts, 1)
+
+    @override_settings(JOBS_TIMEOUT=600)
+    def test_retry_stale(self):
+        """Test a job lost while running can be retried"""
+        job = Job.objects.create(name=add.job_name, args=[1, 2],
+                                 user=self.user, status=Job.RUNNING)
+        Job.objects.filter(pk=job.pk).update(
+            updated_at=timezone.now() - timedelta(minutes=11))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(job_url(job.id) + 'retry/')
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.SUCCEEDED)
+
+    def test_retry_only_failed(self):
+        """Test jobs that did not fail cannot be retried"""
+        job = Job.objects.create(name=add.job_name, user=self.user)
+
+        res = self.client.post(job_url(job.id) + 'retry/')
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
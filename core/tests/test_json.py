@@ -0,0 +1,133 @@
+import datetime
+import decimal
+import io
+import uuid
+from collections import OrderedDict
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.models import Property, RealEstate
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+from property.serializers import PropertySerializer, RealEstateSerializer
+
+TEXTS = [
+    '', 'Imóvel São João', 'aspas " e \\ barra', 'linha\nnova\ttab',
+    'controle \x00\x1f\x7f', 'separadores \u2028 \u2029', 'emoji 🏠',
+    '</script>', 'chinês 房子',
+]
+
+PAYLOADS = [
+    {},
+    [],
+    {'a': None, 'b': True, 'c': False, 'd': 0, 'e': -1, 'f': 2 ** 63 - 1},
+    {'texts': TEXTS},
+    OrderedDict([('z', 1), ('a', [1, {'b': [None]}])]),
+    {1: 'chave inteira', 'x': 'y'},
+    {'datetime': datetime.datetime(2020, 5, 17, 10, 30, 1, 123456,
+                                   tzinfo=datetime.timezone.utc),
+     'naive': datetime.datetime(2020, 5, 17, 10, 30),
+     'date': datetime.date(2020, 5, 17),
+     'time': datetime.time(10, 30, 1, 500),
+     'timedelta': datetime.timedelta(days=1, seconds=5),
+     'decimal': decimal.Decimal('10.50'),
+     'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678')},
+    {'big': 2 ** 70},
+    (1, 2, 3),
+]
+
+
+class ORJSONRendererTest(TestCase):
+    """Test the orjson renderer renders the same bytes as DRF"""
+
+    def setUp(self):
+        """Create a set up that run before the tests"""
+        self.renderer = ORJSONRenderer()
+        self.expected = JSONRenderer()
+
+    def assertSameBytes(self, data, media_type=None, context=None):
+        """Assert both renderers return the same bytes"""
+        self.assertEqual(
+            self.renderer.render(data, media_type, context),
+            self.expected.render(data, media_type, context)
+        )
+
+    def test_payloads(self):
+        """Test rendering plain payloads"""
+        for data in PAYLOADS:
+            with self.subTest(data=data):
+                self.assertSameBytes(data)
+
+    def test_serializer_output(self):
+        """Test rendering the property and real estate serializers"""
+        user = get_user_model().objects.create_user(
+            'jsondev@company.com',
+            'testpass'
+        )
+        real_estate = RealEstate.objects.create(
+            user=user, name='Imobiliária 🏠', address='Rua \u2028')
+        for text in TEXTS:
+            propert = Property.objects.create(
+                user=user, name=text, address=text, description=text,
+                features=text, status=True, type='Casa',
+                finality='residencial')
+            propert.real_estates.add(real_estate)
+
+        properties = PropertySerializer(
+            Property.objects.all(), many=True).data
+        real_estates = RealEstateSerializer(
+            RealEstate.objects.all(), many=True).data
+
+        self.assertSameBytes(properties)
+        self.assertSameBytes(real_estates)
+        self.assertSameBytes({'next': None, 'previous': None,
+                              'results': properties})
+
+    def test_empty(self):
+        """Test rendering no data"""
+        self.assertEqual(self.renderer.render(None), b'')
+
+    def test_indent(self):
+        """Test indented output is rendered by DRF"""
+        self.assertSameBytes({'a': [1]}, 'application/json; indent=4')
+        self.assertSameBytes({'a': [1]}, None, {'indent': 2})
+
+    @patch('core.renderers.orjson', None)
+    def test_without_orjson(self):
+        """Test DRF renders when orjson is not installed"""
+        self.assertSameBytes(PAYLOADS[3])
+
+    def test_floats(self):
+        """Test rendering floats, NaN and infinities become null"""
+        self.assertSameBytes([0.1, 1.5, -2.25, 3.0, 1234.5678])
+        self.assertEqual(self.renderer.render([float('nan')]), b'[null]')
+
+
+class ORJSONParserTest(TestCase):
+    """Test the orjson parser parses the same data as DRF"""
+
+    def _parse(self, parser, content):
+        """Parse bytes with a parser"""
+        return parser.parse(io.BytesIO(content), 'application/json', {})
+
+    def test_documents(self):
+        """Test parsing the rendered payloads"""
+        renderer = JSONRenderer()
+        for data in PAYLOADS[:6]:
+            content = renderer.render(data)
+            with self.subTest(content=content):
+                self.assertEqual(self._parse(ORJSONParser(), content),
+                                 self._parse(JSONParser(), content))
+
+    def test_invalid(self):
+        """Test invalid documents raise a parse error"""
+        for content in (b'{', b'{"a": NaN}', b'[Infinity]', b'\xff'):
+            with self.subTest(content=content):
+                with self.assertRaises(ParseError):
+                    self._parse(ORJSONParser(), content)
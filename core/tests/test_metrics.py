@@ -0,0 +1,180 @@
+import asyncio
+import os
+import tempfile
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import resolve, reverse
+from prometheus_client import REGISTRY
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core import metrics
+from core.backends.postgresql import base
+from user.authentication import local_cache
+
+METRICS_URL = reverse('metrics')
+PROPERTY_URL = reverse('property:property-list')
+ME_URL = reverse('user:me')
+
+
+def sample(name, **labels):
+    """Return the value of a sample of the default registry, or 0"""
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@override_settings(METRICS_TOKEN='secret')
+class MetricsTest(TestCase):
+    """Test the Prometheus metrics"""
+
+    def setUp(self):
+        """Create a set up that run before the tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'metricsdev@company.com',
+            'testpass'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token}')
+        local_cache.clear()
+
+    def _scrape(self):
+        """Return the text of the metrics endpoint"""
+        res = APIClient().get(
+            METRICS_URL, HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res.content.decode()
+
+    def test_request_duration(self):
+        """Test the latency of the API requests is observed per view"""
+        labels = {'view': 'property:property-list', 'method': 'GET',
+                  'status': '200'}
+        before = sample('http_request_duration_seconds_count', **labels)
+
+        self.client.get(PROPERTY_URL)
+        self.client.get(PROPERTY_URL)
+
+        self.assertEqual(
+            sample('http_request_duration_seconds_count', **labels),
+            before + 2)
+        self.assertGreater(
+            sample('http_request_duration_seconds_sum', **labels), 0)
+
+    def test_async_chain(self):
+        """Test the middleware observes requests of the async chain"""
+        labels = {'view': 'user:me', 'method': 'GET', 'status': '200'}
+        before = sample('http_request_duration_seconds_count', **labels)
+
+        async def get_response(request):
+            request.resolver_match = resolve(ME_URL)
+            return HttpResponse()
+
+        middleware = metrics.MetricsMiddleware(get_response)
+        async_to_sync(middleware)(RequestFactory().get(ME_URL))
+
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        self.assertEqual(
+            sample('http_request_duration_seconds_count', **labels),
+            before + 1)
+
+    def test_other_namespaces_not_observed(self):
+        """Test requests out of METRICS_NAMESPACES are not observed"""
+        self.client.get(METRICS_URL)
+
+        self.assertNotIn('view="metrics"', self._scrape())
+
+    def test_db_queries(self):
+        """Test the SQL queries are observed per database"""
+        before = sample('db_query_duration_seconds_count',
+                        database='default')
+
+        get_user_model().objects.count()
+
+        self.assertEqual(
+            sample('db_query_duration_seconds_count', database='default'),
+            before + 1)
+
+    def test_auth_token_lookups(self):
+        """Test the token lookups are counted by cache layer"""
+        before = {
+            source: sample('auth_token_lookups_total', source=source)
+            for source in ('local', 'database')
+        }
+
+        self.client.get(ME_URL)
+        self.client.get(ME_URL)
+
+        self.assertEqual(
+            sample('auth_token_lookups_total', source='database'),
+            before['database'] + 1)
+        self.assertEqual(
+            sample('auth_token_lookups_total', source='local'),
+            before['local'] + 1)
+
+    def test_memory(self):
+        """Test the resident memory of the worker is exposed"""
+        with patch.object(metrics, '_memory_read_at', 0.0):
+            self.client.get(ME_URL)
+
+        self.assertGreater(sample('worker_resident_memory_bytes'), 0)
+
+    def test_scrape(self):
+        """Test the endpoint exposes every metric"""
+        self.client.get(PROPERTY_URL)
+
+        text = self._scrape()
+
+        for name in ('http_request_duration_seconds_bucket',
+                     'db_query_duration_seconds_count',
+                     'auth_token_lookups_total',
+                     'worker_resident_memory_bytes',
+                     'property_response_cache_lookups_total'):
+            self.assertIn(name, text)
+
+    def test_database_connections(self):
+        """Test the connection stats of the backend are exposed"""
+        stats = {
+            'connections_opened': 3,
+            'connections_reused': 5,
+            'connections_closed': 2,
+            'health_check_failures': 1,
+            'checkouts': 8,
+            'checkout_seconds': 0.5,
+        }
+        with patch.dict(base.stats, stats):
+            text = self._scrape()
+
+        for line in ('db_connections_total{event="opened"} 3.0',
+                     'db_connections_total{event="reused"} 5.0',
+                     'db_connections_total{event="closed"} 2.0',
+                     'db_connection_health_check_failures_total 1.0',
+                     'db_connection_checkout_seconds_count 8.0',
+                     'db_connection_checkout_seconds_sum 0.5'):
+            self.assertIn(line, text)
+
+    def test_multiprocess(self):
+        """Test the endpoint adds up the files of the workers"""
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.dict(os.environ, PROMETHEUS_MULTIPROC_DIR=directory):
+            text = self._scrape()
+
+        self.assertIn('property_response_cache_lookups_total', text)
+        self.assertNotIn('python_gc_objects_collected_total', text)
+
+    def test_wrong_token(self):
+        """Test scrapes without the token are forbidden"""
+        res = APIClient().get(METRICS_URL, HTTP_AUTHORIZATION='Bearer x')
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_disabled_without_token(self):
+        """Test the endpoint is missing while no token is set"""
+        res = APIClient().get(METRICS_URL, HTTP_AUTHORIZATION='Bearer ')
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,212 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from urllib.parse import parse_qs, urlsplit
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+from rest_framework.authtoken.models import Token
+
+from core import replay
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Answer the status of the `status` query param, chunked on demand"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        query = parse_qs(urlsplit(self.path).query)
+        self.server.seen.append((
+            self.path, self.headers.get('Authorization'), self.client_address))
+        body = b'{"ok": true}'
+        self.send_response(int(query.get('status', ['200'])[0]))
+        if 'chunked' in query:
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            self.wfile.write(b'%x\r\n%s\r\n0\r\n\r\n' % (len(body), body))
+        else:
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ServerMixin:
+    """Run a local HTTP server for the tests of the class"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        cls.server.daemon_threads = True
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True) \
+            .start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        """Forget the requests of the previous tests"""
+        self.server.seen = []
+
+
+class ReplayTest(ServerMixin, SimpleTestCase):
+    """Test the replay of requests"""
+
+    def _replay(self, targets, concurrency=2, speed=0, gap=0):
+        requests = [
+            replay.Request(index * gap, target.split('?')[0], 'GET', target,
+                           {'Authorization': 'Token abc'})
+            for index, target in enumerate(targets)
+        ]
+        return asyncio.run(replay.replay(
+            requests, self.base_url, concurrency, speed))
+
+    def test_statuses(self):
+        """Test every request is sent and its status recorded"""
+        results, _ = self._replay(
+            ['/a', '/b?chunked=1', '/a?status=404', '/c?status=500'])
+
+        self.assertEqual(
+            sorted((result.route, result.status) for result in results),
+            [('/a', 200), ('/a', 404), ('/b', 200), ('/c', 500)])
+        self.assertTrue(all(result.seconds >= 0 for result in results))
+        self.assertEqual(
+            {auth for _, auth, _ in self.server.seen}, {'Token abc'})
+
+    def test_connections_kept_alive(self):
+        """Test each client sends its requests on a single connection"""
+        self._replay(['/a?chunked=1', '/b'] * 10, concurrency=2)
+
+        self.assertEqual(len(self.server.seen), 20)
+        self.assertLessEqual(
+            len({address for _, _, address in self.server.seen}), 2)
+
+    def test_speed(self):
+        """Test the recorded pace is compressed by the speed"""
+        _, elapsed = self._replay(['/a', '/a', '/a'], speed=10, gap=1)
+
+        self.assertGreaterEqual(elapsed, 0.2)
+        self.assertLess(elapsed, 2)
+
+    def test_connection_failure(self):
+        """Test requests to a closed port are counted as failed"""
+        requests = [replay.Request(0, '/a', 'GET', '/a', {})]
+
+        results, _ = asyncio.run(
+            replay.replay(requests, 'http://127.0.0.1:1', 1, 0))
+
+        self.assertEqual(results[0].status, None)
+
+    def test_summarize(self):
+        """Test the routes are reported with their latencies and errors"""
+        results = [
+            replay.Result('list', 200, 0.01),
+            replay.Result('list', 200, 0.03),
+            replay.Result('list', 404, 0.02),
+            replay.Result('detail', None, 0.5),
+            replay.Result('detail', 503, 0.1),
+        ]
+
+        summary = replay.summarize(results, 2.0)
+
+        self.assertEqual(list(summary), ['list', 'detail', None])
+        self.assertEqual(summary['list']['requests'], 3)
+        self.assertEqual(summary['list']['throughput'], 1.5)
+        self.assertEqual(summary['list']['p50_ms'], 20)
+        self.assertEqual(summary['list']['p99_ms'], 30)
+        self.assertEqual(summary['list']['client_errors'], 1)
+        self.assertEqual(summary['detail']['server_errors'], 1)
+        self.assertEqual(summary['detail']['connection_errors'], 1)
+        self.assertEqual(summary[None]['requests'], 5)
+        self.assertEqual(summary[None]['error_rate'], 0.6)
+
+    def test_base_url(self):
+        """Test only http:// URLs without a path are replayed against"""
+        self.assertEqual(replay.parse_base_url('http://localhost:8000/'),
+                         ('localhost', 8000))
+        self.assertEqual(replay.parse_base_url('http://localhost'),
+                         ('localhost', 80))
+        for base_url in ('https://localhost', 'http://localhost/api/',
+                         'localhost:8000', 'http://localhost:port'):
+            with self.assertRaises(ValueError):
+                replay.parse_base_url(base_url)
+
+
+class ReplayLogCommandTest(ServerMixin, TestCase):
+    """Test the command replaying an access log"""
+
+    def setUp(self):
+        """Write an access log of a user and of a user missing here"""
+        super().setUp()
+        self.user = get_user_model().objects.create_user(
+            'replaydev@company.com',
+            'testpass'
+        )
+        entries = [
+            {'time': 1.0, 'method': 'GET', 'path': '/api/imovel/imoveis/',
+             'query': 'type=Casa', 'user': self.user.pk},
+            {'time': 2.0, 'method': 'GET', 'path': '/api/imovel/imoveis/1/',
+             'query': '', 'user': self.user.pk},
+            {'time': 3.0, 'method': 'POST', 'path': '/api/user/create/',
+             'query': '', 'user': None},
+            {'time': 4.0, 'method': 'GET', 'path': '/api/user/me/',
+             'query': '', 'user': self.user.pk + 1},
+        ]
+        directory = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, directory)
+        self.path = os.path.join(directory, 'access.log')
+        with open(self.path, 'w') as log:
+            log.writelines(json.dumps(entry) + '\n' for entry in entries)
+        self.addCleanup(os.remove, self.path)
+
+    def test_replay(self):
+        """Test the GET requests of known users are replayed by route"""
+        out = StringIO()
+
+        call_command('replay_log', self.path, base_url=self.base_url,
+                     speed=0, stdout=out)
+
+        token = Token.objects.get(user=self.user)
+        self.assertEqual(
+            sorted((path, auth) for path, auth, _ in self.server.seen),
+            [('/api/imovel/imoveis/1/', f'Token {token.key}'),
+             ('/api/imovel/imoveis/?type=Casa', f'Token {token.key}')])
+        output = out.getvalue()
+        self.assertIn('Skipped 1 requests', output)
+        self.assertIn('property:property-list', output)
+        self.assertIn('property:property-detail', output)
+
+    def test_as_user(self):
+        """Test every authenticated request can be sent as one user"""
+        call_command('replay_log', self.path, base_url=self.base_url,
+                     speed=0, as_user='replaydev@company.com',
+                     stdout=StringIO())
+
+        self.assertEqual(len(self.server.seen), 3)
+
+    def test_invalid_base_url(self):
+        """Test a base URL with a path is an error"""
+        with self.assertRaises(CommandError):
+            call_command('replay_log', self.path,
+                         base_url=f'{self.base_url}/api/', stdout=StringIO())
+
+        self.assertEqual(self.server.seen, [])
+
+    def test_nothing_to_replay(self):
+        """Test a log without replayable requests is an error"""
+        with self.assertRaises(CommandError):
+            call_command('replay_log', self.path, base_url=self.base_url,
+                         limit=0, stdout=StringIO())
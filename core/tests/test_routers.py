@@ -0,0 +1,156 @@
+import time
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import replicas
+from core.models import Property
+from core.routers import ReplicaRouter
+from property import cache
+
+PROPERTY_URL = reverse('property:property-list')
+
+
+@override_settings(REPLICA_DATABASES=['replica_1', 'replica_2'])
+class ReplicaRouterTest(SimpleTestCase):
+    """Test the database router"""
+
+    def setUp(self):
+        """Create a set up that run before the tests"""
+        self.router = ReplicaRouter()
+
+    def test_reads_primary_by_default(self):
+        """Test reads use the default database outside use_replicas"""
+        self.assertIsNone(self.router.db_for_read(Property))
+
+    def test_reads_replicas(self):
+        """Test reads use the replicas inside use_replicas"""
+        with replicas.use_replicas():
+            aliases = {self.router.db_for_read(Property) for _ in range(50)}
+            with replicas.use_replicas(False):
+                self.assertIsNone(self.router.db_for_read(Property))
+
+        self.assertEqual(aliases, {'replica_1', 'replica_2'})
+        self.assertIsNone(self.router.db_for_read(Property))
+
+    def test_writes_primary(self):
+        """Test objects read from a replica are written to the primary"""
+        propert = Property()
+        propert._state.db = 'replica_1'
+
+        with replicas.use_replicas():
+            self.assertIsNone(self.router.db_for_write(Property))
+            self.assertEqual(
+                self.router.db_for_write(Property, instance=propert),
+                DEFAULT_DB_ALIAS)
+
+    @override_settings(REPLICA_DATABASES=[])
+    def test_no_replicas(self):
+        """Test reads use the default database without replicas"""
+        with replicas.use_replicas():
+            self.assertIsNone(self.router.db_for_read(Property))
+
+
+@skipUnless('replica' in settings.DATABASES,
+            'needs the replica database of app.settings.test')
+@override_settings(REPLICA_DATABASES=['replica'])
+class ReplicaRoutingApiTest(TestCase):
+    """Test the API reads from the replica database"""
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        """Create the same user with other properties in each database"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'replicadev@company.com',
+            'testpass',
+            name='Primary'
+        )
+        self.user.save(using='replica')
+        self.client.force_authenticate(self.user)
+        replicas.get_cache().delete(
+            replicas.STICKY_KEY.format(user_id=self.user.pk))
+
+        Property.objects.create(user=self.user, name='Primary')
+        Property(user=self.user, name='Replica').save(using='replica')
+
+    def _names(self):
+        """Return the names of the listed properties"""
+        res = self.client.get(PROPERTY_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [item['name'] for item in res.data['results']]
+
+    def test_list_reads_replica(self):
+        """Test safe requests read from the replica"""
+        self.assertEqual(self._names(), ['Replica'])
+
+    def test_reads_own_writes(self):
+        """Test a user reads from the primary after writing"""
+        res = self.client.post(PROPERTY_URL, {
+            'name': 'Nova', 'address': 'Rua 1', 'description': 'etc',
+            'type': 'Home', 'finality': 'residential',
+        })
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(self._names(), ['Nova', 'Primary'])
+        self.assertFalse(
+            Property.objects.using('replica').filter(name='Nova').exists())
+
+    @patch('property.cache.get_response', return_value=None)
+    def test_stickiness_expires(self, get_response):
+        """Test the user reads from the replica once stickiness expires"""
+        replicas.stick(self.user.pk)
+        self.assertEqual(self._names(), ['Primary'])
+
+        replicas.get_cache().delete(
+            replicas.STICKY_KEY.format(user_id=self.user.pk))
+        self.assertEqual(self._names(), ['Replica'])
+
+    def test_failed_write_not_sticky(self):
+        """Test a rejected write keeps the user on the replica"""
+        res = self.client.post(PROPERTY_URL, {'name': ''})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertEqual(self._names(), ['Replica'])
+
+    def test_orm_outside_views_reads_primary(self):
+        """Test queries outside the views use the default database"""
+        self.client.get(PROPERTY_URL)
+
+        self.assertEqual(
+            list(Property.objects.values_list('name', flat=True)),
+            ['Primary'])
+
+    def test_lagging_reads_not_cached(self):
+        """Test replica reads right after a write are not cached or tagged"""
+        res = self.client.get(PROPERTY_URL)
+        self.assertNotIn('ETag', res)
+        self.assertNotIn('Last-Modified', res)
+
+        # The replica catches up, without any write bumping the version
+        Property.objects.using('replica').update(name='Caught up')
+
+        self.assertEqual(self._names(), ['Caught up'])
+
+    def test_reads_cached_after_lag(self):
+        """Test replica reads are cached once past the replica lag"""
+        cache.get_cache().set(
+            cache.MODIFIED_KEY.format(user_id=self.user.pk),
+            int(time.time()) - settings.REPLICA_MAX_LAG_SECONDS,
+            timeout=None)
+
+        res = self.client.get(PROPERTY_URL)
+        self.assertIn('ETag', res)
+        Property.objects.using('replica').update(name='Caught up')
+
+        res = self.client.get(PROPERTY_URL)
+        self.assertEqual(
+            [item['name'] for item in res.json()['results']], ['Replica'])
@@ -0,0 +1,39 @@
+import asyncio
+
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.staticfiles import WhiteNoiseMiddleware
+
+
+@override_settings(WHITENOISE_AUTOREFRESH=True)
+class WhiteNoiseMiddlewareTest(SimpleTestCase):
+    """Test serving the static files in the async middleware chain"""
+
+    def setUp(self):
+        """Create a set up that run before the tests"""
+        async def get_response(request):
+            return HttpResponse(status=204)
+
+        self.middleware = WhiteNoiseMiddleware(get_response)
+        self.factory = RequestFactory()
+
+    def test_async_chain(self):
+        """Test the middleware is a coroutine function under ASGI"""
+        self.assertTrue(asyncio.iscoroutinefunction(self.middleware))
+
+    def test_static_file(self):
+        """Test a static file is served by the middleware"""
+        response = async_to_sync(self.middleware)(
+            self.factory.get('/static/admin/css/base.css'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/css; charset="utf-8"')
+
+    def test_other_paths(self):
+        """Test the other requests go on down the chain"""
+        response = async_to_sync(self.middleware)(
+            self.factory.get('/api/imovel/imoveis/'))
+
+        self.assertEqual(response.status_code, 204)
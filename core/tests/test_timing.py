@@ -0,0 +1,119 @@
+import asyncio
+from time import perf_counter
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import timing
+from core.models import Property
+
+PROPERTY_URL = reverse('property:property-list')
+
+
+def parse_header(value):
+    """Return the metrics of a Server-Timing header by name"""
+    metrics = {}
+    for metric in value.split(', '):
+        name, *params = metric.split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+    return metrics
+
+
+@override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+class ServerTimingTest(TestCase):
+    """Test the timings of the sampled requests"""
+
+    def setUp(self):
+        """Create a set up that run before the tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'timingdev@company.com',
+            'testpass'
+        )
+        self.client.force_authenticate(self.user)
+        Property.objects.create(user=self.user, name='Casa')
+
+    def test_server_timing_header(self):
+        """Test the header reports every part of a view request"""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(PROPERTY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        metrics = parse_header(res['Server-Timing'])
+        self.assertEqual(list(metrics),
+                         ['db', 'auth', 'serialize', 'render', 'total'])
+        self.assertEqual(metrics['db']['desc'], f'"{len(queries)} queries"')
+        durations = {name: float(metric['dur'])
+                     for name, metric in metrics.items()}
+        self.assertTrue(all(value >= 0 for value in durations.values()))
+        self.assertLessEqual(
+            durations['db'] + durations['serialize'] + durations['render'],
+            durations['total'] + 0.5)
+
+    def test_log_line(self):
+        """Test sampled requests are logged with their timings"""
+        with self.assertLogs('core.timing', 'INFO') as logs:
+            self.client.get(PROPERTY_URL)
+
+        record, = logs.records
+        message = record.getMessage()
+        self.assertTrue(message.startswith(
+            f'method=GET path={PROPERTY_URL} status=200 '))
+        self.assertIn('queries=', message)
+        self.assertEqual(
+            set(record.timings),
+            {'db_ms', 'auth_ms', 'serialize_ms', 'render_ms', 'total_ms',
+             'queries'})
+
+    def test_async_chain(self):
+        """Test the middleware times requests of the async chain"""
+        async def get_response(request):
+            return HttpResponse()
+
+        middleware = timing.ServerTimingMiddleware(get_response)
+        with self.assertLogs('core.timing', 'INFO'):
+            res = async_to_sync(middleware)(RequestFactory().get('/'))
+
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        self.assertIn('total', parse_header(res['Server-Timing']))
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0)
+    def test_not_sampled(self):
+        """Test requests out of the sample are not timed"""
+        res = self.client.get(PROPERTY_URL)
+
+        self.assertNotIn('Server-Timing', res)
+
+    def test_measure_outside_request(self):
+        """Test measuring outside a sampled request does nothing"""
+        with timing.measure('render'):
+            Property.objects.count()
+
+        self.assertIsNone(timing._timings.get())
+
+    def test_parts_exclude_sql(self):
+        """Test the SQL run in a measured block only counts as db"""
+        timings = timing.Timings()
+        token = timing._timings.set(timings)
+        start = perf_counter()
+        try:
+            with timing.measure('serialize'):
+                Property.objects.count()
+                Property.objects.count()
+        finally:
+            timing._timings.reset(token)
+        elapsed = perf_counter() - start
+
+        self.assertEqual(timings.queries, 2)
+        self.assertGreater(timings.seconds['db'], 0)
+        # Counted twice the SQL would add up to more than the block
+        self.assertLessEqual(
+            timings.seconds['serialize'] + timings.seconds['db'], elapsed)
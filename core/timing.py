@@ -0,0 +1,173 @@
+"""Timings of a sample of the requests
+
+`ServerTimingMiddleware` times SERVER_TIMING_SAMPLE_RATE of the
+requests and reports where their time went in a `Server-Timing`
+header and a log line of the `core.timing` logger:
+
+- db: the SQL queries, run through the execute wrapper every database
+  connection gets when it opens
+- auth: the authentication of the views using `TimingMixin`
+- serialize: the handler of those views, mostly serialization
+- render: the JSON rendering
+- total: the whole request, middleware included
+
+The parts do not count the SQL they run, it is all in db. Requests
+left out of the sample only pay for a random number and, per query, a
+context variable lookup.
+"""
+import contextlib
+import contextvars
+import logging
+import random
+from collections import defaultdict
+from time import perf_counter
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from core.middleware import HybridMiddleware
+
+logger = logging.getLogger(__name__)
+
+# Server-Timing metrics, in the order of the header
+METRICS = ('db', 'auth', 'serialize', 'render', 'total')
+
+_timings = contextvars.ContextVar('timings', default=None)
+
+
+class Timings:
+    """Seconds spent in each part of a request and its query count"""
+
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.queries = 0
+
+    def add(self, name, start, sql_start):
+        """Add the time since start, minus the SQL run meanwhile"""
+        self.seconds[name] += perf_counter() - start \
+            - (self.seconds['db'] - sql_start)
+
+    def header(self):
+        """Return the value of the Server-Timing header"""
+        metrics = []
+        for name in METRICS:
+            if name not in self.seconds:
+                continue
+            metric = f'{name};dur={self.seconds[name] * 1000:.1f}'
+            if name == 'db':
+                metric += f';desc="{self.queries} queries"'
+            metrics.append(metric)
+        return ', '.join(metrics)
+
+    def as_dict(self):
+        """Return the milliseconds of each part and the query count"""
+        data = {
+            f'{name}_ms': round(self.seconds[name] * 1000, 1)
+            for name in METRICS if name in self.seconds
+        }
+        data['queries'] = self.queries
+        return data
+
+
+@contextlib.contextmanager
+def measure(name):
+    """Add the time spent in the block to a part of a sampled request"""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+
+    start, sql_start = perf_counter(), timings.seconds['db']
+    try:
+        yield
+    finally:
+        timings.add(name, start, sql_start)
+
+
+def record_sql(execute, sql, params, many, context):
+    """Execute wrapper timing the queries of sampled requests"""
+    timings = _timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.seconds['db'] += perf_counter() - start
+        timings.queries += 1
+
+
+@receiver(connection_created)
+def install_sql_wrapper(sender, connection, **kwargs):
+    """Time the queries of every new database connection"""
+    if record_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_sql)
+
+
+class ServerTimingMiddleware(HybridMiddleware):
+    """Time a sample of the requests, see the module docstring"""
+
+    def call(self, request):
+        if random.random() >= settings.SERVER_TIMING_SAMPLE_RATE:
+            return self.get_response(request)
+
+        timings, token, start = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _timings.reset(token)
+        return self._report(request, response, timings, start)
+
+    async def acall(self, request):
+        if random.random() >= settings.SERVER_TIMING_SAMPLE_RATE:
+            return await self.get_response(request)
+
+        timings, token, start = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _timings.reset(token)
+        return self._report(request, response, timings, start)
+
+    def _start(self):
+        timings = Timings()
+        return timings, _timings.set(timings), perf_counter()
+
+    def _report(self, request, response, timings, start):
+        timings.seconds['total'] = perf_counter() - start
+
+        response['Server-Timing'] = timings.header()
+        data = timings.as_dict()
+        logger.info(
+            'method=%s path=%s status=%s %s',
+            request.method, request.path, response.status_code,
+            ' '.join(f'{key}={value}' for key, value in data.items()),
+            extra={'timings': data},
+        )
+        return response
+
+
+class TimingMixin:
+    """Time the authentication and the handler of a sampled request"""
+    _handler_start = None
+
+    def perform_authentication(self, request):
+        with measure('auth'):
+            super().perform_authentication(request)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        timings = _timings.get()
+        if timings is not None:
+            self._handler_start = (perf_counter(), timings.seconds['db'])
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        timings = _timings.get()
+        if timings is not None and self._handler_start is not None:
+            timings.add('serialize', *self._handler_start)
+            self._handler_start = None
+
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,13 @@
+from django.urls import path, include
+from rest_framework.routers import SimpleRouter
+
+from core import views
+
+router = SimpleRouter()
+router.register('', views.JobViewSet)
+
+app_name = 'jobs'
+
+urlpatterns = [
+    path('', include(router.urls))
+]
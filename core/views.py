@@ -0,0 +1,39 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from core import jobs
+from core.models import Job
+from core.serializers import JobSerializer
+from user.authentication import CachedTokenAuthentication
+
+
+class JobViewSet(viewsets.GenericViewSet,
+                 mixins.ListModelMixin,
+                 mixins.RetrieveModelMixin):
+    """Follow the background jobs of the authenticated user"""
+
+    authentication_classes = (CachedTokenAuthentication,)
+    permission_classes = (IsAuthenticated,)
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+
+    def get_queryset(self):
+        """Return the jobs of the authenticated user only"""
+        return self.queryset.filter(user=self.request.user)
+
+    @action(detail=True, methods=['post'])
+    def retry(self, request, pk=None):
+        """Queue a failed or stale job again for another round of attempts"""
+        job = self.get_object()
+        if job.status != Job.FAILED and not jobs.is_stale(job):
+            return Response(
+                {'detail': _('Only failed or stale jobs can be retried.')},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        jobs.retry(job)
+        return Response(
+            self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
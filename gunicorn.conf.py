@@ -0,0 +1,21 @@
+"""Gunicorn settings, read from the working directory
+
+Every worker writes its Prometheus metrics to PROMETHEUS_MULTIPROC_DIR,
+see core.metrics. The directory is emptied when gunicorn starts and the
+files of the live gauges of a worker are dropped when it exits.
+"""
+import os
+import shutil
+import tempfile
+
+os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR',
+    os.path.join(tempfile.gettempdir(), 'prometheus-metrics'))
+shutil.rmtree(os.environ['PROMETHEUS_MULTIPROC_DIR'], ignore_errors=True)
+os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'])
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
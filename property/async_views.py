@@ -0,0 +1,78 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.template.response import SimpleTemplateResponse
+from rest_framework.routers import DefaultRouter
+
+_executor = None
+
+
+def _get_executor():
+    """Return the threads running the sync views of the async views"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PROPERTY_ASYNC_CONCURRENCY,
+            thread_name_prefix='views',
+        )
+    return _executor
+
+
+def _run_view(view, request, *args, **kwargs):
+    """Run a sync view and render its response
+
+    The threads keep their database connections between requests; as
+    Django does for the request thread, they are only closed once
+    unusable or older than CONN_MAX_AGE.
+    """
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if isinstance(response, SimpleTemplateResponse):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def as_async_view(view):
+    """Return an async view running a sync view on a pool of threads
+
+    Django 3.2 runs the sync views of an ASGI worker one at a time on a
+    single shared thread. The async view runs them on a pool of
+    PROPERTY_ASYNC_CONCURRENCY threads instead, so the ORM queries of
+    concurrent requests overlap. The middleware must all be able to run
+    async, or Django runs the whole chain on the shared thread anyway.
+    """
+    @functools.wraps(view)
+    async def async_view(request, *args, **kwargs):
+        # Keep the context variables of the request, e.g. core.timing
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            _get_executor(), functools.partial(
+                context.run, _run_view, view, request, *args, **kwargs))
+
+    return async_view
+
+
+class AsyncRouter(DefaultRouter):
+    """Router serving the list and detail routes with async views
+
+    Every method of those routes still runs the sync viewset, on the
+    thread of the request; the other routes are left sync.
+    """
+    async_routes = ('-list', '-detail')
+
+    def get_urls(self):
+        urls = super().get_urls()
+        if not settings.PROPERTY_ASYNC_VIEWS:
+            return urls
+
+        for url in urls:
+            if url.name and url.name.endswith(self.async_routes):
+                url.callback = as_async_view(url.callback)
+        return urls
@@ -0,0 +1,65 @@
+from django.utils.translation import gettext_lazy as _
+
+from core.models import Property
+from property import serializers
+
+
+def bulk_targets(user, items):
+    """Return the properties updated by a bulk payload and id errors
+
+    An id must be an integer, not a boolean, and appear in one item
+    only, as a property is updated once per payload.
+    """
+    ids = [
+        item.get('id') if isinstance(item, dict) else None
+        for item in items
+    ]
+    existing = Property.objects.filter(user=user).in_bulk(
+        [pk for pk in ids if _is_id(pk)])
+
+    targets, errors, seen = [], [], set()
+    for pk in ids:
+        target = existing.get(pk) if _is_id(pk) else None
+        targets.append(target)
+        if pk is None:
+            errors.append({})
+        elif not _is_id(pk):
+            errors.append({'id': [_('A valid integer is required.')]})
+        elif pk in seen:
+            errors.append({'id': [_('Property updated twice.')]})
+        elif target is None:
+            errors.append({'id': [_('Property not found.')]})
+        else:
+            errors.append({})
+            seen.add(pk)
+
+    return targets, errors
+
+
+def _is_id(value):
+    """Return if a value is an integer id, booleans being excluded"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def save_bulk(user, items, context=None):
+    """Create or update the properties of a bulk payload
+
+    Return the saved properties, or None and the errors of each item
+    when any item is invalid, in which case nothing is saved.
+    """
+    targets, errors = bulk_targets(user, items)
+    context = dict(context or {})
+    context['targets'] = targets
+    context['real_estates'] = serializers.preload_real_estates(items)
+    serializer = serializers.PropertySerializer(
+        data=items, many=True, context=context)
+
+    if not serializer.is_valid():
+        errors = [
+            dict(item_errors, **id_errors)
+            for item_errors, id_errors in zip(serializer.errors, errors)
+        ]
+    if any(errors):
+        return None, errors
+
+    return serializer.save(user=user), None
@@ -0,0 +1,165 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.db.models import Max
+
+from core import replicas
+from core.models import Property, RealEstate
+
+VERSION_KEY = 'property:version:{user_id}'
+MODIFIED_KEY = 'property:modified:{user_id}'
+RESPONSE_KEY = 'property:response:{user_id}:{version}:{digest}'
+HITS_KEY = 'property:cache:hits'
+MISSES_KEY = 'property:cache:misses'
+
+# Last modification stored for the users without any data yet, until
+# their first write replaces it
+NO_DATA = 0
+
+
+def get_cache():
+    """Return the cache backing the property responses"""
+    return caches[settings.PROPERTY_CACHE_ALIAS]
+
+
+def get_version(user_id):
+    """Return the current data version for a user"""
+    cache = get_cache()
+    key = VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock so versions are never reused when the
+        # counter is evicted
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key, 0)
+
+    return version
+
+
+def bump_version(user_id):
+    """Invalidate every cached response of a user"""
+    cache = get_cache()
+    key = VERSION_KEY.format(user_id=user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+    # Last-Modified has a 1 second resolution: a write within the second
+    # of the previous one must still move it forward
+    previous = get_last_modified(user_id) or 0
+    cache.set(MODIFIED_KEY.format(user_id=user_id),
+              max(previous + 1, int(time.time())), timeout=None)
+
+
+def get_last_modified(user_id):
+    """Return the timestamp of the last change to the user data"""
+    cache = get_cache()
+    key = MODIFIED_KEY.format(user_id=user_id)
+    last_modified = cache.get(key)
+    if last_modified is None:
+        with replicas.use_replicas(False):
+            timestamps = [
+                model.objects.filter(user_id=user_id)
+                .aggregate(last=Max('updated_at'))['last']
+                for model in (Property, RealEstate)
+            ]
+        timestamps = [value for value in timestamps if value is not None]
+        last_modified = NO_DATA
+        if timestamps:
+            last_modified = int(max(timestamps).timestamp())
+        cache.add(key, last_modified, timeout=None)
+
+    if last_modified == NO_DATA:
+        return None
+    return last_modified
+
+
+def may_be_stale(user_id):
+    """Return if the reads may still miss the last write of a user
+
+    The replicas can lag behind the primary for REPLICA_MAX_LAG_SECONDS,
+    a response read from them in that time must not be stored or tagged
+    under the version of the write.
+    """
+    if not replicas.replicas_enabled():
+        return False
+    last_modified = get_last_modified(user_id)
+    return last_modified is not None \
+        and time.time() - last_modified < settings.REPLICA_MAX_LAG_SECONDS
+
+
+def invalidate(user_id):
+    """Bump the user version now and again once the transaction commits"""
+    bump_version(user_id)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: bump_version(user_id))
+
+
+def response_key(request, view):
+    """Return the cache key of a request served by a viewset"""
+    params = []
+    for name in sorted(request.query_params):
+        values = request.query_params.getlist(name)
+        if name in view.cache_normalized_params:
+            values = sorted({
+                value.strip()
+                for item in values for value in item.split(',')
+                if value.strip()
+            })
+        params.append((name, values))
+
+    digest = hashlib.sha1(repr((
+        view.basename,
+        view.action,
+        view.kwargs.get(view.lookup_url_kwarg or view.lookup_field),
+        request.accepted_renderer.format,
+        params,
+    )).encode('utf-8')).hexdigest()
+
+    user_id = request.user.pk
+    return RESPONSE_KEY.format(
+        user_id=user_id, version=get_version(user_id), digest=digest)
+
+
+def get_etag(key):
+    """Return the strong ETag of the response stored under a key"""
+    return '"%s"' % hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def get_response(key):
+    """Return the cached content and content type of a response"""
+    cached = get_cache().get(key)
+    _count(MISSES_KEY if cached is None else HITS_KEY)
+    return cached
+
+
+def set_response(key, response):
+    """Store the rendered content of a response"""
+    get_cache().set(
+        key,
+        (response.content, response['Content-Type']),
+        settings.PROPERTY_CACHE_TIMEOUT
+    )
+
+
+def get_stats():
+    """Return the response cache hit and miss counters"""
+    values = get_cache().get_many([HITS_KEY, MISSES_KEY])
+    return {
+        'hits': values.get(HITS_KEY, 0),
+        'misses': values.get(MISSES_KEY, 0),
+    }
+
+
+def _count(key):
+    """Increment a counter stored in the cache"""
+    cache = get_cache()
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
@@ -0,0 +1,108 @@
+import csv
+import json
+from collections import defaultdict
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+
+from core.models import Property
+
+EXPORT_FIELDS = ('id', 'name', 'address', 'description', 'features',
+                 'status', 'type', 'finality')
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Render newline delimited JSON"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return (json.dumps(data, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+class CSVRenderer(BaseRenderer):
+    """Render comma separated values"""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        buffer = _Echo()
+        writer = csv.writer(buffer)
+        return ''.join(
+            writer.writerow([key, value]) for key, value in data.items()
+        ).encode('utf-8')
+
+
+class _Echo:
+    """File-like object returning what is written, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def iter_properties(queryset, chunk_size):
+    """Yield property rows with their real estate ids
+
+    Rows are read through a server-side cursor and the real estates of
+    each chunk are fetched with one query, so memory stays flat no
+    matter how many properties are exported.
+    """
+    through = Property.real_estates.through
+    rows = queryset.order_by('id').values_list(*EXPORT_FIELDS) \
+        .iterator(chunk_size=chunk_size)
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+
+        real_estates = defaultdict(list)
+        links = through.objects \
+            .filter(property_id__in=[row[0] for row in chunk]) \
+            .order_by('id') \
+            .values_list('property_id', 'realestate_id')
+        for property_id, real_estate_id in links:
+            real_estates[property_id].append(real_estate_id)
+
+        for row in chunk:
+            yield row, real_estates[row[0]]
+
+
+def iter_ndjson(rows):
+    """Yield a JSON document per property"""
+    for row, real_estates in rows:
+        item = dict(zip(EXPORT_FIELDS, row), real_estates=real_estates)
+        yield json.dumps(item, ensure_ascii=False) + '\n'
+
+
+def iter_csv(rows):
+    """Yield a CSV header followed by a line per property"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS + ('real_estates',))
+    for row, real_estates in rows:
+        yield writer.writerow(
+            row + (' '.join(str(pk) for pk in real_estates),))
+
+
+def export_response(queryset, export_format, chunk_size):
+    """Return a streaming response exporting the properties"""
+    rows = iter_properties(queryset, chunk_size)
+    if export_format == CSVRenderer.format:
+        content = iter_csv(rows)
+        content_type = CSVRenderer.media_type
+    else:
+        content = iter_ndjson(rows)
+        content_type = NDJSONRenderer.media_type
+
+    response = StreamingHttpResponse(
+        content, content_type=f'{content_type}; charset=utf-8')
+    response['Content-Disposition'] = \
+        f'attachment; filename="imoveis.{export_format}"'
+    return response
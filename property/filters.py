@@ -0,0 +1,223 @@
+from django.db.models import Exists, OuterRef, Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from core.models import Property
+from property.search import search_properties
+
+
+class Filter:
+    """Compile a query param into a lookup on a model field"""
+    lookup = 'exact'
+    message = _('Invalid value.')
+
+    def __init__(self, field, lookup=None):
+        self.field = field
+        if lookup is not None:
+            self.lookup = lookup
+
+    def parse(self, value):
+        """Return the Python value of the param or raise ValueError"""
+        return value
+
+    def to_q(self, value, query_params):
+        """Return the condition selecting the rows matching the value"""
+        return Q(**{f'{self.field}__{self.lookup}': self.parse(value)})
+
+
+class InFilter(Filter):
+    """Match one of a comma separated list of values"""
+    message = _('Expected a comma separated list of values.')
+
+    def parse(self, value):
+        values = [item.strip() for item in value.split(',') if item.strip()]
+        if not values:
+            raise ValueError
+        return values
+
+    def to_q(self, value, query_params):
+        values = self.parse(value)
+        if len(values) == 1:
+            return Q(**{self.field: values[0]})
+        return Q(**{f'{self.field}__in': values})
+
+
+class IdListFilter(InFilter):
+    """Match one of a comma separated list of ids"""
+    message = _('Expected a comma separated list of ids.')
+
+    def parse(self, value):
+        return [int(item) for item in super().parse(value)]
+
+
+class BooleanFilter(Filter):
+    """Match a boolean given as 1/0 or true/false"""
+    message = _('Expected one of 1, 0, true or false.')
+    values = {'1': True, 'true': True, '0': False, 'false': False}
+
+    def parse(self, value):
+        return self.values[value.strip().lower()]
+
+
+class NumberFilter(Filter):
+    """Compare with an integer, e.g. the bound of an id range"""
+    message = _('Expected an integer.')
+
+    def parse(self, value):
+        return int(value)
+
+
+class ChoiceFilter(Filter):
+    """Validate an option read by another filter"""
+
+    def __init__(self, choices):
+        super().__init__(field=None)
+        self.choices = choices
+        self.message = _('Expected one of {choices}.').format(
+            choices=', '.join(choices))
+
+    def to_q(self, value, query_params):
+        if value not in self.choices:
+            raise ValueError
+        return Q()
+
+
+class RealEstatesFilter(IdListFilter):
+    """Match the properties assigned to any, or all, of the real estates
+
+    Each condition is an EXISTS over the through table, so a property
+    assigned to several of the real estates is listed once, without a
+    DISTINCT over the joined rows.
+    """
+
+    def __init__(self, match_param):
+        super().__init__(field=None)
+        self.match_param = match_param
+
+    def to_q(self, value, query_params):
+        ids = sorted(set(self.parse(value)))
+        links = Property.real_estates.through.objects \
+            .filter(property_id=OuterRef('pk'))
+
+        if query_params.get(self.match_param) == 'all':
+            condition = Q()
+            for pk in ids:
+                condition &= Q(Exists(links.filter(realestate_id=pk)))
+            return condition
+
+        return Q(Exists(links.filter(realestate_id__in=ids)))
+
+
+class AssignedFilter(BooleanFilter):
+    """Match the real estates assigned to at least one property"""
+
+    def __init__(self):
+        super().__init__(field=None)
+
+    def to_q(self, value, query_params):
+        if not self.parse(value):
+            return Q()
+
+        return Q(Exists(Property.real_estates.through.objects
+                        .filter(realestate_id=OuterRef('pk'))))
+
+
+class ContainsFilter(Filter):
+    """Match the values containing a text, ignoring case"""
+    lookup = 'icontains'
+    message = _('Expected a non empty text.')
+
+    def parse(self, value):
+        if not value.strip():
+            raise ValueError
+        return value.strip()
+
+
+class FilterSet:
+    """Declarative set of filters compiled into a single condition
+
+    Filters are declared as class attributes named after the query
+    param they read, e.g. `type = InFilter('type')`.
+    """
+
+    def __init__(self, query_params):
+        self.query_params = query_params
+
+    @classmethod
+    def get_filters(cls):
+        """Return the declared filters by query param"""
+        return {
+            name: value
+            for klass in reversed(cls.__mro__)
+            for name, value in vars(klass).items()
+            if isinstance(value, Filter)
+        }
+
+    def compile(self):
+        """Return the condition matching every given param
+
+        Raises a ValidationError, answered with a 400, listing every
+        invalid param.
+        """
+        condition = Q()
+        errors = {}
+        for name, param_filter in self.get_filters().items():
+            value = self.query_params.get(name)
+            if value is None:
+                continue
+            try:
+                condition &= param_filter.to_q(value, self.query_params)
+            except (KeyError, ValueError):
+                errors[name] = [param_filter.message]
+
+        if errors:
+            raise ValidationError(errors)
+
+        return condition
+
+
+class PropertyFilterSet(FilterSet):
+    """Filters accepted by the property endpoints"""
+    type = InFilter('type')
+    finality = InFilter('finality')
+    status = BooleanFilter('status')
+    features = ContainsFilter('features')
+    id_min = NumberFilter('id', 'gte')
+    id_max = NumberFilter('id', 'lte')
+    real_estates = RealEstatesFilter(match_param='real_estates_match')
+    real_estates_match = ChoiceFilter(choices=('any', 'all'))
+
+
+class RealEstateFilterSet(FilterSet):
+    """Filters accepted by the real estate endpoints"""
+    assigned_only = AssignedFilter()
+
+
+class FilterSetBackend(BaseFilterBackend):
+    """Filter a queryset with the `filterset_class` of the view"""
+
+    def filter_queryset(self, request, queryset, view):
+        filterset_class = getattr(view, 'filterset_class', None)
+        if filterset_class is None:
+            return queryset
+
+        return queryset.filter(filterset_class(request.query_params).compile())
+
+
+class RankedSearchFilter(BaseFilterBackend):
+    """Full-text search on the `search` param, best matches first
+
+    The ranked ordering is handed to the keyset pagination through the
+    `pagination_ordering` attribute of the view.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '').strip()
+        if not term:
+            return queryset
+
+        queryset, view.pagination_ordering = \
+            search_properties(queryset, term)
+        return queryset
@@ -0,0 +1,21 @@
+from prometheus_client.core import CounterMetricFamily
+
+from property import cache
+
+
+class ResponseCacheCollector:
+    """Hits and misses of the property response cache
+
+    The counters live in the shared cache, so they cover every worker.
+    """
+
+    def collect(self):
+        stats = cache.get_stats()
+        lookups = CounterMetricFamily(
+            'property_response_cache_lookups',
+            'Lookups of the property response cache by result',
+            labels=['result'],
+        )
+        lookups.add_metric(['hit'], stats['hits'])
+        lookups.add_metric(['miss'], stats['misses'])
+        yield lookups
@@ -0,0 +1,122 @@
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from property import cache
+from property.readers import ValuesReader
+
+
+class ResponseKeyMixin:
+    """Compute the cache key of the current request once"""
+    cache_normalized_params = ()
+
+    def get_response_key(self, request):
+        """Return the key identifying the response to a request"""
+        if getattr(self, '_response_key', None) is None:
+            self._response_key = cache.response_key(request, self)
+        return self._response_key
+
+
+class ConditionalGetMixin(ResponseKeyMixin):
+    """Answer conditional list and retrieve requests with a 304
+
+    The ETag is derived from the per-user data version, so a matching
+    If-None-Match is answered before the queryset is evaluated. Bodies
+    read from a replica that may lag behind get no ETag.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional_response(
+            super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional_response(
+            super().retrieve, request, *args, **kwargs)
+
+    def _conditional_response(self, handler, request, *args, **kwargs):
+        """Return a 304 when the client copy is current"""
+        etag = cache.get_etag(self.get_response_key(request))
+        last_modified = cache.get_last_modified(request.user.pk)
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+
+        if response.status_code == 200 \
+                and cache.may_be_stale(request.user.pk):
+            # A lagging replica may have read data older than the ETag
+            return response
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+
+        return response
+
+
+class CachedResponseMixin(ResponseKeyMixin):
+    """Serve the list and retrieve actions from a per-user cache
+
+    The rendered JSON is stored under a key made of the user, its data
+    version, the action and the normalized query params. Writing any
+    object of the user bumps the version, see `property.signals`. The
+    bodies read from a replica that may lag behind are not stored.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(
+            super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_response(
+            super().retrieve, request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs)
+
+        key = getattr(self, '_cache_response_key', None)
+        if key and isinstance(response, Response) \
+                and response.status_code == 200:
+            response.render()
+            cache.set_response(key, response)
+
+        return response
+
+    def _cached_response(self, handler, request, *args, **kwargs):
+        """Return the cached response or call the handler and cache it"""
+        if request.accepted_renderer.format != 'json':
+            return handler(request, *args, **kwargs)
+
+        key = self.get_response_key(request)
+        cached = cache.get_response(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        if not cache.may_be_stale(request.user.pk):
+            self._cache_response_key = key
+        return handler(request, *args, **kwargs)
+
+
+class ValuesListMixin:
+    """Build the list pages from values() rows when the serializer allows
+
+    See `property.readers.ValuesReader`, the other serializers and
+    unpaginated lists use the regular list.
+    """
+
+    def list(self, request, *args, **kwargs):
+        reader = ValuesReader.for_serializer(
+            self.get_serializer(), self.queryset.model)
+        if reader is None or self.paginator is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = self.paginator.get_ordering(self)
+        rows = self.paginate_queryset(reader.values(
+            queryset, [field.lstrip('-') for field in ordering]))
+
+        return self.get_paginated_response(reader.represent(rows))
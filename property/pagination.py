@@ -0,0 +1,201 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# Range of the 64 bit integers the databases bind
+MIN_INTEGER, MAX_INTEGER = -2 ** 63, 2 ** 63 - 1
+
+
+class KeysetPagination(BasePagination):
+    """Paginate a queryset by seeking past the last row already seen
+
+    The opaque cursor holds the ordering values of the row at the page
+    boundary, so every page is a range scan over the (ordering, id)
+    index instead of an OFFSET over all the previous rows. The last
+    ordering field must be unique to keep the ordering stable.
+    """
+    ordering = ('-id',)
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = _('Invalid cursor')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return a single page of results"""
+        self.request = request
+        self.ordering = self.get_ordering(view)
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.reverse, self.position = self.decode_cursor(request, queryset)
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = [_invert(field) for field in ordering]
+
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            queryset = queryset.filter(self._seek(ordering, self.position))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if self.reverse:
+            results.reverse()
+            self.has_next = self.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        """Wrap the page data with the next and previous links"""
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data)
+        ]))
+
+    def get_ordering(self, view):
+        """Return the ordering requested by the view or the default one"""
+        return getattr(view, 'pagination_ordering', None) or self.ordering
+
+    def get_page_size(self, request):
+        """Return the requested page size capped by the maximum"""
+        page_size = api_settings.PAGE_SIZE
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+            if requested > 0:
+                page_size = requested
+        except (KeyError, ValueError):
+            pass
+
+        return min(page_size, settings.API_MAX_PAGE_SIZE)
+
+    def get_next_link(self):
+        """Return the link to the page after the current one"""
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(
+                self.base_url, self.cursor_query_param)
+        return self.encode_cursor(False, self._position_of(self.page[-1]))
+
+    def get_previous_link(self):
+        """Return the link to the page before the current one"""
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(
+                self.base_url, self.cursor_query_param)
+        return self.encode_cursor(True, self._position_of(self.page[0]))
+
+    def decode_cursor(self, request, queryset):
+        """Return the direction and position stored in the cursor
+
+        The position values are converted by the fields or annotations
+        the queryset is ordered by, so a forged cursor is rejected
+        before reaching the query.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return False, None
+
+        try:
+            cursor = json.loads(
+                base64.urlsafe_b64decode(encoded.encode('ascii')))
+            reverse = bool(cursor['r'])
+            position = list(cursor['p'])
+        except (TypeError, ValueError, KeyError, UnicodeError,
+                binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        try:
+            position = [
+                _field(queryset, field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (ValidationError, TypeError, ValueError, ArithmeticError):
+            raise NotFound(self.invalid_cursor_message)
+        if not all(_in_range(value) for value in position):
+            raise NotFound(self.invalid_cursor_message)
+
+        return reverse, position
+
+    def encode_cursor(self, reverse, position):
+        """Return the current URL pointing at the given cursor"""
+        cursor = json.dumps({'r': int(reverse), 'p': position},
+                            separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(cursor.encode('utf-8'))
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded.decode('ascii'))
+
+    def _position_of(self, obj):
+        """Return the ordering values of a row, an object or a dict"""
+        if isinstance(obj, dict):
+            return [obj[field.lstrip('-')] for field in self.ordering]
+        return [getattr(obj, field.lstrip('-')) for field in self.ordering]
+
+    def _seek(self, ordering, position):
+        """Return the filter selecting the rows after a position"""
+        seek = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = {
+                prior.lstrip('-'): position[prior_index]
+                for prior_index, prior in enumerate(ordering[:index])
+            }
+            seek |= Q(**equal, **{f'{name}__{lookup}': position[index]})
+
+        # Bound the leading column too, so it is usable as an index range
+        first = ordering[0]
+        lookup = 'lte' if first.startswith('-') else 'gte'
+        bound = Q(**{f'{first.lstrip("-")}__{lookup}': position[0]})
+        return bound & seek
+
+
+def _field(queryset, name):
+    """Return the model field or the annotation output field of a name"""
+    annotation = queryset.query.annotations.get(name)
+    if annotation is not None:
+        return annotation.output_field
+    return queryset.model._meta.get_field(name)
+
+
+def _in_range(value):
+    """Return if a position value can be bound to a query parameter"""
+    if isinstance(value, int):
+        return MIN_INTEGER <= value <= MAX_INTEGER
+    return value is not None
+
+
+def _invert(field):
+    """Invert the direction of an ordering field"""
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+class PropertyPagination(KeysetPagination):
+    """Paginate properties from the most recently created"""
+    ordering = ('-id',)
+
+
+class RealEstatePagination(KeysetPagination):
+    """Paginate real estates by name in descending order"""
+    ordering = ('-name', '-id')
@@ -0,0 +1,64 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, RelatedField
+
+
+def _model_field(model, source):
+    """Return the model field behind a serializer source, if any"""
+    if not source or '.' in source or source == '*':
+        return None
+    try:
+        return model._meta.get_field(source)
+    except FieldDoesNotExist:
+        return None
+
+
+def optimize_queryset(queryset, serializer):
+    """Apply select_related/prefetch_related/only for a serializer
+
+    The serializer fields are inspected to decide which relations are
+    read, so rendering it over the returned queryset costs a constant
+    number of queries regardless of the number of rows.
+    """
+    model = queryset.model
+    only = {model._meta.pk.name}
+    select = []
+    prefetch = []
+
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        model_field = _model_field(model, field.source)
+        if model_field is None:
+            continue
+
+        if isinstance(field, ManyRelatedField):
+            related = model_field.related_model
+            prefetch.append(Prefetch(
+                field.source,
+                queryset=related._default_manager.only(
+                    related._meta.pk.name).order_by(related._meta.pk.name)
+            ))
+        elif isinstance(field, serializers.ListSerializer):
+            prefetch.append(Prefetch(
+                field.source,
+                queryset=optimize_queryset(
+                    model_field.related_model._default_manager.all(),
+                    field.child
+                )
+            ))
+        elif isinstance(field, RelatedField):
+            only.add(model_field.attname)
+        elif isinstance(field, serializers.BaseSerializer):
+            select.append(field.source)
+            only.add(field.source)
+        elif model_field.concrete and not model_field.many_to_many:
+            only.add(model_field.attname)
+
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+
+    return queryset.only(*only)
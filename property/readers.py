@@ -0,0 +1,138 @@
+from collections import defaultdict
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import connections
+from django.db.models import Q
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField
+
+from property.querysets import _model_field
+
+# Representations returning a database value as is
+PLAIN_REPRESENTATIONS = {
+    serializers.BooleanField.to_representation,
+    serializers.CharField.to_representation,
+    serializers.ChoiceField.to_representation,
+    serializers.IntegerField.to_representation,
+}
+
+
+class ValuesReader:
+    """Read the representation of a serializer from values() rows
+
+    Rendering model instances field by field dominates the latency of
+    big list pages. When every field of a serializer is a plain column
+    or a list of related primary keys, the rows are read with values()
+    and the related keys with one query for the whole page instead,
+    producing the same data as the serializer. PostgreSQL aggregates
+    the keys with ARRAY_AGG in the page query itself.
+    """
+
+    def __init__(self, model, fields):
+        self.model = model
+        # (name, attname or None, many to many model field or None)
+        self.fields = fields
+
+    @classmethod
+    def for_serializer(cls, serializer, model):
+        """Return a reader for a serializer, None when it can't be read"""
+        if type(serializer).to_representation \
+                is not serializers.Serializer.to_representation:
+            return None
+
+        fields = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            model_field = _model_field(model, field.source)
+            if model_field is None:
+                return None
+
+            if isinstance(field, ManyRelatedField):
+                child = field.child_relation
+                if type(child).to_representation \
+                        is not PrimaryKeyRelatedField.to_representation \
+                        or child.pk_field is not None \
+                        or not model_field.many_to_many \
+                        or not model_field.concrete:
+                    return None
+                fields.append((name, None, model_field))
+            elif type(field).to_representation in PLAIN_REPRESENTATIONS \
+                    and model_field.concrete and not model_field.is_relation:
+                fields.append((name, model_field.attname, None))
+            else:
+                return None
+
+        return cls(model, fields)
+
+    @property
+    def many(self):
+        """Return the many to many fields by name"""
+        return {
+            name: model_field for name, _, model_field in self.fields
+            if model_field is not None
+        }
+
+    def values(self, queryset, extra=()):
+        """Return the values() queryset read by the reader
+
+        `extra` names annotations to read along, like the ones the page
+        is ordered by.
+        """
+        names = [self.model._meta.pk.attname]
+        names.extend(attname for _, attname, _ in self.fields if attname)
+        names.extend(extra)
+        queryset = queryset.prefetch_related(None)
+
+        if connections[queryset.db].vendor == 'postgresql':
+            aggregates = {
+                f'_{name}': self._array_agg(model_field)
+                for name, model_field in self.many.items()
+            }
+            queryset = queryset.annotate(**aggregates)
+            names.extend(aggregates)
+
+        return queryset.values(*dict.fromkeys(names))
+
+    def represent(self, rows):
+        """Return the serializer representation of values() rows"""
+        pk = self.model._meta.pk.attname
+        related = {}
+        for name, model_field in self.many.items():
+            if rows and f'_{name}' in rows[0]:
+                related[name] = {row[pk]: row[f'_{name}'] for row in rows}
+            else:
+                related[name] = self._related_keys(
+                    model_field, [row[pk] for row in rows])
+
+        data = []
+        for row in rows:
+            item = {}
+            for name, attname, model_field in self.fields:
+                if model_field is None:
+                    item[name] = row[attname]
+                else:
+                    item[name] = related[name].get(row[pk], [])
+            data.append(item)
+        return data
+
+    def _array_agg(self, model_field):
+        """Return the sorted array of the related keys of a row"""
+        key = f'{model_field.name}__pk'
+        return ArrayAgg(key, distinct=True, ordering=key,
+                        filter=Q(**{f'{key}__isnull': False}))
+
+    def _related_keys(self, model_field, pks):
+        """Return the related keys of each row of a many to many field"""
+        through = model_field.remote_field.through
+        source = through._meta.get_field(model_field.m2m_field_name())
+        target = through._meta.get_field(
+            model_field.m2m_reverse_field_name())
+
+        keys = defaultdict(list)
+        links = through.objects.filter(**{f'{source.attname}__in': pks}) \
+            .order_by(source.attname, target.attname) \
+            .values_list(source.attname, target.attname)
+        for pk, related_pk in links:
+            keys[pk].append(related_pk)
+        return keys
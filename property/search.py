@@ -0,0 +1,54 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast
+
+# Text search configuration used by the trigger in core.0013_search
+SEARCH_CONFIG = 'portuguese'
+
+
+def search_properties(queryset, term):
+    """Return the properties matching a search term and their ordering
+
+    The queryset is annotated with `search_rank` and the ordering lists
+    the best matches first, ending with the unique id so it can be used
+    for keyset pagination. PostgreSQL uses the GIN indexed search
+    vector, SQLite the FTS5 table and other backends fall back to
+    icontains over name, address and description.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        query = SearchQuery(term, config=SEARCH_CONFIG)
+        rank = Cast(SearchRank(F('search_vector'), query), FloatField())
+        queryset = queryset.filter(search_vector=query) \
+            .annotate(search_rank=rank)
+        return queryset, ('-search_rank', '-id')
+
+    if vendor == 'sqlite':
+        match = fts_query(term)
+        if not match:
+            return queryset.none(), ('-id',)
+        # Join the FTS5 table, so the match is evaluated only once
+        queryset = queryset.extra(
+            tables=['core_property_fts'],
+            where=['core_property_fts.rowid = core_property.id',
+                   'core_property_fts MATCH %s'],
+            params=[match],
+        ).annotate(search_rank=RawSQL('core_property_fts.rank', ()))
+        # FTS5 ranks are negative, the best matches come first
+        return queryset, ('search_rank', '-id')
+
+    condition = Q(name__icontains=term) | Q(address__icontains=term) \
+        | Q(description__icontains=term)
+    queryset = queryset.filter(condition) \
+        .annotate(search_rank=Value(0.0, output_field=FloatField()))
+    return queryset, ('-id',)
+
+
+def fts_query(term):
+    """Return an FTS5 query matching every word of a search term"""
+    words = re.findall(r'\w+', term)
+    return ' '.join('"%s"' % word for word in words)
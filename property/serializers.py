@@ -1,8 +1,163 @@
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from core.models import RealEstate, Property
 
+from property import cache
 
-class RealEstateSerializer(serializers.ModelSerializer):
+
+def preload_real_estates(items):
+    """Return the real estates referenced by a list payload by id"""
+    ids = set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        values = item.get('real_estates')
+        if not isinstance(values, list):
+            continue
+        for value in values:
+            if isinstance(value, int) and not isinstance(value, bool):
+                ids.add(value)
+            elif isinstance(value, str) and value.isdigit():
+                ids.add(int(value))
+
+    return RealEstate.objects.in_bulk(ids)
+
+
+class RealEstateRelatedField(serializers.PrimaryKeyRelatedField):
+    """Real estate primary key field
+
+    When the serializer context holds the real estates preloaded by
+    `preload_real_estates`, they are looked up there instead of issuing
+    one query per id.
+    """
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get('real_estates')
+        if preloaded is None:
+            return super().to_internal_value(data)
+
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return preloaded[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+class PropertyListSerializer(serializers.ListSerializer):
+    """Create and update a list of properties in bulk"""
+
+    def create(self, validated_data):
+        """Save the properties and their real estates in one transaction
+
+        The `targets` context entry lists, for each item, the property
+        to update or None to create a new one.
+        """
+        targets = self.context.get('targets') \
+            or [None] * len(validated_data)
+        created, updated, links = [], [], []
+        update_fields = {'updated_at'}
+        now = timezone.now()
+
+        for target, attrs in zip(targets, validated_data):
+            # A real estate listed twice would be linked twice
+            real_estates = dict.fromkeys(attrs.pop('real_estates', []))
+            if target is None:
+                target = Property(**attrs)
+                created.append(target)
+            else:
+                for attr, value in attrs.items():
+                    setattr(target, attr, value)
+                target.updated_at = now
+                update_fields.update(attrs)
+                updated.append(target)
+            links.append((target, real_estates))
+
+        through = Property.real_estates.through
+        with transaction.atomic():
+            if connection.features.can_return_rows_from_bulk_insert:
+                Property.objects.bulk_create(created)
+            else:
+                for propert in created:
+                    propert.save()
+
+            if updated:
+                Property.objects.bulk_update(updated, sorted(update_fields))
+                through.objects.filter(property__in=updated).delete()
+
+            through.objects.bulk_create([
+                through(property_id=propert.pk, realestate_id=real_estate.pk)
+                for propert, real_estates in links
+                for real_estate in real_estates
+            ])
+
+        for user_id in {propert.user_id for propert, _ in links}:
+            cache.invalidate(user_id)
+
+        return [propert for propert, _ in links]
+
+
+class SparseFieldsMixin:
+    """Trim the fields to the `fields` or `exclude` query params
+
+    Only the top level serializer of a read request is trimmed, so the
+    queryset optimization reads, and prefetches, only those fields.
+    """
+    fields_query_param = 'fields'
+    exclude_query_param = 'exclude'
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return fields
+
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return fields
+
+        declared = set(fields)
+        errors = {}
+        for param in (self.fields_query_param, self.exclude_query_param):
+            names = _split_param(request, param)
+            unknown = sorted(names - declared)
+            if unknown:
+                errors[param] = [_('Unknown fields: {names}.').format(
+                    names=', '.join(unknown))]
+            elif names and param == self.fields_query_param:
+                fields = {
+                    name: field for name, field in fields.items()
+                    if name in names
+                }
+            elif names:
+                fields = {
+                    name: field for name, field in fields.items()
+                    if name not in names
+                }
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return fields
+
+
+def _split_param(request, param):
+    """Return the comma separated names of a query param"""
+    return {
+        name.strip()
+        for value in request.query_params.getlist(param)
+        for name in value.split(',')
+        if name.strip()
+    }
+
+
+class RealEstateSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for a real estate object"""
 
     class Meta:
@@ -11,9 +166,9 @@ class RealEstateSerializer(serializers.ModelSerializer):
         read_only_fields = ('id',)
 
 
-class PropertySerializer(serializers.ModelSerializer):
+class PropertySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer a property"""
-    real_estates = serializers.PrimaryKeyRelatedField(
+    real_estates = RealEstateRelatedField(
         many=True,
         queryset=RealEstate.objects.all()
     )
@@ -24,6 +179,7 @@ class PropertySerializer(serializers.ModelSerializer):
                   'features', 'status', 'type', 'finality',
                   'real_estates')
         read_only_fields = ('id',)
+        list_serializer_class = PropertyListSerializer
 
 
 class PropertyDetailSerializer(PropertySerializer):
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import Property, RealEstate
+from property import cache
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+@receiver(post_save, sender=RealEstate)
+@receiver(post_delete, sender=RealEstate)
+def invalidate_owner_cache(sender, instance, **kwargs):
+    """Invalidate the cached responses of the object owner"""
+    cache.invalidate(instance.user_id)
+
+
+@receiver(m2m_changed, sender=Property.real_estates.through)
+def invalidate_real_estates_cache(sender, instance, action, **kwargs):
+    """Invalidate the cached responses when real estates are assigned"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        cache.invalidate(instance.user_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_new_user_cache(sender, instance, created, **kwargs):
+    """Start a fresh data version for a new user"""
+    if created:
+        cache.invalidate(instance.pk)
@@ -0,0 +1,43 @@
+from collections import Counter
+
+from django.db.models import Count
+
+# Property fields counted by value
+GROUPED_FIELDS = ('type', 'finality', 'status')
+
+
+def property_stats(queryset):
+    """Return the counts of properties by field value and real estate
+
+    One query counts the properties of each combination of the grouped
+    fields, which are added up per field, and another one groups the
+    properties joined to their real estates.
+    """
+    counters = {field: Counter() for field in GROUPED_FIELDS}
+    total = 0
+    groups = queryset.order_by().values_list(*GROUPED_FIELDS) \
+        .annotate(count=Count('pk'))
+    for *values, count in groups:
+        total += count
+        for field, value in zip(GROUPED_FIELDS, values):
+            counters[field][value] += count
+
+    stats = {'count': total}
+    for field, counter in counters.items():
+        stats[field] = [
+            {'value': value, 'count': count}
+            for value, count in sorted(
+                counter.items(), key=lambda item: (-item[1], str(item[0])))
+        ]
+
+    real_estates = queryset.order_by() \
+        .values('real_estates', 'real_estates__name') \
+        .annotate(count=Count('pk')) \
+        .order_by('-count', 'real_estates__name', 'real_estates')
+    stats['real_estates'] = [
+        {'id': row['real_estates'], 'name': row['real_estates__name'],
+         'count': row['count']}
+        for row in real_estates if row['real_estates'] is not None
+    ]
+
+    return stats
@@ -0,0 +1,21 @@
+from django.contrib.auth import get_user_model
+
+from core import jobs, replicas
+from property.bulk import save_bulk
+
+
+@jobs.task
+def bulk_import(user_id, items):
+    """Create or update the properties of a bulk payload of a user
+
+    Invalid payloads fail the job with the errors of each item.
+    """
+    user = get_user_model().objects.get(pk=user_id)
+    properties, errors = save_bulk(user, items)
+    if errors:
+        raise jobs.JobFailed({'errors': errors})
+
+    # The user reads the primary database for a while, as after a write
+    # made by a request
+    replicas.stick(user_id)
+    return {'ids': [propert.id for propert in properties]}
@@ -0,0 +1,156 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import skipIf
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from django.test import TransactionTestCase, override_settings
+from django.utils.module_loading import import_string
+
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import Property
+from property import async_views
+from property.async_views import AsyncRouter, as_async_view
+from property.tests.test_property import sample_property
+from property.views import PropertyViewSet
+
+
+class AsyncViewTest(TransactionTestCase):
+    """Test the async views of the property API"""
+
+    def setUp(self):
+        """Create a set up that run before the tests"""
+        self.factory = APIRequestFactory()
+        self.user = get_user_model().objects.create_user(
+            'asyncdev@company.com',
+            'testpass'
+        )
+        self.view = as_async_view(
+            PropertyViewSet.as_view({'get': 'list', 'post': 'create'}))
+
+    def _call(self, request, **kwargs):
+        """Authenticate a request and run it through the async view"""
+        force_authenticate(request, self.user)
+        return async_to_sync(self.view)(request, **kwargs)
+
+    def test_view_is_async(self):
+        """Test the wrapped view is a coroutine function"""
+        self.assertTrue(asyncio.iscoroutinefunction(self.view))
+        self.assertTrue(self.view.csrf_exempt)
+
+    def test_list(self):
+        """Test listing properties through the async view"""
+        sample_property(user=self.user, name='Casa')
+
+        res = self._call(self.factory.get('/'))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.is_rendered)
+        self.assertEqual(res.data['results'][0]['name'], 'Casa')
+
+    def test_create(self):
+        """Test writes are served by the sync viewset"""
+        res = self._call(self.factory.post('/', {
+            'name': 'Casa',
+            'address': 'Rua Augusta',
+            'description': 'etc',
+            'features': 'tex',
+            'status': False,
+            'type': 'Home',
+            'finality': 'residential',
+        }))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(Property.objects.filter(user=self.user).exists())
+
+    def test_concurrent_requests(self):
+        """Test concurrent requests run their views at the same time"""
+        def slow_view(request):
+            time.sleep(0.2)
+            return HttpResponse()
+
+        view = as_async_view(slow_view)
+
+        async def requests():
+            return await asyncio.gather(
+                *[view(self.factory.get('/')) for _ in range(4)])
+
+        start = time.perf_counter()
+        async_to_sync(requests)()
+
+        self.assertLess(time.perf_counter() - start, 0.6)
+
+    @skipIf(connection.vendor == 'sqlite',
+            'SQLite keeps the in-memory test database open')
+    def test_connections_kept(self):
+        """Test the threads keep their connection up to CONN_MAX_AGE"""
+        created = []
+
+        def count(sender, connection, **kwargs):
+            created.append(connection)
+
+        def count_view(request):
+            return HttpResponse(Property.objects.count())
+
+        view = as_async_view(count_view)
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        self.addCleanup(lambda: executor.submit(connections.close_all)
+                        .result())
+        connection_created.connect(count)
+        self.addCleanup(connection_created.disconnect, count)
+
+        with patch.object(async_views, '_executor', executor):
+            for max_age in (0, 600):
+                with patch.dict(connections.databases['default'],
+                                CONN_MAX_AGE=max_age):
+                    for _ in range(3):
+                        async_to_sync(view)(self.factory.get('/'))
+
+        # A connection per request, then a single one kept open
+        self.assertEqual(len(created), 4)
+
+    def test_middleware_async_capable(self):
+        """Test no middleware makes Django run the ASGI chain sync"""
+        for path in settings.MIDDLEWARE:
+            self.assertTrue(
+                getattr(import_string(path), 'async_capable', False), path)
+
+
+class AsyncRouterTest(TransactionTestCase):
+    """Test the router serving async views"""
+
+    def _callbacks(self):
+        """Return the callbacks of the property routes by name"""
+        router = AsyncRouter()
+        router.register('imoveis', PropertyViewSet)
+        return {url.name: url.callback for url in router.urls}
+
+    @override_settings(PROPERTY_ASYNC_VIEWS=True)
+    def test_list_and_detail_async(self):
+        """Test only the list and detail routes are async"""
+        callbacks = self._callbacks()
+
+        self.assertTrue(
+            asyncio.iscoroutinefunction(callbacks['property-list']))
+        self.assertTrue(
+            asyncio.iscoroutinefunction(callbacks['property-detail']))
+        self.assertFalse(
+            asyncio.iscoroutinefunction(callbacks['property-export']))
+
+    @override_settings(PROPERTY_ASYNC_VIEWS=False)
+    def test_disabled(self):
+        """Test every route stays sync when disabled"""
+        callbacks = self._callbacks()
+
+        self.assertFalse(
+            any(asyncio.iscoroutinefunction(callback)
+                for callback in callbacks.values()))
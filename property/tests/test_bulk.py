@@ -0,0 +1,217 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase, override_settings
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Job, Property
+
+from property.tests.test_property import sample_property, \
+    sample_real_estate
+
+BULK_URL = reverse('property:property-bulk')
+
+
+def sample_payload(**params):
+    """Return a property payload"""
+    defaults = {
+        'name': 'Imovel Padrão',
+        'address': 'Endereço Padrão',
+        'description': 'etc',
+        'features': 'tex',
+        'status': False,
+        'type': 'Home',
+        'finality': 'residential',
+        'real_estates': [],
+    }
+    defaults.update(params)
+
+    return defaults
+
+
+class BulkPropertyApiTest(TestCase):
+    """Test the property bulk endpoint"""
+
+    def setUp(self):
+        """Helper function that run before the tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'bulkdev@company.com',
+            'testpass'
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_bulk_create(self):
+        """Test creating a list of properties with real estates"""
+        real_estate1 = sample_real_estate(user=self.user)
+        real_estate2 = sample_real_estate(user=self.user)
+        payload = [
+            sample_payload(name='Imovel 1', real_estates=[real_estate1.id]),
+            sample_payload(
+                name='Imovel 2',
+                real_estates=[real_estate1.id, real_estate2.id]
+            ),
+        ]
+
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data['ids']), 2)
+        first, second = [Property.objects.get(id=pk)
+                         for pk in res.data['ids']]
+        self.assertEqual(first.name, 'Imovel 1')
+        self.assertEqual(first.user, self.user)
+        self.assertEqual(list(first.real_estates.all()), [real_estate1])
+        self.assertEqual(second.real_estates.count(), 2)
+
+    def test_bulk_duplicate_real_estates(self):
+        """Test a real estate listed twice in an item is linked once"""
+        real_estate = sample_real_estate(user=self.user)
+
+        res = self.client.post(BULK_URL, [
+            sample_payload(real_estates=[real_estate.id, real_estate.id]),
+        ], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        propert = Property.objects.get(id=res.data['ids'][0])
+        self.assertEqual(list(propert.real_estates.all()), [real_estate])
+
+    def test_bulk_update(self):
+        """Test items with an id update the existing property"""
+        propert = sample_property(user=self.user, name='Antigo')
+        propert.real_estates.add(sample_real_estate(user=self.user))
+        real_estate = sample_real_estate(user=self.user, name='Nova')
+
+        res = self.client.post(BULK_URL, [
+            sample_payload(
+                id=propert.id, name='Novo', real_estates=[real_estate.id]),
+            sample_payload(name='Criado'),
+        ], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data['ids'][0], propert.id)
+        propert.refresh_from_db()
+        self.assertEqual(propert.name, 'Novo')
+        self.assertEqual(list(propert.real_estates.all()), [real_estate])
+        self.assertEqual(Property.objects.count(), 2)
+
+    def test_bulk_real_estates_validated_in_one_query(self):
+        """Test the referenced real estates are fetched at once"""
+        real_estates = [sample_real_estate(user=self.user)
+                        for _ in range(3)]
+        payload = [
+            sample_payload(real_estates=[real_estate.id])
+            for real_estate in real_estates
+        ]
+
+        # No item has an id, so only the real estates are looked up
+        with self.assertNumQueries(1):
+            res = self.client.post(BULK_URL, [
+                sample_payload(real_estates=[0])
+            ] + payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('real_estates', res.data['errors'][0])
+
+    def test_bulk_reports_item_errors(self):
+        """Test nothing is saved and errors are reported per item"""
+        user2 = get_user_model().objects.create_user(
+            'otherbulk@company.com',
+            'testpass'
+        )
+        other = sample_property(user=user2)
+
+        res = self.client.post(BULK_URL, [
+            sample_payload(),
+            sample_payload(name=''),
+            sample_payload(real_estates=[999]),
+            sample_payload(id=other.id),
+        ], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = res.data['errors']
+        self.assertEqual(errors[0], {})
+        self.assertIn('name', errors[1])
+        self.assertIn('real_estates', errors[2])
+        self.assertIn('id', errors[3])
+        self.assertEqual(Property.objects.filter(user=self.user).count(), 0)
+
+    def test_bulk_duplicate_ids(self):
+        """Test a property updated by two items is an item error"""
+        propert = sample_property(user=self.user, name='Antigo')
+
+        res = self.client.post(BULK_URL, [
+            sample_payload(id=propert.id, name='Novo 1'),
+            sample_payload(id=propert.id, name='Novo 2'),
+        ], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data['errors'][0], {})
+        self.assertIn('id', res.data['errors'][1])
+        propert.refresh_from_db()
+        self.assertEqual(propert.name, 'Antigo')
+
+    def test_bulk_ids_must_be_integers(self):
+        """Test booleans and strings are rejected as ids"""
+        propert = sample_property(user=self.user, name='Antigo')
+
+        res = self.client.post(BULK_URL, [
+            sample_payload(id=True, name='Novo'),
+            sample_payload(id=str(propert.id), name='Novo'),
+        ], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        for errors in res.data['errors']:
+            self.assertEqual(
+                errors['id'], ['A valid integer is required.'])
+        self.assertFalse(Property.objects.filter(name='Novo').exists())
+
+    def test_bulk_requires_list(self):
+        """Test the bulk endpoint rejects a single object"""
+        res = self.client.post(BULK_URL, sample_payload(), format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(PROPERTY_BULK_MAX_ITEMS=1)
+    def test_bulk_max_items(self):
+        """Test the bulk endpoint rejects too many items"""
+        res = self.client.post(
+            BULK_URL, [sample_payload(), sample_payload()], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(JOBS_BACKEND='core.jobs.SyncBackend')
+    def test_bulk_background(self):
+        """Test a background bulk payload is saved by a job"""
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                BULK_URL + '?background=1',
+                [sample_payload(name='Imovel 1')], format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(res['Location'], res.data['url'])
+        self.assertEqual(Job.objects.get(pk=res.data['id']).user, self.user)
+
+        res = self.client.get(res['Location'])
+
+        self.assertEqual(res.data['status'], Job.SUCCEEDED)
+        propert = Property.objects.get(pk=res.data['result']['ids'][0])
+        self.assertEqual(propert.name, 'Imovel 1')
+        self.assertEqual(propert.user, self.user)
+
+    @override_settings(JOBS_BACKEND='core.jobs.SyncBackend')
+    def test_bulk_background_errors(self):
+        """Test a background job reports the errors of invalid items"""
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                BULK_URL + '?background=1',
+                [sample_payload(), sample_payload(id=0)], format='json')
+
+        job = Job.objects.get(pk=res.data['id'])
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.result['errors'][0], {})
+        self.assertEqual(
+            job.result['errors'][1], {'id': ['Property not found.']})
+        self.assertFalse(Property.objects.exists())
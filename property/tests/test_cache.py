@@ -0,0 +1,112 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase
+
+from rest_framework.test import APIClient
+
+from property import cache
+from property.tests.test_property import sample_property, \
+    sample_real_estate, detail_url
+
+PROPERTY_URL = reverse('property:property-list')
+REAL_ESTATE_URL = reverse('property:realestate-list')
+
+
+class ResponseCacheApiTest(TestCase):
+    """Test the per-user response cache of the property endpoints"""
+
+    def setUp(self):
+        """Helper function that run before the tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'cachedev@company.com',
+            'testpass'
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_list_served_from_cache(self):
+        """Test a repeated list request does not hit the database"""
+        sample_property(user=self.user)
+        first = self.client.get(PROPERTY_URL)
+        stats = cache.get_stats()
+
+        with self.assertNumQueries(0):
+            second = self.client.get(PROPERTY_URL)
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(cache.get_stats()['hits'], stats['hits'] + 1)
+
+    def test_detail_served_from_cache(self):
+        """Test a repeated detail request does not hit the database"""
+        propert = sample_property(user=self.user)
+        self.client.get(detail_url(propert.id))
+
+        with self.assertNumQueries(0):
+            res = self.client.get(detail_url(propert.id))
+
+        self.assertEqual(res.json()['name'], propert.name)
+
+    def test_create_invalidates_cache(self):
+        """Test creating a property invalidates the cached list"""
+        self.client.get(PROPERTY_URL)
+        self.client.post(PROPERTY_URL, {
+            'name': 'Imovel Novo',
+            'address': 'Endereço',
+            'description': 'etc',
+            'type': 'Home',
+        })
+
+        res = self.client.get(PROPERTY_URL)
+
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_real_estates_change_invalidates_cache(self):
+        """Test assigning real estates invalidates the cached detail"""
+        propert = sample_property(user=self.user)
+        self.client.get(detail_url(propert.id))
+
+        propert.real_estates.add(sample_real_estate(user=self.user))
+        res = self.client.get(detail_url(propert.id))
+
+        self.assertEqual(len(res.data['real_estates']), 1)
+
+    def test_real_estate_update_invalidates_cache(self):
+        """Test updating a real estate invalidates the cached list"""
+        real_estate = sample_real_estate(user=self.user, name='Antiga')
+        self.client.get(REAL_ESTATE_URL)
+
+        real_estate.name = 'Nova'
+        real_estate.save()
+        res = self.client.get(REAL_ESTATE_URL)
+
+        self.assertEqual(res.data['results'][0]['name'], 'Nova')
+
+    def test_cache_limited_to_user(self):
+        """Test a cached response is not served to another user"""
+        sample_property(user=self.user)
+        self.client.get(PROPERTY_URL)
+
+        user2 = get_user_model().objects.create_user(
+            'othercache@company.com',
+            'testpass'
+        )
+        self.client.force_authenticate(user2)
+        res = self.client.get(PROPERTY_URL)
+
+        self.assertEqual(res.data['results'], [])
+
+    def test_normalized_query_params(self):
+        """Test the real_estates filter order does not change the key"""
+        real_estate1 = sample_real_estate(user=self.user)
+        real_estate2 = sample_real_estate(user=self.user)
+        self.client.get(
+            PROPERTY_URL,
+            {'real_estates': f'{real_estate1.id},{real_estate2.id}'}
+        )
+
+        with self.assertNumQueries(0):
+            self.client.get(
+                PROPERTY_URL,
+                {'real_estates': f'{real_estate2.id},{real_estate1.id}'}
+            )
@@ -0,0 +1,107 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from property import cache
+from property.tests.test_property import sample_property, \
+    sample_real_estate, detail_url
+
+PROPERTY_URL = reverse('property:property-list')
+REAL_ESTATE_URL = reverse('property:realestate-list')
+
+
+class ConditionalGetApiTest(TestCase):
+    """Test the ETag and Last-Modified support of the property API"""
+
+    def setUp(self):
+        """Helper function that run before the tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'etagdev@company.com',
+            'testpass'
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_list_not_modified(self):
+        """Test a matching If-None-Match returns 304 without queries"""
+        sample_property(user=self.user)
+        res = self.client.get(PROPERTY_URL)
+        self.assertIn('ETag', res)
+        self.assertIn('Last-Modified', res)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(
+                PROPERTY_URL, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b'')
+
+    def test_etag_changes_on_write(self):
+        """Test the ETag changes when the user data changes"""
+        propert = sample_property(user=self.user)
+        etag = self.client.get(detail_url(propert.id))['ETag']
+
+        propert.real_estates.add(sample_real_estate(user=self.user))
+        res = self.client.get(
+            detail_url(propert.id), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+        self.assertEqual(len(res.data['real_estates']), 1)
+
+    def test_etag_differs_per_endpoint(self):
+        """Test the list and detail responses have distinct ETags"""
+        propert = sample_property(user=self.user)
+
+        list_etag = self.client.get(PROPERTY_URL)['ETag']
+        detail_etag = self.client.get(detail_url(propert.id))['ETag']
+        real_estate_etag = self.client.get(REAL_ESTATE_URL)['ETag']
+
+        self.assertEqual(
+            len({list_etag, detail_etag, real_estate_etag}), 3)
+
+    def test_not_modified_since(self):
+        """Test If-Modified-Since returns 304 when nothing changed"""
+        sample_real_estate(user=self.user)
+        res = self.client.get(REAL_ESTATE_URL)
+
+        res = self.client.get(
+            REAL_ESTATE_URL, HTTP_IF_MODIFIED_SINCE=res['Last-Modified'])
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_modified_within_the_second(self):
+        """Test a write in the second of the last read is not missed"""
+        sample_property(user=self.user)
+        last_modified = self.client.get(PROPERTY_URL)['Last-Modified']
+
+        self.client.post(PROPERTY_URL, {
+            'name': 'Casa nova', 'address': 'Rua Augusta',
+            'description': 'etc', 'type': 'Casa',
+            'finality': 'residencial'})
+        res = self.client.get(
+            PROPERTY_URL, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn('Casa nova',
+                      [item['name'] for item in res.json()['results']])
+
+    def test_no_data_cached(self):
+        """Test a user without data is not looked up on every request"""
+        cache.get_cache().delete(
+            cache.MODIFIED_KEY.format(user_id=self.user.pk))
+        res = self.client.get(PROPERTY_URL)
+        self.assertNotIn('Last-Modified', res)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(
+                PROPERTY_URL, HTTP_IF_NONE_MATCH=res['ETag'])
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        sample_property(user=self.user)
+        res = self.client.get(PROPERTY_URL)
+
+        self.assertIn('Last-Modified', res)
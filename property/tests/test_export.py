@@ -0,0 +1,105 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase, override_settings
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from property.tests.test_property import sample_property, \
+    sample_real_estate
+
+EXPORT_URL = reverse('property:property-export')
+
+
+class PropertyExportApiTest(TestCase):
+    """Test the streaming export of the user properties"""
+
+    def setUp(self):
+        """Helper function that run before the tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'exportdev@company.com',
+            'testpass'
+        )
+        self.client.force_authenticate(self.user)
+
+    def _content(self, res):
+        """Return the streamed content of a response"""
+        return b''.join(res.streaming_content).decode('utf-8')
+
+    def test_export_ndjson(self):
+        """Test exporting the properties as newline delimited JSON"""
+        propert = sample_property(user=self.user, name='Imovel 1')
+        real_estate = sample_real_estate(user=self.user)
+        propert.real_estates.add(real_estate)
+        sample_property(user=self.user, name='Imovel 2')
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        self.assertTrue(res['Content-Type'].startswith(
+            'application/x-ndjson'))
+        items = [json.loads(line)
+                 for line in self._content(res).splitlines()]
+        self.assertEqual([item['name'] for item in items],
+                         ['Imovel 1', 'Imovel 2'])
+        self.assertEqual(items[0]['real_estates'], [real_estate.id])
+        self.assertEqual(items[1]['real_estates'], [])
+
+    def test_export_csv(self):
+        """Test exporting the properties as CSV"""
+        propert = sample_property(user=self.user, name='Imovel, 1')
+        real_estate1 = sample_real_estate(user=self.user)
+        real_estate2 = sample_real_estate(user=self.user)
+        propert.real_estates.add(real_estate1, real_estate2)
+
+        res = self.client.get(EXPORT_URL, {'format': 'csv'})
+
+        self.assertTrue(res['Content-Type'].startswith('text/csv'))
+        rows = list(csv.DictReader(io.StringIO(self._content(res))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['name'], 'Imovel, 1')
+        self.assertEqual(rows[0]['real_estates'],
+                         f'{real_estate1.id} {real_estate2.id}')
+
+    def test_export_limited_to_user(self):
+        """Test only the properties of the user are exported"""
+        user2 = get_user_model().objects.create_user(
+            'otherexport@company.com',
+            'testpass'
+        )
+        sample_property(user=user2)
+
+        res = self.client.get(EXPORT_URL)
+
+        self.assertEqual(self._content(res), '')
+
+    def test_export_filter_real_estates(self):
+        """Test the export accepts the real_estates filter"""
+        propert = sample_property(user=self.user, name='Imovel 1')
+        real_estate = sample_real_estate(user=self.user)
+        propert.real_estates.add(real_estate)
+        sample_property(user=self.user, name='Imovel 2')
+
+        res = self.client.get(EXPORT_URL, {'real_estates': real_estate.id})
+
+        items = self._content(res).splitlines()
+        self.assertEqual(len(items), 1)
+        self.assertEqual(json.loads(items[0])['name'], 'Imovel 1')
+
+    @override_settings(PROPERTY_EXPORT_CHUNK_SIZE=2)
+    def test_export_queries_per_chunk(self):
+        """Test the real estates are fetched once per chunk"""
+        for i in range(4):
+            sample_property(user=self.user, name=f'Imovel {i}')
+
+        res = self.client.get(EXPORT_URL)
+        with self.assertNumQueries(3):
+            lines = self._content(res).splitlines()
+
+        self.assertEqual(len(lines), 4)
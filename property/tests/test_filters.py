@@ -0,0 +1,218 @@
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.http import QueryDict
+from django.urls import reverse
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Property
+
+from property.filters import PropertyFilterSet
+from property.tests.test_property import sample_property, \
+    sample_real_estate
+
+PROPERTY_URL = reverse('property:property-list')
+REAL_ESTATE_URL = reverse('property:realestate-list')
+
+
+def explain(queryset):
+    """Return the query plan of a queryset, preferring indexes"""
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+
+class PropertyFilterApiTest(TestCase):
+    """Test filtering the property list"""
+
+    def setUp(self):
+        """Helper function that run before the tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'filterdev@company.com',
+            'testpass'
+        )
+        self.client.force_authenticate(self.user)
+        self.house = sample_property(
+            user=self.user, name='Casa', type='Casa', status=True,
+            finality='residencial', features='piscina, garagem')
+        self.flat = sample_property(
+            user=self.user, name='Apartamento', type='Apartamento',
+            status=False, finality='residencial', features='garagem')
+        self.land = sample_property(
+            user=self.user, name='Terreno', type='Terreno', status=False,
+            finality='rural', features='')
+
+    def _names(self, params):
+        """Return the names of the properties matching the params"""
+        res = self.client.get(PROPERTY_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return {item['name'] for item in res.data['results']}
+
+    def test_filter_type(self):
+        """Test filtering by one or more types"""
+        self.assertEqual(self._names({'type': 'Casa'}), {'Casa'})
+        self.assertEqual(self._names({'type': 'Casa,Terreno'}),
+                         {'Casa', 'Terreno'})
+
+    def test_filter_finality(self):
+        """Test filtering by finality"""
+        self.assertEqual(self._names({'finality': 'rural'}), {'Terreno'})
+
+    def test_filter_status(self):
+        """Test filtering by status"""
+        self.assertEqual(self._names({'status': 'true'}), {'Casa'})
+        self.assertEqual(self._names({'status': '0'}),
+                         {'Apartamento', 'Terreno'})
+
+    def test_filter_features(self):
+        """Test filtering by a text contained in the features"""
+        self.assertEqual(self._names({'features': 'Garagem'}),
+                         {'Casa', 'Apartamento'})
+
+    def test_filter_id_range(self):
+        """Test filtering by an id range"""
+        self.assertEqual(
+            self._names({'id_min': self.flat.id, 'id_max': self.land.id}),
+            {'Apartamento', 'Terreno'})
+
+    def test_combined_filters(self):
+        """Test the filters are combined"""
+        real_estate = sample_real_estate(user=self.user)
+        self.house.real_estates.add(real_estate)
+        self.flat.real_estates.add(real_estate)
+
+        names = self._names({
+            'real_estates': real_estate.id,
+            'finality': 'residencial',
+            'status': 'false',
+        })
+
+        self.assertEqual(names, {'Apartamento'})
+
+    def test_invalid_params(self):
+        """Test invalid params are rejected with a bad request"""
+        res = self.client.get(PROPERTY_URL, {
+            'status': 'maybe',
+            'id_min': 'abc',
+            'real_estates': '1,a',
+            'type': ',',
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(res.data),
+                         {'status', 'id_min', 'real_estates', 'type'})
+
+
+class RealEstatesExistsFilterTest(TestCase):
+    """Test the real estates filters are EXISTS subqueries"""
+
+    def setUp(self):
+        """Helper function that run before the tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'existsdev@company.com',
+            'testpass'
+        )
+        self.client.force_authenticate(self.user)
+        self.real_estate1 = sample_real_estate(user=self.user, name='A')
+        self.real_estate2 = sample_real_estate(user=self.user, name='B')
+        self.both = sample_property(user=self.user, name='Ambas')
+        self.both.real_estates.add(self.real_estate1, self.real_estate2)
+        self.one = sample_property(user=self.user, name='Uma')
+        self.one.real_estates.add(self.real_estate1)
+
+    def _get(self, url, params):
+        """Return the names listed and the SQL issued for a request"""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        names = [item['name'] for item in res.data['results']]
+        return names, queries[0]['sql']
+
+    def test_any_of_real_estates_without_duplicates(self):
+        """Test a property assigned to every real estate is listed once"""
+        names, sql = self._get(PROPERTY_URL, {
+            'real_estates': f'{self.real_estate1.id},{self.real_estate2.id}'
+        })
+
+        self.assertEqual(names, ['Uma', 'Ambas'])
+        self.assertIn('EXISTS', sql)
+        self.assertNotIn('DISTINCT', sql)
+
+    def test_all_of_real_estates(self):
+        """Test matching the properties assigned to every real estate"""
+        names, sql = self._get(PROPERTY_URL, {
+            'real_estates': f'{self.real_estate1.id},{self.real_estate2.id}',
+            'real_estates_match': 'all',
+        })
+
+        self.assertEqual(names, ['Ambas'])
+        self.assertNotIn('DISTINCT', sql)
+
+    def test_invalid_match(self):
+        """Test an unknown match option is rejected"""
+        res = self.client.get(PROPERTY_URL, {
+            'real_estates': self.real_estate1.id,
+            'real_estates_match': 'some',
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_assigned_only_without_distinct(self):
+        """Test the assigned real estates are listed once"""
+        sample_real_estate(user=self.user, name='C')
+
+        names, sql = self._get(REAL_ESTATE_URL, {'assigned_only': 1})
+
+        self.assertEqual(names, ['B', 'A'])
+        self.assertIn('EXISTS', sql)
+        self.assertNotIn('DISTINCT', sql)
+
+
+class PropertyFilterIndexTest(TestCase):
+    """Test the compiled filters are served by an index"""
+
+    def setUp(self):
+        """Helper function that run before the tests"""
+        self.user = get_user_model().objects.create_user(
+            'indexdev@company.com',
+            'testpass'
+        )
+
+    def assertUsesIndex(self, params, index):
+        """Assert the query filtered by the params uses an index"""
+        condition = PropertyFilterSet(QueryDict(params)).compile()
+        queryset = Property.objects.filter(user=self.user).filter(condition)
+
+        self.assertIn(index, explain(queryset))
+
+    def test_type_uses_index(self):
+        """Test the type filter uses the (user, type) index"""
+        self.assertUsesIndex('type=Casa', 'property_user_type_idx')
+        self.assertUsesIndex('type=Casa,Terreno', 'property_user_type_idx')
+
+    def test_type_and_status_use_index(self):
+        """Test type and status share the composite index"""
+        self.assertUsesIndex('type=Casa&status=1', 'property_user_type_idx')
+
+    def test_status_uses_index(self):
+        """Test the status filter uses the (user, status) index"""
+        self.assertUsesIndex('status=1', 'property_user_status_idx')
+
+    def test_finality_uses_index(self):
+        """Test the finality filter uses its index"""
+        self.assertUsesIndex('finality=rural', 'property_user_finality_idx')
+
+    def test_id_range_uses_index(self):
+        """Test the id range uses the (user, id) index"""
+        self.assertUsesIndex('id_min=1&id_max=10', 'property_user_id_idx')
+
+    def test_real_estates_use_index(self):
+        """Test the real estates filter searches the through index"""
+        self.assertUsesIndex('real_estates=1,2', 'core_property_real_estates')
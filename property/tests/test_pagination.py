@@ -0,0 +1,119 @@
+import base64
+import json
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase, override_settings
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import RealEstate
+
+from property.tests.test_property import sample_property
+
+PROPERTY_URL = reverse('property:property-list')
+REAL_ESTATE_URL = reverse('property:realestate-list')
+
+
+class KeysetPaginationApiTest(TestCase):
+    """Test the keyset pagination on the property endpoints"""
+
+    def setUp(self):
+        """Helper function that run before the tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'pagedev@company.com',
+            'testpass'
+        )
+        self.client.force_authenticate(self.user)
+
+    def _names(self, res):
+        """Return the names on a page"""
+        return [item['name'] for item in res.data['results']]
+
+    def test_paginate_properties(self):
+        """Test walking the property pages forward and backward"""
+        for i in range(5):
+            sample_property(user=self.user, name=f'Imovel {i}')
+
+        res = self.client.get(PROPERTY_URL, {'page_size': 2})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._names(res), ['Imovel 4', 'Imovel 3'])
+        self.assertIsNone(res.data['previous'])
+
+        res = self.client.get(res.data['next'])
+        self.assertEqual(self._names(res), ['Imovel 2', 'Imovel 1'])
+
+        last = self.client.get(res.data['next'])
+        self.assertEqual(self._names(last), ['Imovel 0'])
+        self.assertIsNone(last.data['next'])
+
+        res = self.client.get(last.data['previous'])
+        self.assertEqual(self._names(res), ['Imovel 2', 'Imovel 1'])
+
+    def test_paginate_real_estates_with_duplicate_names(self):
+        """Test real estates sharing a name are not skipped or repeated"""
+        for name in ('A', 'B', 'B', 'B', 'C'):
+            RealEstate.objects.create(
+                user=self.user, name=name, address='Rua X')
+
+        seen = []
+        url = REAL_ESTATE_URL + '?page_size=2'
+        while url:
+            res = self.client.get(url)
+            seen.extend(item['id'] for item in res.data['results'])
+            url = res.data['next']
+
+        expected = RealEstate.objects.order_by('-name', '-id') \
+            .values_list('id', flat=True)
+        self.assertEqual(seen, list(expected))
+
+    def test_insert_between_pages(self):
+        """Test rows inserted between requests do not shift the pages"""
+        for name in ('E', 'D', 'C', 'B', 'A'):
+            RealEstate.objects.create(
+                user=self.user, name=name, address='Rua X')
+
+        res = self.client.get(REAL_ESTATE_URL, {'page_size': 2})
+        self.assertEqual(self._names(res), ['E', 'D'])
+
+        RealEstate.objects.create(user=self.user, name='DA', address='X')
+        RealEstate.objects.create(user=self.user, name='F', address='X')
+        RealEstate.objects.create(user=self.user, name='BA', address='X')
+
+        res = self.client.get(res.data['next'])
+        self.assertEqual(self._names(res), ['C', 'BA'])
+
+        res = self.client.get(res.data['next'])
+        self.assertEqual(self._names(res), ['B', 'A'])
+        self.assertIsNone(res.data['next'])
+
+    @override_settings(API_MAX_PAGE_SIZE=3)
+    def test_page_size_capped(self):
+        """Test the page size cannot exceed the configured maximum"""
+        for i in range(5):
+            sample_property(user=self.user, name=f'Imovel {i}')
+
+        res = self.client.get(PROPERTY_URL, {'page_size': 100})
+
+        self.assertEqual(len(res.data['results']), 3)
+
+    def test_invalid_cursor(self):
+        """Test an invalid cursor returns not found"""
+        res = self.client.get(PROPERTY_URL, {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_invalid_values(self):
+        """Test a cursor holding values of the wrong type returns not found"""
+        for cursor in ({'r': 0, 'p': ['abc']}, {'r': 0, 'p': [{'a': 1}]},
+                       {'r': 0, 'p': [None]}, {'r': 0, 'p': [1e400]},
+                       {'r': 0, 'p': [2 ** 63]}):
+            encoded = base64.urlsafe_b64encode(
+                json.dumps(cursor).encode('utf-8')).decode('ascii')
+
+            res = self.client.get(PROPERTY_URL, {'cursor': encoded})
+
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(res.data['detail'], 'Invalid cursor')
@@ -81,7 +81,7 @@ class PrivatePropertyApiTest(TestCase):
         serializer = PropertySerializer(properties, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_property_limited_user(self):
         """Test retrieving properties for authenticate user"""
@@ -116,8 +116,8 @@ class PrivatePropertyApiTest(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
-        self.assertEqual(len(res.data), 1)
-        self.assertEqual(res.data[0]['name'], propert.name)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertEqual(res.data['results'][0]['name'], propert.name)
 
     def test_view_property_detail(self):
         """Test viewing a property detail"""
@@ -262,6 +262,52 @@ class PrivatePropertyApiTest(TestCase):
         serializer2 = PropertySerializer(propert2)
         serializer3 = PropertySerializer(propert3)
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer3.data, res.data)
+        self.assertIn(serializer1.data, res.data['results'])
+        self.assertIn(serializer2.data, res.data['results'])
+        self.assertNotIn(serializer3.data, res.data['results'])
+
+
+class PropertyQueryCountTest(TestCase):
+    """Test the property endpoints issue a constant number of queries"""
+
+    def setUp(self):
+        """Helper function that run before the tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'querydev@company.com',
+            'testpass'
+        )
+        self.client.force_authenticate(self.user)
+
+    def _create_properties(self, count):
+        """Create properties assigned to two real estates each"""
+        for i in range(count):
+            propert = sample_property(user=self.user, name=f'Imovel {i}')
+            propert.real_estates.add(
+                sample_real_estate(user=self.user, name=f'Imob {i}'),
+                sample_real_estate(user=self.user, name=f'Imob {i}b'),
+            )
+
+    def test_list_query_count_constant(self):
+        """Test listing properties does not query once per row"""
+        self._create_properties(2)
+        with self.assertNumQueries(2):
+            res = self.client.get(PROPERTY_URL)
+        self.assertEqual(len(res.data['results']), 2)
+
+        self._create_properties(8)
+        with self.assertNumQueries(2):
+            res = self.client.get(PROPERTY_URL)
+        self.assertEqual(len(res.data['results']), 10)
+        self.assertEqual(len(res.data['results'][0]['real_estates']), 2)
+
+    def test_detail_query_count(self):
+        """Test the property detail prefetches nested real estates"""
+        self._create_properties(1)
+        propert = Property.objects.get(user=self.user)
+
+        with self.assertNumQueries(2):
+            res = self.client.get(detail_url(propert.id))
+
+        self.assertEqual(
+            res.data, PropertyDetailSerializer(propert).data)
@@ -0,0 +1,106 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from core.models import Property, RealEstate
+from property.readers import ValuesReader
+from property.serializers import PropertyDetailSerializer, \
+    PropertySerializer, RealEstateSerializer
+from property.tests.test_property import sample_property
+
+PROPERTY_URL = reverse('property:property-list')
+REAL_ESTATE_URL = reverse('property:realestate-list')
+
+
+class ValuesReaderTest(TestCase):
+    """Test the values() reader of the list endpoints"""
+
+    def setUp(self):
+        """Create a set up that run before the tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'readerdev@company.com',
+            'testpass'
+        )
+        self.client.force_authenticate(self.user)
+
+        real_estates = [
+            RealEstate.objects.create(user=self.user, name=f'Imobiliaria {i}',
+                                      address=f'Rua {i}')
+            for i in range(3)
+        ]
+        for i in range(7):
+            propert = sample_property(
+                user=self.user, name=f'Casa {i}', status=bool(i % 2),
+                address='Rua Augusta' if i % 3 else 'Rua Bahia')
+            propert.real_estates.add(*real_estates[i % 3:])
+
+    def _compare(self, url, params=None):
+        """Assert the reader and the serializer render the same pages"""
+        with patch('property.cache.get_response', return_value=None):
+            with patch.object(ValuesReader, 'for_serializer',
+                              return_value=None):
+                expected = self.client.get(url, params)
+            res = self.client.get(url, params)
+
+        self.assertEqual(res.status_code, expected.status_code)
+        self.assertEqual(res.content, expected.content)
+        return res
+
+    def test_represent_as_serializer(self):
+        """Test the rows are represented like the serializer does"""
+        queryset = Property.objects.order_by('-id')
+        reader = ValuesReader.for_serializer(PropertySerializer(), Property)
+
+        self.assertEqual(
+            reader.represent(list(reader.values(queryset))),
+            PropertySerializer(queryset, many=True).data
+        )
+
+    def test_property_list(self):
+        """Test the property list is the same as the serializer one"""
+        res = self._compare(PROPERTY_URL, {'page_size': 3})
+
+        while res.data['next']:
+            res = self._compare(res.data['next'])
+        self._compare(res.data['previous'])
+
+    def test_property_list_filtered(self):
+        """Test filtered and searched lists are the same"""
+        self._compare(PROPERTY_URL, {'status': 'true', 'real_estates': '1'})
+        self._compare(PROPERTY_URL, {'search': 'augusta', 'page_size': 2})
+
+    def test_real_estate_list(self):
+        """Test the real estate list is the same as the serializer one"""
+        res = self._compare(REAL_ESTATE_URL, {'page_size': 2})
+
+        self._compare(res.data['next'])
+
+    def test_list_queries(self):
+        """Test a property page is read with two queries"""
+        with self.assertNumQueries(2):
+            res = self.client.get(PROPERTY_URL)
+
+        self.assertEqual(len(res.data['results']), 7)
+
+    def test_unsupported_serializers(self):
+        """Test serializers with nested or computed fields are not read"""
+
+        class ComputedSerializer(RealEstateSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta(RealEstateSerializer.Meta):
+                fields = ('id', 'label')
+
+            def get_label(self, obj):
+                return obj.name
+
+        self.assertIsNone(ValuesReader.for_serializer(
+            PropertyDetailSerializer(), Property))
+        self.assertIsNone(ValuesReader.for_serializer(
+            ComputedSerializer(), RealEstate))
@@ -59,7 +59,7 @@ class PrivateRealEstateApiTest(TestCase):
         serializer = RealEstateSerializer(real_estates, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_real_estates_limited_for_user(self):
         """Test that 'real estate' can be only return for authenticated user"""
@@ -82,9 +82,9 @@ class PrivateRealEstateApiTest(TestCase):
         res = self.client.get(REAL_ESTATE_URL)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data), 1)
+        self.assertEqual(len(res.data['results']), 1)
 
-        self.assertEqual(res.data[0]['name'], real_estate.name)
+        self.assertEqual(res.data['results'][0]['name'], real_estate.name)
 
     def test_create_real_estate_successfully(self):
         """Test that the authenticated user create a realestate successfully"""
@@ -152,7 +152,7 @@ class PrivateRealEstateApiTest(TestCase):
         properties2.real_estates.add(realestate)
 
         res = self.client.get(REAL_ESTATE_URL, {'assigned_only': 1})
-        self.assertEqual(len(res.data), 1)
+        self.assertEqual(len(res.data['results']), 1)
 
     def test_retrieve_real_estates_assigned_to_properties(self):
         """Test filtering real estates by those assigned to properties"""
@@ -185,5 +185,5 @@ class PrivateRealEstateApiTest(TestCase):
         serializer1 = RealEstateSerializer(realestate1)
         serializer2 = RealEstateSerializer(realestate2)
 
-        self.assertIn(serializer1.data, res.data)
-        self.assertNotIn(serializer2.data, res.data)
+        self.assertIn(serializer1.data, res.data['results'])
+        self.assertNotIn(serializer2.data, res.data['results'])
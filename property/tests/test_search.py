@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from property.tests.test_property import sample_property
+
+PROPERTY_URL = reverse('property:property-list')
+
+
+class PropertySearchApiTest(TestCase):
+    """Test the full-text search of the property list"""
+
+    def setUp(self):
+        """Helper function that run before the tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'searchdev@company.com',
+            'testpass'
+        )
+        self.client.force_authenticate(self.user)
+
+    def _names(self, params):
+        """Return the names of the matching properties in order"""
+        res = self.client.get(PROPERTY_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [item['name'] for item in res.data['results']]
+
+    def test_search_address(self):
+        """Test searching properties by a word of the address"""
+        sample_property(user=self.user, name='Casa 1',
+                        address='Rua Augusta 100')
+        sample_property(user=self.user, name='Casa 2',
+                        address='Avenida Brasil 200')
+
+        self.assertEqual(self._names({'search': 'augusta'}), ['Casa 1'])
+
+    def test_search_every_word(self):
+        """Test every word of the search must match"""
+        sample_property(user=self.user, name='Casa 1',
+                        address='Rua Augusta', description='piscina')
+        sample_property(user=self.user, name='Casa 2',
+                        address='Rua Augusta', description='jardim')
+
+        self.assertEqual(
+            self._names({'search': 'augusta piscina'}), ['Casa 1'])
+
+    def test_search_ranked(self):
+        """Test the best matches are listed first"""
+        sample_property(user=self.user, name='Apartamento',
+                        address='Rua Bahia', description='perto da paulista')
+        sample_property(user=self.user, name='Cobertura Paulista',
+                        address='Avenida Paulista', description='vista')
+
+        self.assertEqual(self._names({'search': 'paulista'}),
+                         ['Cobertura Paulista', 'Apartamento'])
+
+    def test_search_paginated(self):
+        """Test walking the ranked results page by page"""
+        for i in range(1, 4):
+            sample_property(user=self.user, name=f'Imovel {i}',
+                            description=' '.join(['jardim'] * i))
+
+        names = []
+        res = self.client.get(PROPERTY_URL,
+                              {'search': 'jardim', 'page_size': 1})
+        while True:
+            names.extend(item['name'] for item in res.data['results'])
+            if not res.data['next']:
+                break
+            res = self.client.get(res.data['next'])
+
+        self.assertEqual(names, ['Imovel 3', 'Imovel 2', 'Imovel 1'])
+
+    def test_search_index_updated_on_save(self):
+        """Test changes to a property are searchable"""
+        propert = sample_property(user=self.user, name='Casa',
+                                  address='Rua Velha')
+        propert.address = 'Rua Nova'
+        propert.save()
+
+        self.assertEqual(self._names({'search': 'nova'}), ['Casa'])
+        self.assertEqual(self._names({'search': 'velha'}), [])
+
+    def test_search_limited_to_user(self):
+        """Test the search only returns the properties of the user"""
+        user2 = get_user_model().objects.create_user(
+            'othersearch@company.com',
+            'testpass'
+        )
+        sample_property(user=user2, name='Casa', address='Rua Augusta')
+
+        self.assertEqual(self._names({'search': 'augusta'}), [])
+
+    def test_search_punctuation_only(self):
+        """Test a search without words matches nothing"""
+        sample_property(user=self.user)
+
+        self.assertEqual(self._names({'search': '"*'}), [])
@@ -0,0 +1,114 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import RealEstate
+from property.tests.test_property import detail_url, sample_property
+
+PROPERTY_URL = reverse('property:property-list')
+REAL_ESTATE_URL = reverse('property:realestate-list')
+
+
+class SparseFieldsApiTest(TestCase):
+    """Test the fields and exclude query params"""
+
+    def setUp(self):
+        """Create a set up that run before the tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'sparsedev@company.com',
+            'testpass'
+        )
+        self.client.force_authenticate(self.user)
+        self.real_estate = RealEstate.objects.create(
+            user=self.user, name='Imobiliaria', address='Rua 1')
+        self.propert = sample_property(user=self.user, name='Casa')
+        self.propert.real_estates.add(self.real_estate)
+
+    def _get(self, url, params):
+        """Return the response and the SQL of a request"""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return res, [query['sql'] for query in queries]
+
+    def test_fields(self):
+        """Test only the requested fields are read and returned"""
+        res, queries = self._get(PROPERTY_URL, {'fields': 'status,name,id'})
+
+        self.assertEqual(list(res.data['results'][0]),
+                         ['id', 'name', 'status'])
+        self.assertEqual(len(queries), 1)
+        self.assertIn('"core_property"."status"', queries[0])
+        self.assertNotIn('"core_property"."description"', queries[0])
+        self.assertNotIn('core_property_real_estates', queries[0])
+
+    def test_fields_with_real_estates(self):
+        """Test the real estates are read only when requested"""
+        res, queries = self._get(PROPERTY_URL,
+                                 {'fields': 'id,real_estates'})
+
+        self.assertEqual(res.data['results'][0],
+                         {'id': self.propert.id,
+                          'real_estates': [self.real_estate.id]})
+        self.assertEqual(len(queries), 2)
+        self.assertIn('core_property_real_estates', queries[1])
+
+    def test_exclude(self):
+        """Test the excluded fields are not read nor returned"""
+        res, queries = self._get(PROPERTY_URL,
+                                 {'exclude': 'description,real_estates'})
+
+        self.assertNotIn('description', res.data['results'][0])
+        self.assertNotIn('real_estates', res.data['results'][0])
+        self.assertIn('name', res.data['results'][0])
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"core_property"."description"', queries[0])
+
+    def test_retrieve_fields(self):
+        """Test trimming a detail skips the real estates prefetch"""
+        res, queries = self._get(detail_url(self.propert.id),
+                                 {'fields': 'id,name'})
+
+        self.assertEqual(res.data, {'id': self.propert.id, 'name': 'Casa'})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"core_property"."address"', queries[0])
+
+    def test_retrieve_nested_not_trimmed(self):
+        """Test the nested real estates keep their fields"""
+        res, _ = self._get(detail_url(self.propert.id),
+                           {'fields': 'real_estates'})
+
+        self.assertEqual(res.data['real_estates'], [{
+            'id': self.real_estate.id,
+            'name': 'Imobiliaria',
+            'address': 'Rua 1',
+        }])
+
+    def test_real_estate_fields(self):
+        """Test trimming the real estate list"""
+        res, _ = self._get(REAL_ESTATE_URL, {'fields': 'name'})
+
+        self.assertEqual(res.data['results'], [{'name': 'Imobiliaria'}])
+
+    def test_unknown_field(self):
+        """Test unknown fields are rejected with a 400"""
+        res = self.client.get(PROPERTY_URL, {'fields': 'id,price'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fields', res.data)
+
+    def test_writes_not_trimmed(self):
+        """Test the params do not trim the fields of a write"""
+        res = self.client.patch(
+            detail_url(self.propert.id) + '?fields=id',
+            {'name': 'Casa Nova'}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['name'], 'Casa Nova')
@@ -0,0 +1,110 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import RealEstate
+from property.tests.test_property import sample_property
+
+STATS_URL = reverse('property:property-stats')
+
+
+class PropertyStatsApiTest(TestCase):
+    """Test the property stats endpoint"""
+
+    def setUp(self):
+        """Create a set up that run before the tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            'statsdev@company.com',
+            'testpass'
+        )
+        self.client.force_authenticate(self.user)
+        self.centro = RealEstate.objects.create(
+            user=self.user, name='Centro', address='Rua 1')
+        self.norte = RealEstate.objects.create(
+            user=self.user, name='Norte', address='Rua 2')
+
+        casa = sample_property(user=self.user, name='Casa', status=True)
+        casa.real_estates.add(self.centro, self.norte)
+        sample_property(
+            user=self.user, name='Loja', type='Store',
+            finality='commercial', address='Rua Augusta',
+        ).real_estates.add(self.centro)
+        sample_property(user=self.user, name='Sobrado')
+
+    def test_stats(self):
+        """Test the counts grouped by each field and real estate"""
+        with self.assertNumQueries(2):
+            res = self.client.get(STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {
+            'count': 3,
+            'type': [{'value': 'Home', 'count': 2},
+                     {'value': 'Store', 'count': 1}],
+            'finality': [{'value': 'residential', 'count': 2},
+                         {'value': 'commercial', 'count': 1}],
+            'status': [{'value': False, 'count': 2},
+                       {'value': True, 'count': 1}],
+            'real_estates': [
+                {'id': self.centro.id, 'name': 'Centro', 'count': 2},
+                {'id': self.norte.id, 'name': 'Norte', 'count': 1},
+            ],
+        })
+
+    def test_stats_filtered(self):
+        """Test the stats only count the filtered properties"""
+        res = self.client.get(STATS_URL, {'finality': 'commercial'})
+
+        self.assertEqual(res.data['count'], 1)
+        self.assertEqual(res.data['type'], [{'value': 'Store', 'count': 1}])
+        self.assertEqual(res.data['real_estates'], [
+            {'id': self.centro.id, 'name': 'Centro', 'count': 1}])
+
+    def test_stats_search(self):
+        """Test the stats only count the properties matching a search"""
+        res = self.client.get(STATS_URL, {'search': 'augusta'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['count'], 1)
+
+    def test_stats_limited_to_user(self):
+        """Test the stats only count the properties of the user"""
+        other = get_user_model().objects.create_user(
+            'otherstats@company.com', 'testpass')
+        sample_property(user=other)
+
+        res = self.client.get(STATS_URL)
+
+        self.assertEqual(res.data['count'], 3)
+
+    def test_stats_refreshed_on_write(self):
+        """Test a write of the user invalidates the cached stats"""
+        self.client.get(STATS_URL)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(STATS_URL).json()['count'], 3)
+
+        res = self.client.post(reverse('property:property-list'), {
+            'name': 'Nova', 'address': 'Rua 3', 'description': 'etc',
+            'type': 'Home', 'finality': 'residential',
+        })
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(self.client.get(STATS_URL).json()['count'], 4)
+
+    def test_stats_conditional(self):
+        """Test the stats answer a matching If-None-Match with 304"""
+        res = self.client.get(STATS_URL)
+
+        res = self.client.get(STATS_URL, HTTP_IF_NONE_MATCH=res['ETag'])
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_stats_requires_auth(self):
+        """Test the stats require authentication"""
+        res = APIClient().get(STATS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
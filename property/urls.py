@@ -1,10 +1,9 @@
 from django.urls import path, include
 
-from rest_framework.routers import DefaultRouter
-
 from property import views
+from property.async_views import AsyncRouter
 
-router = DefaultRouter()
+router = AsyncRouter()
 router.register('imobiliarias', views.RealEstateViewSet)
 router.register('imoveis', views.PropertyViewSet)
 
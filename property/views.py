@@ -1,14 +1,36 @@
-from rest_framework import viewsets, mixins
-from rest_framework.authentication import TokenAuthentication
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import viewsets, mixins, status
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
+from core import jobs
 from core.models import RealEstate
-from property import serializers
+from core.replicas import ReplicaReadsMixin
+from core.serializers import JobSerializer
+from core.timing import TimingMixin
+from property import serializers, tasks
+from property.bulk import save_bulk
+from property.export import CSVRenderer, NDJSONRenderer, export_response
+from property.filters import FilterSetBackend, PropertyFilterSet, \
+    RankedSearchFilter, RealEstateFilterSet
+from property.mixins import CachedResponseMixin, ConditionalGetMixin, \
+    ValuesListMixin
+from property.pagination import PropertyPagination, RealEstatePagination
+from property.querysets import optimize_queryset
+from property.stats import property_stats
 
 from core.models import Property
+from user.authentication import CachedTokenAuthentication
 
 
-class RealEstateViewSet(viewsets.GenericViewSet,
+class RealEstateViewSet(TimingMixin,
+                        ReplicaReadsMixin,
+                        ConditionalGetMixin,
+                        CachedResponseMixin,
+                        ValuesListMixin,
+                        viewsets.GenericViewSet,
                         mixins.ListModelMixin,
                         mixins.CreateModelMixin,
                         mixins.UpdateModelMixin,
@@ -17,23 +39,24 @@ class RealEstateViewSet(viewsets.GenericViewSet,
                         ):
     """Manage real estates in the database"""
 
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
     queryset = RealEstate.objects.all()
     serializer_class = serializers.RealEstateSerializer
+    pagination_class = RealEstatePagination
+    filter_backends = (FilterSetBackend,)
+    filterset_class = RealEstateFilterSet
+    cache_normalized_params = ('fields', 'exclude')
 
     def get_queryset(self):
         """Return objects for the current authenticated user only"""
-        assigned_only = bool(
-            int(self.request.query_params.get('assigned_only', 0))
-        )
+        queryset = self.queryset.filter(user=self.request.user) \
+            .order_by('-name')
 
-        queryset = self.queryset
-        if assigned_only:
-            queryset = queryset.filter(property__isnull=False)
+        if self.action in ('list', 'retrieve'):
+            queryset = optimize_queryset(queryset, self.get_serializer())
 
-        return queryset.filter(user=self.request.user) \
-            .order_by('-name').distinct()
+        return queryset
 
     def perform_create(self, serializer):
         """Create a new object"""
@@ -44,30 +67,32 @@ class RealEstateViewSet(viewsets.GenericViewSet,
         serializer.save(user=self.request.user)
 
 
-class PropertyViewSet(viewsets.ModelViewSet):
+class PropertyViewSet(TimingMixin,
+                      ReplicaReadsMixin,
+                      ConditionalGetMixin,
+                      CachedResponseMixin,
+                      ValuesListMixin,
+                      viewsets.ModelViewSet):
     """Manage properties in database"""
 
     serializer_class = serializers.PropertySerializer
     queryset = Property.objects.all()
-    authentication_classes = (TokenAuthentication,)
+    pagination_class = PropertyPagination
+    filter_backends = (FilterSetBackend, RankedSearchFilter)
+    filterset_class = PropertyFilterSet
+    cache_normalized_params = ('real_estates', 'type', 'finality',
+                               'fields', 'exclude')
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
 
-    def _params_to_ints(self, qs):
-        """Convert a list of string IDs to a list of integers"""
-        return [int(str_id) for str_id in qs.split(',')]
-
     def get_queryset(self):
         """Retrieve the property for the authenticated user"""
+        queryset = self.queryset.filter(user=self.request.user)
 
-        real_estates = self.request.query_params.get('real_estates')
-        queryset = self.queryset
-        if real_estates:
-            real_estates_ids = self._params_to_ints(real_estates)
-            queryset = queryset.filter(
-                real_estates__id__in=real_estates_ids)
+        if self.action in ('list', 'retrieve'):
+            queryset = optimize_queryset(queryset, self.get_serializer())
 
-        return queryset.filter(user=self.request.user)
-        # return self.queryset.filter(user=self.request.user)
+        return queryset
 
     def get_serializer_class(self):
         """Return appropriate serializer class"""
@@ -80,3 +105,74 @@ class PropertyViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         """Create a new recipe"""
         serializer.save(user=self.request.user)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Create or update a list of properties in a single transaction
+
+        Items carrying an `id` update that property, the others are
+        created. Nothing is saved unless every item is valid; the errors
+        are reported per item, in the order of the payload.
+
+        With `?background=1` the payload is saved by a background job,
+        answered with 202 and the job, to be followed at its url.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            return Response(
+                {'detail': _('Expected a list of items.')},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > settings.PROPERTY_BULK_MAX_ITEMS:
+            return Response(
+                {'detail': _('Ensure this list has no more than '
+                             '{count} items.').format(
+                    count=settings.PROPERTY_BULK_MAX_ITEMS)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if request.query_params.get('background') in ('1', 'true'):
+            job = jobs.enqueue(tasks.bulk_import, request.user.pk, items,
+                               user=request.user)
+            data = JobSerializer(job, context={'request': request}).data
+            return Response(data, status=status.HTTP_202_ACCEPTED,
+                            headers={'Location': data['url']})
+
+        properties, errors = save_bulk(
+            request.user, items, self.get_serializer_context())
+        if errors:
+            return Response(
+                {'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {'ids': [propert.id for propert in properties]},
+            status=status.HTTP_201_CREATED
+        )
+
+    @action(detail=False, methods=['get'],
+            renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """Stream every property of the user as NDJSON or CSV"""
+        return export_response(
+            self.filter_queryset(self.get_queryset()),
+            request.accepted_renderer.format,
+            settings.PROPERTY_EXPORT_CHUNK_SIZE
+        )
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """Count the properties by type, finality, status and real estate
+
+        Accepts the list filters. The counts are computed by the database
+        and cached like the list, until the user writes again.
+        """
+        return self._conditional_response(self._cached_stats, request)
+
+    def _cached_stats(self, request):
+        """Return the cached stats or compute them"""
+        return self._cached_response(self._stats, request)
+
+    def _stats(self, request):
+        """Compute the stats of the filtered properties"""
+        return Response(
+            property_stats(self.filter_queryset(self.get_queryset())))
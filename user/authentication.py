@@ -0,0 +1,167 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from core import metrics
+
+TOKEN_KEY = 'auth:token:{key}'
+USER_KEY = 'auth:user:{user_id}'
+
+
+class LRUCache:
+    """Thread safe in-process LRU cache whose entries expire"""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the value stored under a key, None when missing"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entries"""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """Remove the value stored under a key"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._entries.clear()
+
+
+local_cache = LRUCache(
+    maxsize=settings.AUTH_TOKEN_LOCAL_CACHE_SIZE,
+    ttl=settings.AUTH_TOKEN_LOCAL_CACHE_TTL,
+)
+local_users = LRUCache(
+    maxsize=settings.AUTH_TOKEN_LOCAL_CACHE_SIZE,
+    ttl=settings.AUTH_TOKEN_LOCAL_CACHE_TTL,
+)
+
+# Number of tokens resolved by each layer in this process
+stats = {'local': 0, 'shared': 0, 'database': 0}
+
+
+def _count(source):
+    """Count a token found in a layer of the cache or in the database"""
+    stats[source] += 1
+    metrics.AUTH_TOKEN_LOOKUPS.labels(source).inc()
+
+
+def get_shared_cache():
+    """Return the cache shared by every worker"""
+    return caches[settings.AUTH_TOKEN_CACHE_ALIAS]
+
+
+def invalidate_token(key):
+    """Forget a cached token in this process and in the shared cache"""
+    local_cache.delete(key)
+    get_shared_cache().delete(TOKEN_KEY.format(key=key))
+
+
+def invalidate_user(user_id):
+    """Forget a cached user in this process and in the shared cache"""
+    local_users.delete(user_id)
+    get_shared_cache().delete(USER_KEY.format(user_id=user_id))
+
+
+def _user_values(user):
+    """Return the cached fields of a user, all but the password"""
+    return {
+        field.attname: getattr(user, field.attname)
+        for field in user._meta.concrete_fields
+        if field.attname != 'password'
+    }
+
+
+def _cache_user(user):
+    """Store the fields of a user in both layers"""
+    values = _user_values(user)
+    get_shared_cache().set(USER_KEY.format(user_id=user.pk), values,
+                           settings.AUTH_TOKEN_CACHE_TIMEOUT)
+    local_users.set(user.pk, values)
+
+
+def _get_user(user_id):
+    """Return a user built from the cached fields, or read and cache it"""
+    values = local_users.get(user_id)
+    if values is None:
+        values = get_shared_cache().get(USER_KEY.format(user_id=user_id))
+        if values is None:
+            user = get_user_model()._default_manager \
+                .filter(pk=user_id).first()
+            if user is not None:
+                _cache_user(user)
+            return user
+        local_users.set(user_id, values)
+
+    # A new instance per request, the password is loaded when accessed
+    return get_user_model().from_db(
+        DEFAULT_DB_ALIAS, list(values), list(values.values()))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication resolving tokens and users from a cache
+
+    The id of the user of a token, then the fields of that user but its
+    password, are looked up in an in-process LRU, then in the shared
+    cache and only then in the database. Deleting a token or saving or
+    deleting a user invalidates both layers of this process and the
+    shared cache; other processes drop their local copy when its short
+    TTL expires. The views saving the user read it from the database,
+    so they never save a stale copy.
+    """
+
+    def authenticate_credentials(self, key):
+        user_id = local_cache.get(key)
+        if user_id is not None:
+            _count('local')
+        else:
+            shared_cache = get_shared_cache()
+            user_id = shared_cache.get(TOKEN_KEY.format(key=key))
+            if user_id is not None:
+                _count('shared')
+            else:
+                _count('database')
+                user, token = super().authenticate_credentials(key)
+                shared_cache.set(TOKEN_KEY.format(key=key), user.pk,
+                                 settings.AUTH_TOKEN_CACHE_TIMEOUT)
+                local_cache.set(key, user.pk)
+                _cache_user(user)
+                return (user, token)
+            local_cache.set(key, user_id)
+
+        user = _get_user(user_id)
+        if user is None or not user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.'))
+
+        return (user, self.get_model()(key=key, user=user))
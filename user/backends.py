@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from user import hashing
+
+
+class PooledModelBackend(ModelBackend):
+    """Model backend checking passwords on the bounded hashing pool
+
+    The pool caps the concurrent hashes of the process, see
+    `user.hashing.run`; the request still waits for the check.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user_model = get_user_model()
+        if username is None:
+            username = kwargs.get(user_model.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        try:
+            user = user_model._default_manager.get_by_natural_key(username)
+        except user_model.DoesNotExist:
+            # Hash anyway, so unknown users take as long as known ones
+            hashing.make_password(password)
+            return None
+
+        if hashing.check_password(user, password) \
+                and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,76 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASHING_WORKERS,
+    thread_name_prefix='password-hashing',
+)
+# Hashes running or waiting for a worker
+_slots = threading.BoundedSemaphore(
+    settings.PASSWORD_HASHING_WORKERS + settings.PASSWORD_HASHING_QUEUE)
+
+
+class HashingUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('Too many concurrent logins, try again later.')
+    default_code = 'hashing_unavailable'
+
+
+def run(func, *args):
+    """Run a password hashing call on the bounded pool
+
+    The pool only caps the hashes running at once in this process, the
+    calling thread still waits for its hash. A sync worker is busy for
+    the whole hash, so the cap matters to threaded and ASGI workers,
+    whose hashes would otherwise take every CPU of the process. A call
+    not getting one of the pool and queue slots within
+    PASSWORD_HASHING_TIMEOUT seconds fails with a 503.
+    """
+    if not _slots.acquire(timeout=settings.PASSWORD_HASHING_TIMEOUT):
+        raise HashingUnavailable()
+    try:
+        return _executor.submit(func, *args).result()
+    finally:
+        _slots.release()
+
+
+def make_password(raw_password):
+    """Return the hash of a password computed on the pool"""
+    return run(hashers.make_password, raw_password)
+
+
+def set_password(user, raw_password):
+    """Set the password of a user, hashing it on the pool"""
+    user.password = make_password(raw_password)
+    user._password = raw_password
+
+
+def _verify(raw_password, encoded):
+    """Check a password and return its new hash if it must be upgraded"""
+    upgraded = []
+    valid = hashers.check_password(
+        raw_password, encoded,
+        setter=lambda raw: upgraded.append(hashers.make_password(raw))
+    )
+    return valid, upgraded[0] if upgraded else None
+
+
+def check_password(user, raw_password):
+    """Check the password of a user, hashing it on the pool
+
+    A hash made by another hasher than the preferred one, or with
+    outdated parameters, is replaced with a hash by the preferred
+    hasher, so changing PASSWORD_HASHER upgrades users as they log in.
+    """
+    valid, upgraded = run(_verify, raw_password, user.password)
+    if upgraded:
+        user.password = upgraded
+        user.save(update_fields=['password'])
+
+    return valid
@@ -2,6 +2,8 @@ from django.contrib.auth import get_user_model, authenticate
 from rest_framework import serializers
 from django.utils.translation import ugettext_lazy as _
 
+from user import hashing
+
 
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for the users objects"""
@@ -13,7 +15,14 @@ class UserSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """Create a new user encrypted password and return it"""
-        return get_user_model().objects.create_user(**validated_data)
+        password = validated_data.pop('password')
+        user_model = get_user_model()
+        user = user_model(**validated_data)
+        user.email = user_model.objects.normalize_email(user.email)
+        hashing.set_password(user, password)
+        user.save()
+
+        return user
 
     def update(self, instance, validated_data):
         """Update a user, setting the password and return it"""
@@ -21,7 +30,7 @@ class UserSerializer(serializers.ModelSerializer):
         user = super().update(instance, validated_data)
 
         if password:
-            user.set_password(password)
+            hashing.set_password(user, password)
             user.save()
 
         return user
@@ -0,0 +1,138 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from user.authentication import TOKEN_KEY, USER_KEY, LRUCache, \
+    get_shared_cache
+
+ME_URL = reverse('user:me')
+
+
+class CachedTokenAuthenticationTest(TestCase):
+    """Test the cached token authentication"""
+
+    def setUp(self):
+        """Create a set up that run before the tests"""
+        self.user = get_user_model().objects.create_user(
+            email='tokendev@company.com',
+            password='testpass',
+            name='Token'
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_token_resolved_once(self):
+        """Test the token is only joined in the database once"""
+        with self.assertNumQueries(1):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+        self.assertEqual(res.data['email'], self.user.email)
+
+    def test_user_cached_without_password(self):
+        """Test the shared cache holds the user id and fields but password"""
+        self.client.get(ME_URL)
+
+        self.assertEqual(
+            get_shared_cache().get(TOKEN_KEY.format(key=self.token.key)),
+            self.user.pk)
+        values = get_shared_cache().get(
+            USER_KEY.format(user_id=self.user.pk))
+        self.assertEqual(values['email'], self.user.email)
+        self.assertNotIn('password', values)
+
+    def test_saved_user_invalidated(self):
+        """Test a saved user is read again by the next request"""
+        self.client.get(ME_URL)
+
+        self.user.name = 'Renamed'
+        self.user.save()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.data['name'], 'Renamed')
+
+    def test_user_read_fresh(self):
+        """Test a cached token authenticates the current user row"""
+        self.client.get(ME_URL)
+        get_user_model().objects.filter(pk=self.user.pk) \
+            .update(name='Renamed')
+
+        res = self.client.patch(ME_URL, {'password': 'newpass123'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.name, 'Renamed')
+        self.assertTrue(self.user.check_password('newpass123'))
+
+    def test_deleted_user_rejected_from_cache(self):
+        """Test a cached token of a deleted user is rejected"""
+        self.client.get(ME_URL)
+
+        self.user.delete()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_invalid_token(self):
+        """Test an unknown token is rejected"""
+        self.client.credentials(HTTP_AUTHORIZATION='Token invalid')
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_token_rejected(self):
+        """Test a deleted token stops authenticating"""
+        self.client.get(ME_URL)
+
+        self.token.delete()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_rejected(self):
+        """Test a deactivated user stops authenticating"""
+        self.client.get(ME_URL)
+
+        self.user.is_active = False
+        self.user.save()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class LRUCacheTest(TestCase):
+    """Test the in-process LRU cache"""
+
+    def test_least_recently_used_evicted(self):
+        """Test the least recently used entry is evicted first"""
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    @patch('user.authentication.time.monotonic')
+    def test_entries_expire(self, monotonic):
+        """Test an entry is not returned once its ttl elapsed"""
+        monotonic.return_value = 100
+        cache = LRUCache(maxsize=2, ttl=5)
+        cache.set('a', 1)
+
+        monotonic.return_value = 104
+        self.assertEqual(cache.get('a'), 1)
+        monotonic.return_value = 105
+        self.assertIsNone(cache.get('a'))
@@ -0,0 +1,70 @@
+import threading
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from user import hashing
+
+TOKEN_URL = reverse('user:token')
+
+PREFERRED = 'django.contrib.auth.hashers.MD5PasswordHasher'
+PREVIOUS = 'django.contrib.auth.hashers.SHA1PasswordHasher'
+
+
+@override_settings(PASSWORD_HASHERS=[PREFERRED, PREVIOUS])
+class PasswordHashingTest(TestCase):
+    """Test the pooled password hashing"""
+
+    def setUp(self):
+        """Create a set up that run before the tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email='hashdev@company.com',
+            password='testpass'
+        )
+
+    def test_hashed_on_pool(self):
+        """Test hashing runs on the pool threads"""
+        name = hashing.run(lambda: threading.current_thread().name)
+
+        self.assertTrue(name.startswith('password-hashing'))
+
+    def test_login_rehashes_password(self):
+        """Test a hash of a previous hasher is upgraded on login"""
+        self.user.password = make_password('testpass', hasher='sha1')
+        self.user.save()
+
+        res = self.client.post(TOKEN_URL, {'email': self.user.email,
+                                           'password': 'testpass'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('md5$'))
+        self.assertTrue(self.user.check_password('testpass'))
+
+    def test_wrong_password_not_rehashed(self):
+        """Test a failed login keeps the previous hash"""
+        self.user.password = make_password('testpass', hasher='sha1')
+        self.user.save()
+
+        res = self.client.post(TOKEN_URL, {'email': self.user.email,
+                                           'password': 'wrong'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('sha1$'))
+
+    def test_pool_saturated(self):
+        """Test logins fail fast with a 503 when the pool is full"""
+        with patch.object(hashing._slots, 'acquire', return_value=False):
+            res = self.client.post(TOKEN_URL, {'email': self.user.email,
+                                               'password': 'testpass'})
+
+        self.assertEqual(res.status_code,
+                         status.HTTP_503_SERVICE_UNAVAILABLE)